@@ -0,0 +1,184 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterable, Dict, Iterable, List, Optional, Tuple
+
+from app.bulk_result import BulkResult, RowError
+from app.course_service_impl import Assignment, Course, CourseServiceImpl
+from app.course_statistics import CourseStatistics
+from app.course_summary import CourseSummary
+
+
+class AsyncCourseService:
+  """
+  asyncio facade over CourseServiceImpl, mirroring every CourseService method as a coroutine.
+
+  Cheap O(1) calls run inline on the event loop. Work that grows with the size of a course is offloaded to an executor
+  while holding the course's asyncio.Lock, and writes take the same lock, so offloaded reads never see a course
+  half-way through a write and writes to one course are applied in order.
+  """
+  def __init__(self, course_service: Optional[CourseServiceImpl] = None, executor: Optional[Executor] = None, offload_threshold: int = 10000):
+    """
+    Initializes a new instance of AsyncCourseService.
+
+    Parameters:
+        course_service (Optional[CourseServiceImpl]): The service to wrap, a new CourseServiceImpl by default.
+        executor (Optional[Executor]): The executor offloaded work runs on, the event loop's default executor by default.
+        offload_threshold (int): The enrollment from which ranking queries are offloaded instead of run inline.
+    """
+    self.course_service = course_service if course_service is not None else CourseServiceImpl()
+    self.executor = executor
+    self.offload_threshold = offload_threshold
+    self.course_locks: Dict[int, asyncio.Lock] = {}  # Stores an asyncio.Lock per course with course IDs as keys
+
+  def get_course_lock(self, course_id: int) -> asyncio.Lock:
+    """
+    Retrieves the lock serializing writes to a course, creating it on first use.
+
+    Parameters:
+        course_id (int): The ID of the course.
+
+    Returns:
+        asyncio.Lock: The lock of the course.
+    """
+    lock = self.course_locks.get(course_id)
+    if lock is None:
+      lock = self.course_locks[course_id] = asyncio.Lock()
+    return lock
+
+  async def _write(self, course_id: int, method, *args):
+    async with self.get_course_lock(course_id):
+      return method(course_id, *args)
+
+  async def _offload(self, course_id: int, method, *args):
+    async with self.get_course_lock(course_id):
+      return await asyncio.get_running_loop().run_in_executor(self.executor, method, course_id, *args)
+
+  async def get_courses(self) -> List[Course]:
+    return self.course_service.get_courses()
+
+  async def get_course_by_id(self, course_id: int) -> Course:
+    return self.course_service.get_course_by_id(course_id)
+
+  async def list_courses(self, after_id: Optional[int] = None, limit: int = 50) -> List[CourseSummary]:
+    return self.course_service.list_courses(after_id, limit)
+
+  async def find_courses(self, prefix: str) -> List[Course]:
+    return self.course_service.find_courses(prefix)
+
+  async def get_archived_course(self, course_id: int) -> Course:
+    return self.course_service.get_archived_course(course_id)
+
+  async def create_course(self, course_name: str) -> int:
+    return self.course_service.create_course(course_name)
+
+  async def delete_course(self, course_id: int):
+    await self._write(course_id, self.course_service.delete_course)
+    self.course_locks.pop(course_id, None)
+
+  async def create_assignment(self, course_id: int, assignment_name: str) -> int:
+    return await self._write(course_id, self.course_service.create_assignment, assignment_name)
+
+  async def rename_course(self, course_id: int, course_name: str):
+    await self._write(course_id, self.course_service.rename_course, course_name)
+
+  async def create_assignments_bulk(self, course_id: int, assignment_names: Iterable[str]) -> List[int]:
+    return await self._write(course_id, self.course_service.create_assignments_bulk, assignment_names)
+
+  async def delete_assignment(self, course_id: int, assignment_id: int) -> Dict[int, int]:
+    return await self._write(course_id, self.course_service.delete_assignment, assignment_id)
+
+  async def rename_assignment(self, course_id: int, assignment_id: int, assignment_name: str):
+    await self._write(course_id, self.course_service.rename_assignment, assignment_id, assignment_name)
+
+  async def find_assignments(self, course_id: int, prefix: str) -> List[Assignment]:
+    return self.course_service.find_assignments(course_id, prefix)
+
+  async def enroll_student(self, course_id: int, student_id: int):
+    await self._write(course_id, self.course_service.enroll_student, student_id)
+
+  async def dropout_student(self, course_id: int, student_id: int) -> Dict[int, int]:
+    return await self._write(course_id, self.course_service.dropout_student, student_id)
+
+  async def submit_assignment(self, course_id: int, student_id: int, assignment_id: int, grade: int):
+    await self._write(course_id, self.course_service.submit_assignment, student_id, assignment_id, grade)
+
+  async def get_assignment_grade_avg(self, course_id: int, assignment_id: int) -> int:
+    return self.course_service.get_assignment_grade_avg(course_id, assignment_id)
+
+  async def get_assignment_percentile(self, course_id: int, assignment_id: int, p: float) -> int:
+    return self.course_service.get_assignment_percentile(course_id, assignment_id, p)
+
+  async def get_assignment_median(self, course_id: int, assignment_id: int) -> float:
+    return self.course_service.get_assignment_median(course_id, assignment_id)
+
+  async def get_assignment_distribution(self, course_id: int, assignment_id: int) -> List[int]:
+    return self.course_service.get_assignment_distribution(course_id, assignment_id)
+
+  async def get_student_grade_avg(self, course_id: int, student_id: int) -> int:
+    return self.course_service.get_student_grade_avg(course_id, student_id)
+
+  async def get_student_courses(self, student_id: int) -> List[int]:
+    return self.course_service.get_student_courses(student_id)
+
+  async def get_student_transcript(self, student_id: int) -> Dict[int, Optional[int]]:
+    return self.course_service.get_student_transcript(student_id)
+
+  async def get_student_rank(self, course_id: int, student_id: int) -> int:
+    return self.course_service.get_student_rank(course_id, student_id)
+
+  async def get_student_percentile(self, course_id: int, student_id: int) -> float:
+    return self.course_service.get_student_percentile(course_id, student_id)
+
+  async def get_top_five_students(self, course_id: int) -> List[int]:
+    return await self.get_top_k_students(course_id, 5)
+
+  async def get_top_k_students(self, course_id: int, k: int) -> List[int]:
+    """
+    Retrieves the top k students of a course, offloaded once the course reaches the offload threshold.
+    """
+    course = self.course_service.get_course_by_id(course_id)
+    if len(course.students_enrolled) < self.offload_threshold:
+      return self.course_service.get_top_k_students(course_id, k)
+    return await self._offload(course_id, self.course_service.get_top_k_students, k)
+
+  async def get_course_statistics(self, course_id: int) -> CourseStatistics:
+    """
+    Computes the statistics of a course on the executor.
+    """
+    return await self._offload(course_id, self.course_service.get_course_statistics)
+
+  async def submit_assignments_stream(self, course_id: int, submissions: AsyncIterable[Tuple[int, int, int]], batch_size: int = 1000) -> BulkResult:
+    """
+    Submits (student_id, assignment_id, grade) rows streamed from an async iterator, in batches of `batch_size` rows.
+
+    Every batch is validated and applied on its own, all-or-nothing, like submit_assignments_bulk(). Other writes to
+    the course can run between batches. Row indexes in the returned errors count from the start of the stream.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        submissions (AsyncIterable[Tuple[int, int, int]]): The rows to submit.
+        batch_size (int): The number of rows validated and applied together.
+
+    Returns:
+        BulkResult: The number of applied rows and the errors of every rejected batch.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+    """
+    result = BulkResult()
+    batch, batch_start = [], 0
+
+    async def apply_batch():
+      batch_result = await self._write(course_id, self.course_service.submit_assignments_bulk, batch)
+      result.applied += batch_result.applied
+      result.errors.extend(RowError(batch_start + error.index, error.row, error.message) for error in batch_result.errors)
+
+    async for row in submissions:
+      batch.append(row)
+      if len(batch) >= batch_size:
+        await apply_batch()
+        batch_start += len(batch)
+        batch = []
+    if batch:
+      await apply_batch()
+    return result
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Any, List
+
+
+@dataclass(frozen=True)
+class RowError:
+  """
+  A row of a bulk operation that failed validation.
+  """
+  index: int  # Position of the row in the submitted batch
+  row: Any  # The row as it was submitted
+  message: str
+
+
+@dataclass
+class BulkResult:
+  """
+  Outcome of a bulk operation. Batches are all-or-nothing: rows are only applied when no row has an error.
+  """
+  applied: int = 0  # Number of rows applied
+  errors: List[RowError] = field(default_factory=list)
+
+  @property
+  def ok(self) -> bool:
+    """
+    Whether the batch was valid and applied.
+    """
+    return not self.errors
@@ -0,0 +1,240 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.bulk_result import BulkResult
+from app.course_service_impl import CourseServiceImpl
+from app.write_ahead_log import OPERATION_CODES
+
+# Cached queries, by the version that has to be unchanged for a memoized result to still be valid:
+# "assignment" results only depend on the grades of one assignment, "student" results on the grades of one student,
+# and "course" results (rankings) on every grade and enrollment of the course.
+CACHED_QUERIES = {
+  "get_assignment_grade_avg": "assignment",
+  "get_assignment_percentile": "assignment",
+  "get_assignment_median": "assignment",
+  "get_student_grade_avg": "student",
+  "get_top_five_students": "course",
+  "get_top_k_students": "course",
+  "get_student_rank": "course",
+  "get_student_percentile": "course",
+}
+
+
+def _copy(result):
+  return list(result) if isinstance(result, list) else result  # Keeps cached rankings safe from their callers
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+  """
+  Counters of a CachingCourseService, to size its cache.
+  """
+  hits: int
+  misses: int  # Lookups of a missing or invalidated result
+  evictions: int  # Valid results dropped to respect max_entries
+  size: int
+  max_entries: int
+
+
+class _CourseVersions:
+  """
+  Version counters of one course. Every bump takes a fresh value of a service-wide clock, so a version never comes back.
+  """
+  __slots__ = ("epoch", "version", "students", "assignments")
+
+  def __init__(self, epoch: int = 0):
+    self.epoch = epoch  # Changes when the course is deleted, invalidating all of its results
+    self.version = 0  # Changes on every mutation of the course
+    self.students: Dict[int, int] = {}  # Stores the version of every student touched by a mutation
+    self.assignments: Dict[int, int] = {}  # Stores the version of every assignment touched by a mutation
+
+
+UNTOUCHED = _CourseVersions()  # Versions of the courses no mutation went through the cache for
+
+
+class CachingCourseService:
+  """
+  Read-through cache over a CourseServiceImpl, memoizing aggregate queries in a bounded LRU.
+
+  Every memoized result is tagged with the versions it depends on, see CACHED_QUERIES. Mutations bump only the versions
+  of the course, students and assignments they touch, so results elsewhere stay cached. Tags are read before a query
+  runs and versions bumped after a mutation completes, so a result computed concurrently with a mutation is at worst
+  recomputed, never served stale. Mutations must go through the cache; any other call is forwarded as is.
+  """
+  def __init__(self, course_service: Optional[CourseServiceImpl] = None, max_entries: int = 100000):
+    """
+    Initializes a new instance of CachingCourseService.
+
+    Parameters:
+        course_service (Optional[CourseServiceImpl]): The service to wrap, a new CourseServiceImpl by default.
+        max_entries (int): The maximum number of memoized results.
+
+    Raises:
+        ValueError: If max_entries is not positive.
+    """
+    if max_entries <= 0:
+      raise ValueError(f"The cache must hold at least one entry, got {max_entries}")
+    self.course_service = course_service if course_service is not None else CourseServiceImpl()
+    self.max_entries = max_entries
+    self.entries: OrderedDict = OrderedDict()  # Maps (query, *args) keys to (tag, result), least recently used first
+    self.versions: Dict[int, _CourseVersions] = {}  # Stores the version counters of every course with course IDs as keys
+    self.clock = count(1)  # Source of version values
+    self.generation = 0  # Changes when the whole cache is cleared
+    self.lock = threading.Lock()  # Guards the entries, the versions and the counters, never held during a query
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def __getattr__(self, name: str):
+    if name in OPERATION_CODES:  # A mutation without a wrapper below would leave stale results behind
+      raise AttributeError(f"{name} is not supported by {type(self).__name__}")
+    return getattr(self.course_service, name)
+
+  def _course_versions(self, course_id: int) -> _CourseVersions:
+    versions = self.versions.get(course_id)
+    if versions is None:
+      versions = self.versions[course_id] = _CourseVersions()
+    return versions
+
+  def _tag(self, scope: str, course_id: int, args: tuple) -> Tuple[int, int, int]:
+    versions = self.versions.get(course_id, UNTOUCHED)
+    if scope == "assignment":
+      return self.generation, versions.epoch, versions.assignments.get(args[0], 0)
+    if scope == "student":
+      return self.generation, versions.epoch, versions.students.get(args[0], 0)
+    return self.generation, versions.epoch, versions.version
+
+  def query(self, query_name: str, course_id: int, *args):
+    """
+    Answers a cached query from the cache, or from the wrapped service on a miss.
+
+    Parameters:
+        query_name (str): The name of the query, a key of CACHED_QUERIES.
+        course_id (int): The ID of the course.
+        *args: The other arguments of the query.
+
+    Returns:
+        The result of the query, lists as fresh copies the caller may change. Errors are raised and never cached.
+    """
+    key = (query_name, course_id) + args
+    with self.lock:
+      tag = self._tag(CACHED_QUERIES[query_name], course_id, args)
+      entry = self.entries.get(key)
+      if entry is not None and entry[0] == tag:
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return _copy(entry[1])
+      self.misses += 1
+
+    result = getattr(self.course_service, query_name)(course_id, *args)
+    with self.lock:
+      self.entries[key] = (tag, _copy(result))
+      self.entries.move_to_end(key)
+      if len(self.entries) > self.max_entries:
+        self.entries.popitem(last=False)
+        self.evictions += 1
+    return result
+
+  def _bump(self, course_id: int, student_ids: Iterable[int] = (), assignment_ids: Iterable[int] = ()):
+    """
+    Invalidates the results of a course that depend on its rankings or on the given students and assignments.
+    """
+    with self.lock:
+      versions = self._course_versions(course_id)
+      versions.version = next(self.clock)
+      for student_id in student_ids:
+        versions.students[student_id] = next(self.clock)
+      for assignment_id in assignment_ids:
+        versions.assignments[assignment_id] = next(self.clock)
+
+  def cache_statistics(self) -> CacheStatistics:
+    """
+    Returns the hit, miss and eviction counters and the current size of the cache.
+    """
+    with self.lock:
+      return CacheStatistics(self.hits, self.misses, self.evictions, len(self.entries), self.max_entries)
+
+  def clear(self):
+    """
+    Drops every memoized result, e.g. after the wrapped service was changed behind the cache's back.
+    """
+    with self.lock:
+      self.entries.clear()
+      self.versions = {}
+      self.generation += 1
+
+  def create_course(self, course_name: str) -> int:
+    return self.course_service.create_course(course_name)
+
+  def delete_course(self, course_id: int):
+    self.course_service.delete_course(course_id)
+    with self.lock:
+      self.versions[course_id] = _CourseVersions(next(self.clock))  # Releases the course's counters as well
+
+  def rename_course(self, course_id: int, course_name: str):
+    self.course_service.rename_course(course_id, course_name)
+
+  def create_assignment(self, course_id: int, assignment_name: str) -> int:
+    return self.course_service.create_assignment(course_id, assignment_name)
+
+  def create_assignments_bulk(self, course_id: int, assignment_names: Iterable[str]) -> List[int]:
+    return self.course_service.create_assignments_bulk(course_id, assignment_names)
+
+  def rename_assignment(self, course_id: int, assignment_id: int, assignment_name: str):
+    self.course_service.rename_assignment(course_id, assignment_id, assignment_name)
+
+  def delete_assignment(self, course_id: int, assignment_id: int) -> Dict[int, int]:
+    removed = self.course_service.delete_assignment(course_id, assignment_id)
+    self._bump(course_id, removed, [assignment_id])
+    return removed
+
+  def enroll_student(self, course_id: int, student_id: int):
+    self.course_service.enroll_student(course_id, student_id)
+    self._bump(course_id, [student_id])
+
+  def enroll_students_bulk(self, course_id: int, student_ids: Iterable[int]) -> BulkResult:
+    student_ids = list(student_ids)
+    result = self.course_service.enroll_students_bulk(course_id, student_ids)
+    if result.applied:
+      self._bump(course_id, student_ids)
+    return result
+
+  def dropout_student(self, course_id: int, student_id: int) -> Dict[int, int]:
+    removed = self.course_service.dropout_student(course_id, student_id)
+    self._bump(course_id, [student_id], removed)
+    return removed
+
+  def submit_assignment(self, course_id: int, student_id: int, assignment_id: int, grade: int):
+    self.course_service.submit_assignment(course_id, student_id, assignment_id, grade)
+    self._bump(course_id, [student_id], [assignment_id])
+
+  def submit_assignments_bulk(self, course_id: int, submissions: Iterable[Tuple[int, int, int]]) -> BulkResult:
+    submissions = list(submissions)
+    result = self.course_service.submit_assignments_bulk(course_id, submissions)
+    if result.applied:
+      self._bump(course_id, {row[0] for row in submissions}, {row[1] for row in submissions})
+    return result
+
+  def load_snapshot(self, path: str):
+    self.course_service.load_snapshot(path)
+    self.clear()
+
+  def replay(self, log_path: str) -> int:
+    applied = self.course_service.replay(log_path)
+    self.clear()
+    return applied
+
+
+def _cached_query(query_name: str):
+  def cached_query(self, course_id: int, *args):
+    return self.query(query_name, course_id, *args)
+  cached_query.__name__ = query_name
+  cached_query.__doc__ = getattr(CourseServiceImpl, query_name).__doc__
+  return cached_query
+
+
+for _query_name in CACHED_QUERIES:
+  setattr(CachingCourseService, _query_name, _cached_query(_query_name))
@@ -0,0 +1,217 @@
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Change-data-capture stream of the mutations of a CourseServiceImpl. Every mutation is published as one event per
+# changed entity, bulk calls included, so consumers apply the same deltas whichever method made the change. Events
+# carry sequence numbers growing by one from 1, which consumers keep as the offset to resume from.
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+  """
+  Base class of the events of a ChangeStream.
+  """
+  sequence: int
+
+
+@dataclass(frozen=True)
+class CourseCreated(ChangeEvent):
+  course_id: int
+  name: str
+
+
+@dataclass(frozen=True)
+class CourseDeleted(ChangeEvent):
+  course_id: int
+
+
+@dataclass(frozen=True)
+class CourseRenamed(ChangeEvent):
+  course_id: int
+  name: str
+
+
+@dataclass(frozen=True)
+class AssignmentCreated(ChangeEvent):
+  course_id: int
+  assignment_id: int
+  name: str
+
+
+@dataclass(frozen=True)
+class AssignmentRenamed(ChangeEvent):
+  course_id: int
+  assignment_id: int
+  name: str
+
+
+@dataclass(frozen=True)
+class AssignmentDeleted(ChangeEvent):
+  course_id: int
+  assignment_id: int  # Its submissions are deleted with it
+
+
+@dataclass(frozen=True)
+class StudentEnrolled(ChangeEvent):
+  course_id: int
+  student_id: int
+
+
+@dataclass(frozen=True)
+class StudentDropped(ChangeEvent):
+  course_id: int
+  student_id: int  # Their submissions are deleted with them, unless the service archives
+
+
+@dataclass(frozen=True)
+class AssignmentSubmitted(ChangeEvent):
+  course_id: int
+  student_id: int
+  assignment_id: int
+  grade: int
+
+
+@dataclass(frozen=True)
+class SnapshotLoaded(ChangeEvent):
+  """
+  Every course was replaced by the ones of a snapshot file, consumers have to rescan.
+  """
+
+
+def _expand(operation: str, args: tuple) -> list:
+  """
+  Translates the arguments a mutation is logged with into (event type, fields) pairs.
+  """
+  if operation == "create_course":
+    course_id, name = args
+    return [(CourseCreated, (course_id, name))]
+  if operation == "delete_course":
+    return [(CourseDeleted, args)]
+  if operation == "rename_course":
+    return [(CourseRenamed, args)]
+  if operation == "create_assignment":
+    return [(AssignmentCreated, args)]
+  if operation == "create_assignments_bulk":
+    course_id, first_assignment_id, names = args
+    return [(AssignmentCreated, (course_id, first_assignment_id + offset, name)) for offset, name in enumerate(names)]
+  if operation == "rename_assignment":
+    return [(AssignmentRenamed, args)]
+  if operation == "delete_assignment":
+    return [(AssignmentDeleted, args)]
+  if operation == "enroll_student":
+    return [(StudentEnrolled, args)]
+  if operation == "enroll_students_bulk":
+    course_id, student_ids = args
+    return [(StudentEnrolled, (course_id, student_id)) for student_id in student_ids]
+  if operation == "dropout_student":
+    return [(StudentDropped, args)]
+  if operation == "submit_assignment":
+    return [(AssignmentSubmitted, args)]
+  if operation == "submit_assignments_bulk":
+    course_id, submissions = args
+    return [(AssignmentSubmitted, (course_id, *row)) for row in submissions]
+  if operation == "load_snapshot":
+    return [(SnapshotLoaded, ())]
+  raise ValueError(f"Unknown mutation {operation}")
+
+
+class ChangeStream:
+  """
+  Bounded in-process ring buffer of ChangeEvents. Publishing never blocks: once the buffer is full, each new event
+  overwrites the oldest one, and a consumer that falls behind by more than the capacity is told so on its next read.
+  """
+  def __init__(self, capacity: int = 65536):
+    """
+    Initializes an empty stream.
+
+    Parameters:
+        capacity (int): The number of most recent events kept.
+
+    Raises:
+        ValueError: If capacity is not positive.
+    """
+    if capacity <= 0:
+      raise ValueError(f"The stream must keep at least one event, got {capacity}")
+    self.capacity = capacity
+    self.events: List[Optional[ChangeEvent]] = [None] * capacity  # The event with sequence s is kept at slot s % capacity
+    self.last_sequence = 0  # Sequence number of the last published event
+    self.published = threading.Condition()  # Guards the buffer, notified on every publish
+
+  @property
+  def first_sequence(self) -> int:
+    """
+    The sequence number of the oldest event still in the buffer, last_sequence + 1 when it is empty.
+    """
+    return max(1, self.last_sequence - self.capacity + 1)
+
+  def publish(self, operation: str, args: tuple):
+    """
+    Appends the events of a mutation that has been applied.
+
+    Parameters:
+        operation (str): The name of the mutating method.
+        args (tuple): The arguments the mutation is logged with, see CourseServiceImpl.log_mutation().
+    """
+    expanded = _expand(operation, args)
+    with self.published:
+      for event_type, fields in expanded:
+        self.last_sequence += 1
+        self.events[self.last_sequence % self.capacity] = event_type(self.last_sequence, *fields)
+      self.published.notify_all()
+
+  def read(self, after_sequence: int = 0, limit: int = 1000, timeout: float = 0.0) -> List[ChangeEvent]:
+    """
+    Returns the events published after an offset, oldest first.
+
+    Parameters:
+        after_sequence (int): The sequence number of the last event already consumed, 0 to start from the beginning.
+        limit (int): The maximum number of events returned.
+        timeout (float): How long to wait for an event when none is newer than the offset, None to wait forever.
+
+    Returns:
+        List[ChangeEvent]: Up to limit consecutive events, empty if none was published in time.
+
+    Raises:
+        ValueError: If limit is not positive or the offset is ahead of the stream.
+        LookupError: If events after the offset were already overwritten, the consumer has to rescan.
+    """
+    if limit <= 0:
+      raise ValueError(f"Read limit must be positive, got {limit}")
+    with self.published:
+      if after_sequence > self.last_sequence:
+        raise ValueError(f"Offset {after_sequence} is ahead of the last event {self.last_sequence}")
+      if after_sequence == self.last_sequence and timeout != 0:
+        self.published.wait_for(lambda: self.last_sequence > after_sequence, timeout)
+      if after_sequence + 1 < self.first_sequence:
+        raise LookupError(f"Events {after_sequence + 1} to {self.first_sequence - 1} were overwritten")
+      last = min(self.last_sequence, after_sequence + limit)
+      return [self.events[sequence % self.capacity] for sequence in range(after_sequence + 1, last + 1)]
+
+  def subscribe(self, after_sequence: Optional[int] = None) -> "Subscription":
+    """
+    Returns a consumer of the stream.
+
+    Parameters:
+        after_sequence (Optional[int]): The offset to resume from, None to only consume events published from now on.
+    """
+    with self.published:
+      return Subscription(self, self.last_sequence if after_sequence is None else after_sequence)
+
+
+class Subscription:
+  """
+  Consumer of a ChangeStream that keeps track of its own offset.
+  """
+  def __init__(self, stream: ChangeStream, after_sequence: int):
+    self.stream = stream
+    self.offset = after_sequence  # Sequence number of the last event consumed
+
+  def poll(self, limit: int = 1000, timeout: float = 0.0) -> List[ChangeEvent]:
+    """
+    Returns the next events and advances the offset past them, see ChangeStream.read().
+    """
+    events = self.stream.read(self.offset, limit, timeout)
+    if events:
+      self.offset = events[-1].sequence
+    return events
@@ -1,16 +1,62 @@
-from typing import List
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from math import ceil, isfinite
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from weakref import WeakSet, WeakValueDictionary
+from app.bulk_result import BulkResult, RowError
 from app.course_service import CourseService
+from app.course_statistics import HISTOGRAM_BUCKETS, CourseStatistics, compute_course_statistics
+from app.course_summary import CourseSummary, summarize_course
+from app.grade_store import NO_GRADES, CompactGradeStore, DictGradeStore
+from app.leaderboard import Leaderboard
+from app.name_index import NameIndex
+from app.change_stream import ChangeStream
+from app.write_ahead_log import WriteAheadLog, read_write_ahead_log
+
+if TYPE_CHECKING:
+  from app.course_service_view import CourseServiceView  # Imported by snapshot() at runtime, the view module imports this one
 
 # Business Logic Assumptions in the code :
 # 1. Using a manual id generator for simplicity and readability rather than using uuid
 # 2. Dictionary operations are wrapped in try-catch block to override with custom exceptions
 # 3. Re-submission of assignments are not allowed
 # 4. Creation of assignments with same name is permitted but assignment_id always stays unique
+# 5. Averages are served from running sum/count aggregates kept up to date on every submission
+# 6. Students are ranked by their floored average, ties go to the lower student ID and students without submissions rank last
+# 7. Students are not registered globally, a student unknown to every course is treated as enrolled in no course
+# 8. Dropping a student purges their submissions, unless the service archives, see CourseServiceImpl(archive=True)
+# 9. Student IDs are 64-bit integers and names are UTF-8 text, as stored by the write-ahead log and snapshots
+
+MIN_ID, MAX_ID = -2**63, 2**63 - 1  # Range of the signed 64-bit IDs the write-ahead log and snapshots store
+
+
+def student_id_error(student_id) -> Optional[str]:
+  """
+  Returns why a student ID cannot be enrolled, or None if it can.
+  """
+  if not isinstance(student_id, int) or not MIN_ID <= student_id <= MAX_ID:
+    return f"Student ID must be a 64-bit integer, got {student_id!r}"
+  return None
+
+
+def check_name(name):
+  """
+  Ensures that a course or assignment name can be stored as UTF-8 text.
+
+  Raises:
+      ValueError: If the name cannot be encoded.
+  """
+  try:
+    str(name).encode("utf-8")
+  except UnicodeEncodeError:
+    raise ValueError(f"Name {name!r} cannot be encoded as UTF-8")
 
 class Assignment:
   """
   Represents an assignment within a course.
   """
+  __slots__ = ("name", "id")
+
   def __init__(self, name: str, assignment_id: int):
     """
     Initializes a new instance of Assignment.
@@ -26,7 +72,14 @@ class Assignment:
 class Student:
   """
   Represents a student enrolled in a course.
+
+  Courses only keep the IDs of their students, Student records are handed out on lookup and interned, so every
+  caller holding a record of the same student shares a single instance. Service queries only check enrollment with
+  Course.require_student() and never build a record.
   """
+  __slots__ = ("id", "__weakref__")
+  interned = WeakValueDictionary()  # Stores the live Student records with student IDs as keys
+
   def __init__(self, student_id: int):
       """
       Initializes a new instance of Student.
@@ -36,25 +89,249 @@ class Student:
       """
       self.id = student_id
 
+  @classmethod
+  def intern(cls, student_id: int) -> "Student":
+    """
+    Returns the shared record of a student, creating it if no caller holds one.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        Student: The record of the student.
+    """
+    student = cls.interned.get(student_id)
+    if student is None:
+      student = cls.interned.setdefault(student_id, cls(student_id))
+    return student
+
+
+class GradeAggregate:
+  """
+  Running sum and count of a set of grades, used to answer averages in O(1).
+  """
+  __slots__ = ("total", "count")
+
+  def __init__(self):
+    """
+    Initializes an empty aggregate.
+    """
+    self.total = 0
+    self.count = 0
+
+  def copy(self) -> "GradeAggregate":
+    """
+    Returns an independent copy of the aggregate.
+    """
+    aggregate = object.__new__(type(self))
+    aggregate.total = self.total
+    aggregate.count = self.count
+    return aggregate
+
+  def add(self, grade: int):
+    """
+    Adds a grade to the aggregate.
+
+    Parameters:
+        grade (int): The grade to add.
+    """
+    self.total += grade
+    self.count += 1
+
+  def remove(self, grade: int):
+    """
+    Removes a previously added grade from the aggregate.
+
+    Parameters:
+        grade (int): The grade to remove.
+    """
+    self.total -= grade
+    self.count -= 1
+
+  def add_many(self, total: int, count: int):
+    """
+    Adds several grades to the aggregate at once.
+
+    Parameters:
+        total (int): The sum of the grades to add.
+        count (int): The number of grades to add.
+    """
+    self.total += total
+    self.count += count
+
+  def average(self) -> int:
+    """
+    Returns the average of the aggregated grades, floored to the nearest integer.
+
+    Raises:
+        ValueError: If no grades have been aggregated.
+    """
+    if not self.count:
+      raise ValueError("No grades have been submitted")
+    return int(self.total // self.count)
+
+
+class GradeDistribution(GradeAggregate):
+  """
+  GradeAggregate that also counts its grades per integer grade, to answer percentiles and medians in O(1).
+
+  Grades are bounded between 0 and 100, so the distribution is a fixed 101-bucket histogram, and order statistics
+  walk at most 101 buckets whatever the number of grades. Fractional grades are counted in the bucket of their floor.
+  """
+  __slots__ = ("histogram",)
+
+  def __init__(self):
+    """
+    Initializes an empty distribution.
+    """
+    super().__init__()
+    self.histogram = [0] * HISTOGRAM_BUCKETS  # Number of grades per integer grade from 0 to 100
+
+  def copy(self) -> "GradeDistribution":
+    distribution = super().copy()
+    distribution.histogram = self.histogram.copy()
+    return distribution
+
+  def add(self, grade: int):
+    super().add(grade)
+    self.histogram[int(grade)] += 1
+
+  def remove(self, grade: int):
+    super().remove(grade)
+    self.histogram[int(grade)] -= 1
+
+  def add_many(self, total: int, count: int, histogram: Mapping[int, int]):
+    """
+    Adds several grades to the distribution at once.
+
+    Parameters:
+        total (int): The sum of the grades to add.
+        count (int): The number of grades to add.
+        histogram (Mapping[int, int]): The number of grades to add per integer grade.
+    """
+    super().add_many(total, count)
+    for bucket, bucket_count in histogram.items():
+      self.histogram[int(bucket)] += bucket_count
+
+  def grade_at_rank(self, rank: int) -> int:
+    """
+    Returns the grade at a rank of the sorted grades, floored for fractional grades.
+
+    Parameters:
+        rank (int): The 1-based rank, 1 being the lowest grade.
+
+    Returns:
+        int: The grade of the bucket holding the rank.
+    """
+    seen = 0
+    for grade, bucket_count in enumerate(self.histogram):
+      seen += bucket_count
+      if seen >= rank:
+        return grade
+    raise ValueError(f"Rank {rank} is past the {self.count} grades of the distribution")
+
+  def percentile(self, p: float) -> int:
+    """
+    Returns the nearest-rank p-th percentile, the lowest grade at least p percent of the grades are at or below.
+
+    Parameters:
+        p (float): The percentile, between 0 and 100.
+
+    Returns:
+        int: The percentile grade.
+
+    Raises:
+        ValueError: If p is out of range or no grades have been aggregated.
+    """
+    if not 0 <= p <= 100:
+      raise ValueError(f"Percentile must be between 0 and 100 inclusive, got {p}")
+    if not self.count:
+      raise ValueError("No grades have been submitted")
+    return self.grade_at_rank(max(1, ceil(p * self.count / 100)))
+
+  def median(self) -> float:
+    """
+    Returns the median grade, the mean of the two middle grades for an even count.
+
+    Raises:
+        ValueError: If no grades have been aggregated.
+    """
+    if not self.count:
+      raise ValueError("No grades have been submitted")
+    middle = self.count // 2 + 1
+    if self.count % 2:
+      return float(self.grade_at_rank(middle))
+    return (self.grade_at_rank(middle - 1) + self.grade_at_rank(middle)) / 2
+
 
 class Course:
   """
   Represents a course, including its assignments, enrolled students, and grades.
   """
-  def __init__(self, name: str, course_id: int):
+  __slots__ = (
+    "name", "id", "assignments", "assignment_id", "assignment_names", "students_enrolled", "grades",
+    "assignment_aggregates", "student_aggregates", "owned_student_aggregates", "leaderboard", "epoch",
+  )
+
+  def __init__(self, name: str, course_id: int, compact_grades: bool = False):
     """
     Initializes a new instance of Course.
 
     Parameters:
         name (str): The name of the course.
         course_id (int): The unique identifier for the course.
+        compact_grades (bool): Whether to keep grades in a byte matrix instead of a dict, see CompactGradeStore.
     """
     self.name = name
     self.id = course_id
     self.assignments = {}  # Stores assignments with their IDs as keys
     self.assignment_id = 0  # Generator for assignment IDs
-    self.students_enrolled = {}  # Stores enrolled students with their IDs as keys
-    self.grades = {}  # Stores grades with (student_id, assignment_id) as keys
+    self.assignment_names = NameIndex()  # Orders assignment IDs by name for prefix search
+    self.students_enrolled = {}  # Stores the IDs of the enrolled students as keys of None, leaner than a set at course sizes
+    self.grades = CompactGradeStore() if compact_grades else DictGradeStore()  # Maps (student_id, assignment_id) keys to grades
+    self.assignment_aggregates = {}  # Stores a GradeDistribution per assignment ID
+    self.student_aggregates = {}  # Stores a GradeAggregate per student ID
+    self.owned_student_aggregates = None  # IDs of the students whose aggregate this copy may update, None for all, see copy()
+    self.leaderboard = Leaderboard()  # Ranks enrolled students by their average grade
+    self.epoch = 0  # Epoch of the service this object was created or copied in, see CourseServiceImpl.snapshot()
+
+  def copy(self) -> "Course":
+    """
+    Returns an independent copy of the course, in time proportional to its enrollments and assignments.
+
+    The per-student grade dicts and aggregates are shared with the original, and the copy replaces one by its own copy
+    before updating it, so the original must no longer be mutated.
+    """
+    course = Course.__new__(Course)
+    course.name = self.name
+    course.id = self.id
+    course.assignments = {assignment_id: Assignment(assignment.name, assignment_id) for assignment_id, assignment in self.assignments.items()}
+    course.assignment_id = self.assignment_id
+    course.assignment_names = self.assignment_names.copy()
+    course.students_enrolled = self.students_enrolled.copy()
+    course.grades = self.grades.copy()
+    course.assignment_aggregates = {assignment_id: aggregate.copy() for assignment_id, aggregate in self.assignment_aggregates.items()}
+    course.student_aggregates = self.student_aggregates.copy()
+    course.owned_student_aggregates = set()
+    course.leaderboard = self.leaderboard.copy()
+    course.epoch = self.epoch
+    return course
+
+  def student_aggregate(self, student_id: int) -> GradeAggregate:
+    """
+    Retrieves the aggregate of a student to update it, first replacing it by a copy if it is shared, see copy().
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        GradeAggregate: The aggregate, owned by this course.
+    """
+    aggregate = self.student_aggregates[student_id]
+    if self.owned_student_aggregates is not None and student_id not in self.owned_student_aggregates:
+      aggregate = self.student_aggregates[student_id] = aggregate.copy()
+      self.owned_student_aggregates.add(student_id)
+    return aggregate
 
   def create_course_assignment(self, assignment_name: str):
     """
@@ -62,10 +339,77 @@ class Course:
 
     Parameters:
         assignment_name (str): The name of the assignment.
+
+    Returns:
+        int: The ID of the new assignment.
     """
     new_assignment = Assignment(assignment_name, self.assignment_id)
     self.assignments[self.assignment_id] = new_assignment
+    self.assignment_names.add(assignment_name, self.assignment_id)
+    self.assignment_aggregates[self.assignment_id] = GradeDistribution()
+    self.grades.add_assignment(self.assignment_id)
     self.assignment_id += 1
+    return new_assignment.id
+
+  def create_course_assignments(self, assignment_names: List[str]) -> List[int]:
+    """
+    Creates several assignments for the course, allocating a contiguous block of IDs in one step.
+
+    Parameters:
+        assignment_names (List[str]): The names of the assignments.
+
+    Returns:
+        List[int]: The IDs of the new assignments, in the order of their names.
+    """
+    assignment_ids = range(self.assignment_id, self.assignment_id + len(assignment_names))
+    self.assignment_id = assignment_ids.stop
+    for assignment_id in reversed(assignment_ids):  # The highest ID first, so compact storage widens only once
+      self.grades.add_assignment(assignment_id)
+    for assignment_id, assignment_name in zip(assignment_ids, assignment_names):
+      self.assignments[assignment_id] = Assignment(assignment_name, assignment_id)
+      self.assignment_names.add(assignment_name, assignment_id)
+      self.assignment_aggregates[assignment_id] = GradeDistribution()
+    return list(assignment_ids)
+
+  def delete_course_assignment(self, assignment_id: int):
+    """
+    Deletes an assignment of the course and its submissions, in time proportional to its submissions.
+
+    Parameters:
+        assignment_id (int): The ID of the assignment.
+
+    Returns:
+        Dict[int, int]: The removed grades keyed by student ID.
+
+    Raises:
+        KeyError: If no assignment with the given ID is found.
+    """
+    assignment = self.get_assignment_by_id(assignment_id)
+    del self.assignments[assignment_id]
+    self.assignment_names.remove(assignment.name, assignment_id)
+    del self.assignment_aggregates[assignment_id]
+    removed = self.grades.remove_assignment(assignment_id)
+    for student_id, grade in removed.items():
+      self.student_aggregate(student_id).remove(grade)
+      if student_id in self.leaderboard:
+        self.leaderboard.update(student_id, self.get_student_ranking_average(student_id))
+    return removed
+
+  def rename_course_assignment(self, assignment_id: int, assignment_name: str):
+    """
+    Renames an assignment of the course.
+
+    Parameters:
+        assignment_id (int): The ID of the assignment.
+        assignment_name (str): The new name of the assignment.
+
+    Raises:
+        KeyError: If no assignment with the given ID is found.
+    """
+    assignment = self.get_assignment_by_id(assignment_id)
+    self.assignment_names.remove(assignment.name, assignment_id)
+    assignment.name = assignment_name
+    self.assignment_names.add(assignment_name, assignment_id)
 
   def enroll_student_in_course(self, student_id: int):
     """
@@ -77,25 +421,103 @@ class Course:
     Raises:
         ValueError: If student with the given ID already exists.
     """
-    if student_id in self.students_enrolled.keys():
+    if student_id in self.students_enrolled:
       raise ValueError(f"Student with ID {student_id} is already enrolled in Course: {self.name} (id:{self.id})")
 
-    new_student = Student(student_id)
-    self.students_enrolled[student_id] = new_student
+    self.students_enrolled[student_id] = None
+    # submissions survive a dropout in archive mode, so a re-enrolled student keeps their aggregate
+    self.student_aggregates.setdefault(student_id, GradeAggregate())
+    self.grades.add_student(student_id)
+    self.leaderboard.update(student_id, self.get_student_ranking_average(student_id))
 
-  def drop_student_from_course(self, student_id: int, course_id: int):
+  def drop_student_from_course(self, student_id: int, course_id: int, keep_grades: bool = False):
     """
-    Drops a student from the course.
+    Drops a student from the course, and purges their submissions from the grades and the aggregates.
 
     Parameters:
         student_id (int): The ID of the student to drop.
         course_id (int): The ID of the course from which to drop the student.
+        keep_grades (bool): Whether to keep the submissions of the student, and the aggregates built from them.
+
+    Returns:
+        Dict[int, int]: The purged grades keyed by assignment ID, empty when the grades are kept.
     """
     if student_id in self.students_enrolled:
         del self.students_enrolled[student_id]
+        self.leaderboard.remove(student_id)
+        return {} if keep_grades else self.purge_student_grades(student_id)
     else:
         raise ValueError(f"Student {student_id} is not enrolled in course {course_id}")
 
+  def purge_student_grades(self, student_id: int) -> Dict[int, int]:
+    """
+    Removes every submission of a student, in time proportional to their submissions.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        Dict[int, int]: The removed grades keyed by assignment ID.
+    """
+    removed = self.grades.remove_student(student_id)
+    for assignment_id, grade in removed.items():
+      self.assignment_aggregates[assignment_id].remove(grade)
+    self.student_aggregates.pop(student_id, None)
+    return removed
+
+  def record_grade(self, student_id: int, assignment_id: int, grade: int):
+    """
+    Stores a grade and folds it into the student and assignment aggregates.
+
+    Parameters:
+        student_id (int): The ID of the student.
+        assignment_id (int): The ID of the assignment.
+        grade (int): The grade of the submission.
+    """
+    self.grades.set(student_id, assignment_id, grade)
+    self.student_aggregate(student_id).add(grade)
+    self.assignment_aggregates[assignment_id].add(grade)
+    self.leaderboard.update(student_id, self.get_student_ranking_average(student_id))
+
+  def record_grades(self, submissions: Iterable[Tuple[int, int, int]]):
+    """
+    Stores a batch of already validated grades, folding them into the aggregates once per student and assignment.
+
+    Parameters:
+        submissions (Iterable[Tuple[int, int, int]]): The (student_id, assignment_id, grade) rows to store.
+    """
+    student_totals, assignment_totals = {}, {}
+    for student_id, assignment_id, grade in submissions:
+      self.grades.set(student_id, assignment_id, grade)
+      student_total = student_totals.setdefault(student_id, [0, 0])
+      student_total[0] += grade
+      student_total[1] += 1
+      assignment_total = assignment_totals.setdefault(assignment_id, [0, 0, {}])
+      assignment_total[0] += grade
+      assignment_total[1] += 1
+      histogram = assignment_total[2]
+      histogram[int(grade)] = histogram.get(int(grade), 0) + 1
+
+    for assignment_id, (total, count, histogram) in assignment_totals.items():
+      self.assignment_aggregates[assignment_id].add_many(total, count, histogram)
+    for student_id, (total, count) in student_totals.items():
+      self.student_aggregate(student_id).add_many(total, count)
+      if student_id in self.leaderboard:
+        self.leaderboard.update(student_id, self.get_student_ranking_average(student_id))
+
+  def get_student_ranking_average(self, student_id: int):
+    """
+    Returns the average a student is ranked by.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        Optional[int]: The floored average of the student, or None if they have no submissions.
+    """
+    aggregate = self.student_aggregates[student_id]
+    return aggregate.average() if aggregate.count else None
+
   def get_assignment_by_id(self, assignment_id: int) -> Assignment:
     """
     Retrieves an assignment by its ID.
@@ -128,118 +550,687 @@ class Course:
     Raises:
         KeyError: If no student with the given ID is found.
     """
+    self.require_student(student_id)
+    return Student.intern(student_id)
+
+  def require_student(self, student_id: int):
+    """
+    Ensures that a student is enrolled in the course, without building their Student record.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Raises:
+        KeyError: If no student with the given ID is found.
+    """
+    if student_id not in self.students_enrolled:
+      raise KeyError(f"Student with ID {student_id} not found in Course: {self.name} (id:{self.id})")
+
+
+class LiveGrades(Mapping):
+  """
+  Read-only live view of grades handed out by the service. It looks its course up in the service on every access, so it
+  keeps following the grades after a copy-on-write replaced the course, and is empty once its student or assignment is gone.
+  """
+  def __init__(self, course_service: "CourseServiceImpl", course: Course, grades_of: Callable[[Course], Mapping]):
+    self.course_service = course_service
+    self.course = course  # The course as handed out, still read once it has been deleted
+    self.grades_of = grades_of  # Returns the viewed grades of a course
+
+  def grades(self) -> Mapping:
+    """
+    Returns the viewed grades of the service's current course.
+    """
     try:
-      student = self.students_enrolled[student_id]
-      return student
+      return self.grades_of(self.course_service.courses.get(self.course.id, self.course))
     except KeyError:
-      raise KeyError(f"Student with ID {student_id} not found in Course: {self.name} (id:{self.id})")
+      return NO_GRADES
+
+  def __getitem__(self, key: int) -> int:
+    return self.grades()[key]
+
+  def __iter__(self) -> Iterator[int]:
+    return iter(self.grades())
+
+  def __len__(self) -> int:
+    return len(self.grades())
+
+
+# Service-wide containers a view shares with its service, and how the service copies one before writing to it
+SHARED_CONTAINERS = {
+  "courses": dict.copy,
+  "archived_courses": dict.copy,
+  "course_ids": list.copy,
+  "course_names": NameIndex.copy,
+  "student_courses": dict.copy,  # The per-student dicts stay shared until written, see writable_enrollments()
+}
 
 
 class CourseServiceImpl(CourseService):
   """
   Implementation of CourseService that manages courses, assignments, and student enrollments.
   """
-  def __init__(self):
+  def __init__(self, compact_grades: bool = False, archive: bool = False):
     """
     Initializes a new instance of CourseServiceImpl.
+
+    Parameters:
+        compact_grades (bool): Whether new courses keep their grades in a byte matrix, see CompactGradeStore.
+        archive (bool): Whether dropouts keep their submissions and deleted courses are archived instead of purged.
     """
     self.courses = {}  # Stores courses with their IDs as keys
+    self.course_ids = []  # Sorted IDs of the courses, the cursor index of list_courses()
+    self.course_names = NameIndex()  # Orders course IDs by name for prefix search
     self.course_id = 0  # Generator for course IDs
+    self.compact_grades = compact_grades
+    self.archive = archive
+    self.archived_courses = {}  # Stores the courses deleted in archive mode with their IDs as keys, kept in memory only
+    self.student_courses = {}  # Index of enrollments as {student_id: {course_id: None}}, dicts as in Course.students_enrolled
+    self.write_ahead_log = None  # Optional WriteAheadLog every mutation is recorded in
+    self.log_sequence = 0  # Sequence number of the last logged mutation reflected in the courses
+    self.change_stream = None  # Optional ChangeStream every mutation is published to
+    self.epoch = 0  # Bumped by snapshot(), courses of an older epoch may be shared with a view
+    self.shared = set()  # Names of the service-wide containers shared with a view, copied before their next write
+    self.owned_enrollments = set()  # IDs of the students whose student_courses dict was copied since the last snapshot()
+    self.views = WeakSet()  # The views returned by snapshot() that are still referenced
 
-  def get_courses(self) -> List[Course]:
+  def log_mutation(self, operation: str, *args):
     """
-    Retrieves all courses.
+    Records a mutation that has been applied in the write-ahead log and publishes it to the change stream, if attached.
+    Mutations validate their arguments before applying anything, so that their record can always be encoded.
 
-    Returns:
-        List[Course]: A list of all courses.
-    
-    Raises:
-        LookupError: If no courses are found.
+    Parameters:
+        operation (str): The name of the mutating method.
+        *args: The arguments needed to replay the mutation.
     """
-    if not self.courses:
-        raise LookupError("No courses found")
-    else:
-        return [course for course in self.courses.values()]
+    if self.write_ahead_log is not None:
+      self.log_sequence = self.write_ahead_log.append(operation, *args)
+    if self.change_stream is not None:
+      self.change_stream.publish(operation, args)
 
-  def get_course_by_id(self, course_id: int) -> Course:
+  def unshare(self, container: str):
     """
-    Retrieves a course by its ID.
+    Replaces a service-wide container shared with a view by a copy, before it is written to.
 
     Parameters:
-        course_id (int): The ID of the course to retrieve.
-    
+        container (str): The attribute name of the container, a key of SHARED_CONTAINERS.
+    """
+    if container in self.shared:
+      if self.views:
+        setattr(self, container, SHARED_CONTAINERS[container](getattr(self, container)))
+      self.shared.discard(container)
+
+  def writable_course(self, course_id: int) -> Course:
+    """
+    Retrieves a course to mutate it, first replacing it by a copy if it may be shared with a view that is still referenced.
+
+    Parameters:
+        course_id (int): The ID of the course.
+
     Returns:
-        Course: The course object associated with the given ID.
+        Course: The course, owned by the live service.
 
     Raises:
         KeyError: If no course with the given ID is found.
     """
-    try:
-        course = self.courses[course_id]
+    course = self.get_course_by_id(course_id)
+    if course.epoch != self.epoch:
+      if not self.views:
+        course.epoch = self.epoch  # Every view is gone, nothing shares the course anymore
         return course
-    except KeyError:
-        raise KeyError(f"Course with ID {course_id} not found")
+      course = course.copy()
+      course.epoch = self.epoch
+      self.replace_course(course)
+    return course
 
-  def create_course(self, course_name: str):
+  def replace_course(self, course: Course):
     """
-    Creates a new course with a given name.
+    Puts a copy of a course in place of the original.
 
     Parameters:
-        course_name (str): The name of the course to create.
+        course (Course): The copy.
     """
-    new_course = Course(course_name, self.course_id)
-    self.courses[self.course_id] = new_course
-    self.course_id += 1
+    self.unshare("courses")
+    self.courses[course.id] = course
 
-  def delete_course(self, course_id: int):
+  def snapshot(self) -> "CourseServiceView":
+    """
+    Returns a read-only view of every course as they are now, in O(1).
+
+    The view shares the courses and indexes of the service. While it is referenced, the service copies a course before
+    its first mutation, and an index before its first write. The view keeps the old objects, and none of its reads wait
+    for writers. Course objects retrieved from the service before the copy stay with the view's state and no longer
+    follow the service; the grade views of get_student_grades() and get_assignment_grades() do follow it.
+
+    Returns:
+        CourseServiceView: The view, which answers every query of the service.
+    """
+    from app.course_service_view import CourseServiceView
+    view = CourseServiceView(self)
+    self.views.add(view)
+    self.shared = set(SHARED_CONTAINERS)
+    self.owned_enrollments = set()
+    self.epoch += 1
+    return view
+
+  def writable_enrollments(self, student_id: int) -> Dict[int, None]:
     """
-    Deletes a course by its ID.
+    Retrieves a student's entry of the global student index to write to it, creating it if needed. While a view is
+    referenced, the index and the entry are each copied before their first write, and the other entries stay shared.
 
     Parameters:
-        course_id (int): The ID of the course to delete.
+        student_id (int): The ID of the student.
+
+    Returns:
+        Dict[int, None]: The IDs of the student's courses as keys, owned by the live service.
     """
-    self.get_course_by_id(course_id)  # Ensures the course exists before deletion
-    self.courses.pop(course_id)
+    self.unshare("student_courses")
+    course_ids = self.student_courses.get(student_id)
+    if course_ids is None:
+      course_ids = self.student_courses[student_id] = {}
+    elif self.views and student_id not in self.owned_enrollments:
+      course_ids = self.student_courses[student_id] = course_ids.copy()
+    if self.views:
+      self.owned_enrollments.add(student_id)
+    return course_ids
 
-  def create_assignment(self, course_id: int, assignment_name: str):
+  def index_enrollment(self, student_id: int, course_id: int):
     """
-    Creates an assignment for a course.
+    Records a student's enrollment in the global student index.
 
     Parameters:
+        student_id (int): The ID of the student.
         course_id (int): The ID of the course.
-        assignment_name (str): The name of the assignment.
     """
-    course = self.get_course_by_id(course_id)
-    course.create_course_assignment(assignment_name)
+    self.writable_enrollments(student_id)[course_id] = None
 
-  def enroll_student(self, course_id: int, student_id: int):
+  def unindex_enrollment(self, student_id: int, course_id: int):
     """
-    Enrolls a student in a course.
+    Removes a student's enrollment from the global student index.
 
     Parameters:
-        course_id (int): The ID of the course.
         student_id (int): The ID of the student.
+        course_id (int): The ID of the course.
     """
-    course = self.get_course_by_id(course_id)
-    course.enroll_student_in_course(student_id)
+    course_ids = self.writable_enrollments(student_id)
+    course_ids.pop(course_id, None)
+    if not course_ids:
+      del self.student_courses[student_id]
 
-  def dropout_student(self, course_id: int, student_id: int):
+  def attach_write_ahead_log(self, write_ahead_log: WriteAheadLog):
     """
-    Drops a student from a course.
+    Starts recording every mutation in a write-ahead log. Replay the log before attaching it when recovering.
 
     Parameters:
-        course_id (int): The ID of the course.
-        student_id (int): The ID of the student.
+        write_ahead_log (WriteAheadLog): The log to record mutations in.
     """
-    course = self.get_course_by_id(course_id)
-    course.drop_student_from_course(student_id, course_id)
+    write_ahead_log.sequence = max(write_ahead_log.sequence, self.log_sequence)
+    self.write_ahead_log = write_ahead_log
 
-  def submit_assignment(self, course_id: int, student_id: int, assignment_id: int, grade: int):
+  def attach_change_stream(self, change_stream: ChangeStream):
     """
-    Submits an assignment for a student with a given grade.
+    Starts publishing every mutation to a change stream, including the ones re-applied by replay().
 
     Parameters:
-        course_id (int): The ID of the course.
+        change_stream (ChangeStream): The stream to publish events to.
+    """
+    self.change_stream = change_stream
+
+  def replay(self, log_path: str) -> int:
+    """
+    Re-applies the mutations of a write-ahead log that are newer than the current state, e.g. after load_snapshot().
+
+    Parameters:
+        log_path (str): The path of the write-ahead log.
+
+    Returns:
+        int: The number of mutations applied.
+    """
+    write_ahead_log, self.write_ahead_log = self.write_ahead_log, None  # Replayed mutations are already logged
+    applied = 0
+    try:
+      for sequence, operation, args in read_write_ahead_log(log_path):
+        if sequence <= self.log_sequence:
+          continue  # Already part of the loaded snapshot
+        if operation == "create_course":
+          self.course_id, course_name = args
+          self.create_course(course_name)
+        elif operation == "create_assignment":
+          course_id, assignment_id, assignment_name = args
+          self.writable_course(course_id).assignment_id = assignment_id
+          self.create_assignment(course_id, assignment_name)
+        elif operation == "create_assignments_bulk":
+          course_id, first_assignment_id, assignment_names = args
+          self.writable_course(course_id).assignment_id = first_assignment_id
+          self.create_assignments_bulk(course_id, assignment_names)
+        else:
+          getattr(self, operation)(*args)
+        self.log_sequence = sequence
+        applied += 1
+    finally:
+      self.write_ahead_log = write_ahead_log
+    return applied
+
+  def compact_write_ahead_log(self, snapshot_path: str):
+    """
+    Saves a snapshot and empties the attached write-ahead log, whose records are all reflected in the snapshot.
+
+    Parameters:
+        snapshot_path (str): The path of the snapshot file.
+
+    Raises:
+        ValueError: If no write-ahead log is attached, in which case no snapshot is saved.
+    """
+    write_ahead_log = self.attached_write_ahead_log()
+    self.save_snapshot(snapshot_path)
+    write_ahead_log.truncate()
+
+  def attached_write_ahead_log(self) -> WriteAheadLog:
+    """
+    Returns the attached write-ahead log.
+
+    Raises:
+        ValueError: If no write-ahead log is attached.
+    """
+    if self.write_ahead_log is None:
+      raise ValueError("No write-ahead log is attached, see attach_write_ahead_log()")
+    return self.write_ahead_log
+
+  def get_courses(self) -> List[Course]:
+    """
+    Retrieves all courses.
+
+    Returns:
+        List[Course]: A list of all courses.
+    
+    Raises:
+        LookupError: If no courses are found.
+    """
+    if not self.courses:
+        raise LookupError("No courses found")
+    else:
+        return [course for course in self.courses.values()]
+
+  def get_course_after(self, after_id: Optional[int]) -> Optional[Course]:
+    """
+    Retrieves the course with the smallest ID greater than a cursor.
+
+    Parameters:
+        after_id (Optional[int]): The cursor, or None to start from the first course.
+
+    Returns:
+        Optional[Course]: The next course, or None if there is none.
+    """
+    position = 0 if after_id is None else bisect_right(self.course_ids, after_id)
+    if position == len(self.course_ids):
+      return None
+    return self.courses[self.course_ids[position]]
+
+  def iter_courses(self, after_id: Optional[int] = None) -> Iterator[Course]:
+    """
+    Lazily iterates over the courses in ascending ID order, without copying the collection.
+
+    Every step resumes from the ID of the last course yielded, so courses created or deleted during the iteration
+    never make it skip or repeat a course.
+
+    Parameters:
+        after_id (Optional[int]): Only courses with a greater ID are yielded, None yields every course.
+
+    Returns:
+        Iterator[Course]: The courses.
+    """
+    course = self.get_course_after(after_id)
+    while course is not None:
+      yield course
+      course = self.get_course_after(course.id)
+
+  def list_courses(self, after_id: Optional[int] = None, limit: int = 50) -> List[CourseSummary]:
+    """
+    Retrieves one page of course summaries in ascending ID order.
+
+    Parameters:
+        after_id (Optional[int]): The cursor, the ID of the last course of the previous page or None for the first page.
+        limit (int): The maximum number of courses on the page.
+
+    Returns:
+        List[CourseSummary]: The summaries of the page, empty past the last course.
+
+    Raises:
+        ValueError: If limit is not positive.
+    """
+    if limit <= 0:
+      raise ValueError(f"Page limit must be positive, got {limit}")
+    return [summarize_course(course) for course in islice(self.iter_courses(after_id), limit)]
+
+  def find_courses(self, prefix: str) -> List[Course]:
+    """
+    Retrieves the courses whose name starts with a prefix, in O(log n + k).
+
+    Parameters:
+        prefix (str): The prefix to search, "" matches every course.
+
+    Returns:
+        List[Course]: The matching courses ordered by name, courses with the same name by ID.
+    """
+    return [self.courses[course_id] for course_id in self.course_names.find(prefix)]
+
+  def get_course_by_id(self, course_id: int) -> Course:
+    """
+    Retrieves a course by its ID.
+
+    Parameters:
+        course_id (int): The ID of the course to retrieve.
+    
+    Returns:
+        Course: The course object associated with the given ID.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+    """
+    try:
+        course = self.courses[course_id]
+        return course
+    except KeyError:
+        raise KeyError(f"Course with ID {course_id} not found")
+
+  def create_course(self, course_name: str):
+    """
+    Creates a new course with a given name.
+
+    Parameters:
+        course_name (str): The name of the course to create.
+
+    Returns:
+        int: The ID of the new course.
+
+    Raises:
+        ValueError: If the name cannot be encoded as UTF-8.
+    """
+    check_name(course_name)
+    new_course = Course(course_name, self.course_id, self.compact_grades)
+    new_course.epoch = self.epoch
+    for container in ("courses", "course_ids", "course_names"):
+      self.unshare(container)
+    self.courses[self.course_id] = new_course
+    insort(self.course_ids, self.course_id)  # IDs only grow, so this appends
+    self.course_names.add(course_name, self.course_id)
+    self.course_id += 1
+    self.log_mutation("create_course", new_course.id, course_name)
+    return new_course.id
+
+  def delete_course(self, course_id: int):
+    """
+    Deletes a course by its ID, in time proportional to its enrollments. In archive mode the course is kept aside.
+
+    Parameters:
+        course_id (int): The ID of the course to delete.
+    """
+    course = self.get_course_by_id(course_id)  # Ensures the course exists before deletion
+    for container in ("courses", "course_ids", "course_names", "archived_courses"):
+      self.unshare(container)
+    self.courses.pop(course_id)
+    del self.course_ids[bisect_left(self.course_ids, course_id)]
+    self.course_names.remove(course.name, course_id)
+    for student_id in course.students_enrolled:
+      self.unindex_enrollment(student_id, course_id)
+    if self.archive:
+      self.archived_courses[course_id] = course
+    self.log_mutation("delete_course", course_id)
+
+  def get_archived_course(self, course_id: int) -> Course:
+    """
+    Retrieves a course deleted in archive mode. Archived courses are not part of snapshots.
+
+    Parameters:
+        course_id (int): The ID of the archived course.
+
+    Returns:
+        Course: The course as it was when deleted.
+
+    Raises:
+        KeyError: If no course with the given ID was archived.
+    """
+    try:
+      return self.archived_courses[course_id]
+    except KeyError:
+      raise KeyError(f"Archived course with ID {course_id} not found")
+
+  def rename_course(self, course_id: int, course_name: str):
+    """
+    Renames a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        course_name (str): The new name of the course.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+        ValueError: If the name cannot be encoded as UTF-8.
+    """
+    check_name(course_name)
+    course = self.writable_course(course_id)
+    self.unshare("course_names")
+    self.course_names.remove(course.name, course_id)
+    course.name = course_name
+    self.course_names.add(course_name, course_id)
+    self.log_mutation("rename_course", course_id, course_name)
+
+  def save_snapshot(self, path: str):
+    """
+    Saves every course to a binary snapshot file, replacing the file atomically.
+
+    Parameters:
+        path (str): The path of the snapshot file.
+    """
+    from app import snapshot  # Imported here as the snapshot module builds on the classes of this one
+    snapshot.save_snapshot(self, path)
+
+  def load_snapshot(self, path: str):
+    """
+    Replaces every course, and the course ID generator, with the ones of a snapshot file. Archived courses are dropped,
+    as snapshots do not hold them and their IDs could collide with the restored courses.
+
+    Parameters:
+        path (str): The path of the snapshot file.
+
+    Raises:
+        ValueError: If the file is not a snapshot written by save_snapshot() on a machine with the same byte order.
+    """
+    from app import snapshot
+    self.course_id, self.log_sequence, self.courses = snapshot.load_snapshot(path)
+    for course in self.courses.values():
+      course.epoch = self.epoch
+    self.course_ids = sorted(self.courses)
+    self.course_names = NameIndex()
+    for course in self.courses.values():
+      self.course_names.add(course.name, course.id)
+    self.student_courses = {}
+    self.archived_courses = {}
+    self.shared -= {"courses", "archived_courses", "course_ids", "course_names", "student_courses"}  # Fresh containers, not shared with any view
+    for course in self.courses.values():
+      for student_id in course.students_enrolled:
+        self.index_enrollment(student_id, course.id)
+    if self.change_stream is not None:
+      self.change_stream.publish("load_snapshot", ())
+
+  def create_assignment(self, course_id: int, assignment_name: str):
+    """
+    Creates an assignment for a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_name (str): The name of the assignment.
+
+    Returns:
+        int: The ID of the new assignment.
+
+    Raises:
+        ValueError: If the name cannot be encoded as UTF-8.
+    """
+    check_name(assignment_name)
+    course = self.writable_course(course_id)
+    assignment_id = course.create_course_assignment(assignment_name)
+    self.log_mutation("create_assignment", course_id, assignment_id, assignment_name)
+    return assignment_id
+
+  def create_assignments_bulk(self, course_id: int, assignment_names: Iterable[str]) -> List[int]:
+    """
+    Creates several assignments for a course at once, with contiguous IDs.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_names (Iterable[str]): The names of the assignments.
+
+    Returns:
+        List[int]: The IDs of the new assignments, in the order of their names.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+        ValueError: If a name cannot be encoded as UTF-8, in which case no assignment is created.
+    """
+    assignment_names = list(assignment_names)
+    for assignment_name in assignment_names:
+      check_name(assignment_name)
+    course = self.writable_course(course_id)
+    assignment_ids = course.create_course_assignments(assignment_names)
+    if assignment_ids:
+      self.log_mutation("create_assignments_bulk", course_id, assignment_ids[0], assignment_names)
+    return assignment_ids
+
+  def delete_assignment(self, course_id: int, assignment_id: int):
+    """
+    Deletes an assignment of a course, purging its submissions and updating the students' averages and ranking.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_id (int): The ID of the assignment.
+
+    Returns:
+        Dict[int, int]: The purged grades keyed by student ID.
+
+    Raises:
+        KeyError: If the course or the assignment does not exist.
+    """
+    course = self.writable_course(course_id)
+    removed = course.delete_course_assignment(assignment_id)
+    self.log_mutation("delete_assignment", course_id, assignment_id)
+    return removed
+
+  def rename_assignment(self, course_id: int, assignment_id: int, assignment_name: str):
+    """
+    Renames an assignment of a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_id (int): The ID of the assignment.
+        assignment_name (str): The new name of the assignment.
+
+    Raises:
+        KeyError: If the course or the assignment does not exist.
+        ValueError: If the name cannot be encoded as UTF-8.
+    """
+    check_name(assignment_name)
+    course = self.writable_course(course_id)
+    course.rename_course_assignment(assignment_id, assignment_name)
+    self.log_mutation("rename_assignment", course_id, assignment_id, assignment_name)
+
+  def find_assignments(self, course_id: int, prefix: str) -> List[Assignment]:
+    """
+    Retrieves the assignments of a course whose name starts with a prefix, in O(log n + k).
+
+    Parameters:
+        course_id (int): The ID of the course.
+        prefix (str): The prefix to search, "" matches every assignment.
+
+    Returns:
+        List[Assignment]: The matching assignments ordered by name, assignments with the same name by ID.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+    """
+    course = self.get_course_by_id(course_id)
+    return [course.assignments[assignment_id] for assignment_id in course.assignment_names.find(prefix)]
+
+  def enroll_student(self, course_id: int, student_id: int):
+    """
+    Enrolls a student in a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        student_id (int): The ID of the student.
+
+    Raises:
+        ValueError: If the student ID is not a 64-bit integer, or the student is already enrolled.
+    """
+    message = student_id_error(student_id)
+    if message is not None:
+      raise ValueError(message)
+    course = self.writable_course(course_id)
+    course.enroll_student_in_course(student_id)
+    self.index_enrollment(student_id, course_id)
+    self.log_mutation("enroll_student", course_id, student_id)
+
+  def enroll_students_bulk(self, course_id: int, student_ids: Iterable[int]) -> BulkResult:
+    """
+    Enrolls a batch of students in a course. The batch is validated up front and only applied if every row is valid.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        student_ids (Iterable[int]): The IDs of the students to enroll.
+
+    Returns:
+        BulkResult: The number of enrolled students, or the rows that stopped the batch from being applied.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+    """
+    course = self.writable_course(course_id)
+    student_ids = list(student_ids)
+    result = BulkResult()
+    seen = set()
+
+    for index, student_id in enumerate(student_ids):
+      message = student_id_error(student_id)
+      if message is None and (student_id in course.students_enrolled or student_id in seen):
+        message = f"Student with ID {student_id} is already enrolled in Course: {course.name} (id:{course_id})"
+      if message is None:
+        seen.add(student_id)
+        continue
+      result.errors.append(RowError(index, student_id, message))
+
+    if result.errors:
+      return result
+
+    for student_id in student_ids:
+      course.enroll_student_in_course(student_id)
+      self.index_enrollment(student_id, course_id)
+    result.applied = len(student_ids)
+    self.log_mutation("enroll_students_bulk", course_id, student_ids)
+    return result
+
+  def dropout_student(self, course_id: int, student_id: int):
+    """
+    Drops a student from a course, purging their submissions unless the service archives.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        student_id (int): The ID of the student.
+
+    Returns:
+        Dict[int, int]: The purged grades keyed by assignment ID, empty in archive mode.
+    """
+    course = self.writable_course(course_id)
+    removed = course.drop_student_from_course(student_id, course_id, keep_grades=self.archive)
+    self.unindex_enrollment(student_id, course_id)
+    self.log_mutation("dropout_student", course_id, student_id)
+    return removed
+
+  def submit_assignment(self, course_id: int, student_id: int, assignment_id: int, grade: int):
+    """
+    Submits an assignment for a student with a given grade.
+
+    Parameters:
+        course_id (int): The ID of the course.
         student_id (int): The ID of the student.
         assignment_id (int): The ID of the assignment.
         grade (int): The grade of the submission.
@@ -247,11 +1238,11 @@ class CourseServiceImpl(CourseService):
     Raises:
         ValueError: If the grade is not between 0 and 100, or if the assignment has already been submitted.
     """
-    if grade < 0 or grade > 100:
+    if not isfinite(grade) or grade < 0 or grade > 100:
       raise ValueError("Grade must be between 0 and 100 inclusive.")
 
-    course = self.get_course_by_id(course_id)
-    student = course.get_student_by_id(student_id) # Ensures student with student_id does exist
+    course = self.writable_course(course_id)
+    course.require_student(student_id)  # Ensures student with student_id does exist
     assignment = course.get_assignment_by_id(assignment_id) # Ensures assignment with assignment_id does exist
     
     # ensuring there are no re-submissions
@@ -259,7 +1250,60 @@ class CourseServiceImpl(CourseService):
     if existing_grade is not None:
         raise ValueError(f"Student ID: {student_id} has already submitted {course.assignments[assignment_id].name} (id:{assignment_id}) in Course: {course.name} (id:{course_id})")
 
-    course.grades[(student.id, assignment.id)] = grade
+    course.record_grade(student_id, assignment.id, grade)
+    self.log_mutation("submit_assignment", course_id, student_id, assignment_id, grade)
+
+  def submit_assignments_bulk(self, course_id: int, submissions: Iterable[Tuple[int, int, int]]) -> BulkResult:
+    """
+    Submits a batch of assignments. The batch is validated up front and only applied if every row is valid.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        submissions (Iterable[Tuple[int, int, int]]): The (student_id, assignment_id, grade) rows to submit.
+
+    Returns:
+        BulkResult: The number of submitted rows, or the rows that stopped the batch from being applied.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+    """
+    course = self.writable_course(course_id)
+    submissions = list(submissions)
+    result = BulkResult()
+    seen = set()
+    integer_grades_only = course.grades.integer_grades_only
+
+    for index, row in enumerate(submissions):
+      try:
+        student_id, assignment_id, grade = row
+      except (TypeError, ValueError):
+        result.errors.append(RowError(index, row, "Row must be a (student_id, assignment_id, grade) triple."))
+        continue
+      try:
+        if not isinstance(grade, (int, float)) or not isfinite(grade) or grade < 0 or grade > 100:
+          message = "Grade must be between 0 and 100 inclusive."
+        elif integer_grades_only and not isinstance(grade, int):
+          message = f"Course: {course.name} (id:{course_id}) only accepts integer grades."
+        elif student_id not in course.students_enrolled:
+          message = f"Student with ID {student_id} not found in Course: {course.name} (id:{course_id})"
+        elif assignment_id not in course.assignments:
+          message = f"Assignment with ID {assignment_id} not found in course {course_id}"
+        elif (student_id, assignment_id) in course.grades or (student_id, assignment_id) in seen:
+          message = f"Student ID: {student_id} has already submitted {course.assignments[assignment_id].name} (id:{assignment_id}) in Course: {course.name} (id:{course_id})"
+        else:
+          seen.add((student_id, assignment_id))
+          continue
+      except TypeError:  # Unhashable IDs
+        message = f"Student and assignment IDs must be integers, got {student_id!r} and {assignment_id!r}."
+      result.errors.append(RowError(index, row, message))
+
+    if result.errors:
+      return result
+
+    course.record_grades(submissions)
+    result.applied = len(submissions)
+    self.log_mutation("submit_assignments_bulk", course_id, submissions)
+    return result
 
   def get_assignment_grade_avg(self, course_id: int, assignment_id: int) -> int:
     """
@@ -271,17 +1315,70 @@ class CourseServiceImpl(CourseService):
     
     Returns:
         int: The average grade for the assignment.
+
+    Raises:
+        ValueError: If the assignment has no submissions.
+    """
+    course = self.get_course_by_id(course_id)
+    assignment = course.get_assignment_by_id(assignment_id)  # Ensures the assignment exists
+    return course.assignment_aggregates[assignment.id].average()
+
+  def get_assignment_percentile(self, course_id: int, assignment_id: int, p: float) -> int:
+    """
+    Calculates a nearest-rank percentile of the grades of an assignment, in constant time.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_id (int): The ID of the assignment.
+        p (float): The percentile, between 0 and 100.
+
+    Returns:
+        int: The lowest grade at least p percent of the grades are at or below, floored for fractional grades.
+
+    Raises:
+        KeyError: If the course or the assignment does not exist.
+        ValueError: If p is out of range or the assignment has no submissions.
+    """
+    course = self.get_course_by_id(course_id)
+    assignment = course.get_assignment_by_id(assignment_id)  # Ensures the assignment exists
+    return course.assignment_aggregates[assignment.id].percentile(p)
+
+  def get_assignment_median(self, course_id: int, assignment_id: int) -> float:
+    """
+    Calculates the median grade of an assignment, in constant time.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_id (int): The ID of the assignment.
+
+    Returns:
+        float: The median grade, the mean of the two middle grades for an even count, floored for fractional grades.
+
+    Raises:
+        KeyError: If the course or the assignment does not exist.
+        ValueError: If the assignment has no submissions.
     """
     course = self.get_course_by_id(course_id)
     assignment = course.get_assignment_by_id(assignment_id)  # Ensures the assignment exists
-    total_grade, total_count = 0, 0
+    return course.assignment_aggregates[assignment.id].median()
+
+  def get_assignment_distribution(self, course_id: int, assignment_id: int) -> List[int]:
+    """
+    Retrieves the distribution of the grades of an assignment, in constant time.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_id (int): The ID of the assignment.
 
-    for (_, a_id), grade in course.grades.items():
-        if a_id == assignment.id:
-            total_grade += grade
-            total_count += 1
+    Returns:
+        List[int]: The number of grades per integer grade from 0 to 100, fractional grades counted at their floor.
 
-    return int(total_grade // total_count)
+    Raises:
+        KeyError: If the course or the assignment does not exist.
+    """
+    course = self.get_course_by_id(course_id)
+    assignment = course.get_assignment_by_id(assignment_id)  # Ensures the assignment exists
+    return list(course.assignment_aggregates[assignment.id].histogram)
     
   def get_student_grade_avg(self, course_id: int, student_id: int) -> int:
     """
@@ -293,17 +1390,129 @@ class CourseServiceImpl(CourseService):
     
     Returns:
         int: The average grade of the student across all assignments in the course.
+
+    Raises:
+        ValueError: If the student has no submissions.
     """
     course = self.get_course_by_id(course_id)
-    student = course.get_student_by_id(student_id) # Ensures the student exists
-    total_grade, total_count = 0, 0
-    
-    for (s_id, a_id), grade in course.grades.items():
-      if s_id == student.id:
-        total_grade += grade
-        total_count += 1
-    
-    return int(total_grade//total_count)
+    course.require_student(student_id)  # Ensures the student exists
+    return course.student_aggregates[student_id].average()
+
+  def get_student_grades(self, course_id: int, student_id: int) -> Mapping[int, int]:
+    """
+    Retrieves the grades of a student in a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        student_id (int): The ID of the student.
+
+    Returns:
+        Mapping[int, int]: A read-only live view of the student's grades keyed by assignment ID.
+
+    Raises:
+        KeyError: If the course does not exist or the student is not enrolled in it.
+    """
+    course = self.get_course_by_id(course_id)
+    course.require_student(student_id)  # Ensures the student exists
+    return LiveGrades(self, course, lambda course: course.grades.student_grades(student_id))
+
+  def get_assignment_grades(self, course_id: int, assignment_id: int) -> Mapping[int, int]:
+    """
+    Retrieves the grades submitted for an assignment in a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        assignment_id (int): The ID of the assignment.
+
+    Returns:
+        Mapping[int, int]: A read-only live view of the assignment's grades keyed by student ID.
+
+    Raises:
+        KeyError: If the course or the assignment does not exist.
+    """
+    course = self.get_course_by_id(course_id)
+    assignment = course.get_assignment_by_id(assignment_id)  # Ensures the assignment exists
+    return LiveGrades(self, course, lambda course: course.grades.assignment_grades(assignment.id))
+
+  def get_course_statistics(self, course_id: int) -> CourseStatistics:
+    """
+    Computes every student average, every assignment average and the grade distribution of a course in one pass.
+
+    Parameters:
+        course_id (int): The ID of the course.
+
+    Returns:
+        CourseStatistics: The statistics of the course.
+    """
+    course = self.get_course_by_id(course_id)
+    return compute_course_statistics(course)
+
+  def get_student_courses(self, student_id: int) -> List[int]:
+    """
+    Retrieves the courses a student is enrolled in.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        List[int]: The IDs of the student's courses in ascending order, empty if the student is enrolled nowhere.
+    """
+    return sorted(self.student_courses.get(student_id, ()))
+
+  def get_student_transcript(self, student_id: int) -> Dict[int, Optional[int]]:
+    """
+    Retrieves a student's average grade in every course they are enrolled in.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        Dict[int, Optional[int]]: The floored average of the student per course ID, None for courses without submissions.
+    """
+    transcript = {}
+    for course_id in self.get_student_courses(student_id):
+      try:
+        transcript[course_id] = self.get_student_grade_avg(course_id, student_id)
+      except ValueError:  # No submissions in this course yet
+        transcript[course_id] = None
+    return transcript
+
+  def get_student_rank(self, course_id: int, student_id: int) -> int:
+    """
+    Retrieves the rank of a student within a course, ordered and tie-broken like get_top_k_students().
+
+    Parameters:
+        course_id (int): The ID of the course.
+        student_id (int): The ID of the student.
+
+    Returns:
+        int: The 1-based rank of the student, 1 being the best.
+
+    Raises:
+        KeyError: If the course does not exist or the student is not enrolled in it.
+    """
+    course = self.get_course_by_id(course_id)
+    course.require_student(student_id)  # Ensures the student exists
+    return course.leaderboard.rank(student_id)
+
+  def get_student_percentile(self, course_id: int, student_id: int) -> float:
+    """
+    Retrieves the standing of a student within a course, as the percentage of enrolled students ranked at or below them.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        student_id (int): The ID of the student.
+
+    Returns:
+        float: The standing, 100 for the best ranked student down to 100 / n for the last of n students.
+
+    Raises:
+        KeyError: If the course does not exist or the student is not enrolled in it.
+    """
+    course = self.get_course_by_id(course_id)
+    course.require_student(student_id)  # Ensures the student exists
+    enrolled = len(course.leaderboard)
+    return (enrolled - course.leaderboard.rank(student_id) + 1) * 100 / enrolled
 
   def get_top_five_students(self, course_id: int) -> List[int]:
     """
@@ -313,25 +1522,36 @@ class CourseServiceImpl(CourseService):
         course_id (int): The ID of the course.
     
     Returns:
-        List[Student]: A list of the top five students in the course.
+        List[int]: The IDs of the top five students in the course.
     
     Raises:
         ValueError: If no students are enrolled in the course.
     """
+    return self.get_top_k_students(course_id, 5)
+
+  def get_top_k_students(self, course_id: int, k: int) -> List[int]:
+    """
+    Retrieves the top k students based on their average grades in a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+        k (int): The number of students to retrieve.
+
+    Returns:
+        List[int]: The IDs of the top k students in the course, best first.
+
+    Raises:
+        ValueError: If k is negative or no students are enrolled in the course.
+    """
+    if k < 0:
+      raise ValueError("k must be a non-negative integer.")
 
     course = self.get_course_by_id(course_id)
-    student_grades = {} # {student_id : total_grade}
-    
+
     if not course.students_enrolled:
         raise ValueError(f"No students are enrolled in the course with ID {course_id}.")
-    
-    for student_id in course.students_enrolled.keys():
-      student_grades[student_id] = self.get_student_grade_avg(course_id, student_id)
-    
-    sorted_student_grades = sorted(student_grades.items(), key=lambda x: x[1], reverse=True) # using grades to sort in Descending order
-    top_student_ids = [student_id for student_id, student_object in sorted_student_grades[:5]] # slicing top 5 from sorted grades
 
-    return top_student_ids
+    return course.leaderboard.top(k)
 
 
     
@@ -0,0 +1,63 @@
+from typing import Mapping
+
+from app.course_service_impl import CourseServiceImpl
+from app.write_ahead_log import OPERATION_CODES
+
+# Methods of CourseServiceImpl that change the service, refused by a view
+MUTATING_METHODS = tuple(OPERATION_CODES) + (
+  "load_snapshot",
+  "replay",
+  "compact_write_ahead_log",
+  "attach_write_ahead_log",
+  "attach_change_stream",
+  "writable_course",
+  "replace_course",
+  "writable_enrollments",
+  "index_enrollment",
+  "unindex_enrollment",
+)
+
+
+class CourseServiceView(CourseServiceImpl):
+  """
+  Read-only, point-in-time view of a CourseServiceImpl, returned by CourseServiceImpl.snapshot().
+
+  Every query runs against the courses and indexes as they were when the view was taken, so a report made of many
+  queries is consistent, and it never waits for the service's writers. Mutations throw TypeError. A view keeps the
+  objects it shares alive: while it is referenced, every course the service changes costs one copy. Once it is
+  garbage collected, the service stops copying.
+  """
+  def __init__(self, course_service: CourseServiceImpl):
+    """
+    Initializes a view sharing the current containers of a service, in O(1).
+
+    Parameters:
+        course_service (CourseServiceImpl): The service to view.
+    """
+    super().__init__(course_service.compact_grades, course_service.archive)
+    self.courses = course_service.courses
+    self.archived_courses = course_service.archived_courses
+    self.course_ids = course_service.course_ids
+    self.course_names = course_service.course_names
+    self.student_courses = course_service.student_courses
+    self.course_id = course_service.course_id
+    self.log_sequence = course_service.log_sequence
+
+  def snapshot(self) -> "CourseServiceView":
+    return self  # Already immutable
+
+  def get_student_grades(self, course_id: int, student_id: int) -> Mapping[int, int]:
+    course = self.get_course_by_id(course_id)
+    course.require_student(student_id)  # Ensures the student exists
+    return course.grades.student_grades(student_id, live=False)  # The view's courses never change, no need to follow them
+
+
+def _read_only(method_name: str):
+  def read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only, {method_name}() is not supported")
+  read_only.__name__ = method_name
+  return read_only
+
+
+for _method_name in MUTATING_METHODS:
+  setattr(CourseServiceView, _method_name, _read_only(_method_name))
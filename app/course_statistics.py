@@ -0,0 +1,147 @@
+from dataclasses import dataclass, field
+from itertools import chain
+from math import sqrt
+from typing import Dict, List, Optional
+
+from app.grade_store import CompactGradeStore
+
+try:
+  import numpy as np
+except ImportError:  # NumPy is optional, statistics are then computed in pure Python
+  np = None
+
+HISTOGRAM_BUCKETS = 101  # One bucket per integer grade, fractional grades fall into the bucket of their floor
+
+
+@dataclass(frozen=True)
+class CourseStatistics:
+  """
+  Course-wide grade statistics, computed in a single pass over the grades of a course.
+
+  Averages are floored like get_student_grade_avg() and get_assignment_grade_avg(). Students and assignments without
+  submissions are left out of the averages, and the grade-wide figures are None for a course without submissions.
+  """
+  course_id: int
+  submission_count: int
+  student_averages: Dict[int, int]  # Floored average per enrolled student ID
+  assignment_averages: Dict[int, int]  # Floored average per assignment ID
+  minimum: Optional[float]
+  maximum: Optional[float]
+  median: Optional[float]
+  stddev: Optional[float]  # Population standard deviation
+  histogram: List[int] = field(repr=False)  # Number of grades per integer grade from 0 to 100
+
+
+def compute_course_statistics(course) -> CourseStatistics:
+  """
+  Computes the statistics of a course, using NumPy when it is installed.
+
+  Parameters:
+      course (Course): The course to compute the statistics of.
+
+  Returns:
+      CourseStatistics: The statistics of the course.
+  """
+  if np is not None:
+    return _compute_with_numpy(course)
+  return _compute_with_python(course)
+
+
+def _compute_with_python(course) -> CourseStatistics:
+  student_totals, assignment_totals = {}, {}
+  histogram = [0] * HISTOGRAM_BUCKETS
+  values = []
+  total, total_squares = 0, 0
+
+  for (student_id, assignment_id), grade in course.grades.items():
+    student_total = student_totals.get(student_id)
+    if student_total is None:
+      student_totals[student_id] = [grade, 1]
+    else:
+      student_total[0] += grade
+      student_total[1] += 1
+    assignment_total = assignment_totals.get(assignment_id)
+    if assignment_total is None:
+      assignment_totals[assignment_id] = [grade, 1]
+    else:
+      assignment_total[0] += grade
+      assignment_total[1] += 1
+    histogram[int(grade)] += 1
+    values.append(grade)
+    total += grade
+    total_squares += grade * grade
+
+  student_averages = {
+    student_id: int(grade_total // count)
+    for student_id, (grade_total, count) in student_totals.items()
+    if student_id in course.students_enrolled
+  }
+  assignment_averages = {assignment_id: int(grade_total // count) for assignment_id, (grade_total, count) in assignment_totals.items()}
+
+  if not values:
+    return CourseStatistics(course.id, 0, student_averages, assignment_averages, None, None, None, None, histogram)
+
+  values.sort()
+  count = len(values)
+  middle = count // 2
+  median = float(values[middle]) if count % 2 else (values[middle - 1] + values[middle]) / 2
+  mean = total / count
+  stddev = sqrt(max(total_squares / count - mean * mean, 0))
+  return CourseStatistics(course.id, count, student_averages, assignment_averages, values[0], values[-1], median, stddev, histogram)
+
+
+def _grade_columns(grades):
+  """
+  Returns the grades of a store as parallel (student_ids, assignment_ids, grades) NumPy arrays.
+  """
+  if isinstance(grades, CompactGradeStore):
+    matrix = np.frombuffer(bytes(grades.matrix), dtype=np.uint8).reshape(len(grades.row_students), grades.stride)
+    rows, assignment_ids = np.nonzero(matrix != CompactGradeStore.NOT_SUBMITTED)
+    student_ids = np.asarray(grades.row_students, dtype=np.int64)[rows]
+    return student_ids, assignment_ids.astype(np.int64), matrix[rows, assignment_ids].astype(np.int64)
+
+  by_student = grades.by_student
+  count = len(grades)
+  student_counts = np.fromiter(map(len, by_student.values()), dtype=np.int64, count=len(by_student))
+  student_ids = np.repeat(np.fromiter(by_student.keys(), dtype=np.int64, count=len(by_student)), student_counts)
+  assignment_ids = np.fromiter(chain.from_iterable(by_student.values()), dtype=np.int64, count=count)
+  values = np.fromiter(chain.from_iterable(student_grades.values() for student_grades in by_student.values()), dtype=np.float64, count=count)
+  if np.array_equal(values, np.floor(values)):
+    values = values.astype(np.int64)  # Integer grades keep integer sums, so the floored averages are exact
+  return student_ids, assignment_ids, values
+
+
+def _floored_averages(ids, values) -> Dict[int, int]:
+  unique_ids, positions = np.unique(ids, return_inverse=True)
+  totals = np.zeros(len(unique_ids), dtype=values.dtype)
+  np.add.at(totals, positions, values)
+  counts = np.bincount(positions, minlength=len(unique_ids))
+  averages = np.floor_divide(totals, counts)
+  return {int(key): int(average) for key, average in zip(unique_ids, averages)}
+
+
+def _compute_with_numpy(course) -> CourseStatistics:
+  student_ids, assignment_ids, values = _grade_columns(course.grades)
+
+  student_averages = {
+    student_id: average
+    for student_id, average in _floored_averages(student_ids, values).items()
+    if student_id in course.students_enrolled
+  }
+  assignment_averages = _floored_averages(assignment_ids, values)
+  histogram = np.bincount(values.astype(np.int64), minlength=HISTOGRAM_BUCKETS).tolist()
+
+  if not len(values):
+    return CourseStatistics(course.id, 0, student_averages, assignment_averages, None, None, None, None, histogram)
+
+  return CourseStatistics(
+    course.id,
+    int(len(values)),
+    student_averages,
+    assignment_averages,
+    values.min().item(),
+    values.max().item(),
+    float(np.median(values)),
+    float(values.std()),
+    histogram,
+  )
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CourseSummary:
+  """
+  Lightweight projection of a course for listings, built in O(1) without touching grade data.
+  """
+  course_id: int
+  name: str
+  enrolled_count: int  # Number of currently enrolled students
+  assignment_count: int
+
+
+def summarize_course(course) -> CourseSummary:
+  """
+  Projects a course onto its summary.
+
+  Parameters:
+      course (Course): The course to summarize.
+
+  Returns:
+      CourseSummary: The summary of the course.
+  """
+  return CourseSummary(course.id, course.name, len(course.students_enrolled), len(course.assignments))
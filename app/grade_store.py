@@ -0,0 +1,453 @@
+from collections.abc import ItemsView, Mapping
+from types import MappingProxyType
+from typing import Dict, Iterator, Tuple
+
+# Grade stores map (student_id, assignment_id) keys to grades, so `course.grades` reads the same whatever the layout.
+# Both also index grades by student and by assignment, and hand out read-only live views of those indexes.
+
+NO_GRADES: Dict[int, int] = {}  # Grades of a student without any submission, only ever handed out read-only
+
+
+class DictGradeStore(Mapping):
+  """
+  Default grade storage, keeping every grade in a per-student and a per-assignment dict index.
+
+  (student_id, assignment_id) lookups go through the student index, so no tuple key is ever allocated per submission.
+  A student's grade dict is only allocated on their first submission, enrolled students without grades cost nothing.
+  """
+  integer_grades_only = False
+
+  def __init__(self):
+    """
+    Initializes an empty DictGradeStore.
+    """
+    self.by_student: Dict[int, Dict[int, int]] = {}  # Index of grades as {student_id: {assignment_id: grade}}
+    self.by_assignment: Dict[int, Dict[int, int]] = {}  # Index of grades as {assignment_id: {student_id: grade}}
+    self.count = 0  # Number of stored grades
+    self.owned_students = None  # IDs of the students whose grade dict this copy may write, None for all, see copy()
+    self.owned_assignments = None  # IDs of the assignments whose grade dict this copy may write, None for all
+
+  def __getitem__(self, key: Tuple[int, int]) -> int:
+    try:
+      student_id, assignment_id = key
+      return self.by_student[student_id][assignment_id]
+    except (KeyError, TypeError, ValueError):
+      raise KeyError(key)
+
+  def __iter__(self) -> Iterator[Tuple[int, int]]:
+    for student_id, student_grades in self.by_student.items():
+      for assignment_id in student_grades:
+        yield (student_id, assignment_id)
+
+  def __len__(self) -> int:
+    return self.count
+
+  def copy(self) -> "DictGradeStore":
+    """
+    Returns an independent copy of the store, in time proportional to its students and assignments.
+
+    The per-student and per-assignment grade dicts are shared with the original, and the copy replaces one by its own
+    copy before writing to it, so the original must no longer be written to.
+    """
+    grades = DictGradeStore()
+    grades.by_student = self.by_student.copy()
+    grades.by_assignment = self.by_assignment.copy()
+    grades.count = self.count
+    grades.owned_students, grades.owned_assignments = set(), set()
+    return grades
+
+  def _writable_student_grades(self, student_id: int) -> Dict[int, int]:
+    """
+    Retrieves the grade dict of a student to write to it, creating it, or copying it if it is shared, as needed.
+    """
+    student_grades = self.by_student.get(student_id)
+    if student_grades is None:
+      student_grades = self.by_student[student_id] = {}
+    elif self.owned_students is not None and student_id not in self.owned_students:
+      student_grades = self.by_student[student_id] = student_grades.copy()
+    if self.owned_students is not None:
+      self.owned_students.add(student_id)
+    return student_grades
+
+  def _writable_assignment_grades(self, assignment_id: int) -> Dict[int, int]:
+    """
+    Retrieves the grade dict of an assignment to write to it, copying it if it is shared.
+    """
+    assignment_grades = self.by_assignment[assignment_id]
+    if self.owned_assignments is not None and assignment_id not in self.owned_assignments:
+      assignment_grades = self.by_assignment[assignment_id] = assignment_grades.copy()
+      self.owned_assignments.add(assignment_id)
+    return assignment_grades
+
+  def __contains__(self, key) -> bool:
+    try:
+      self[key]
+      return True
+    except KeyError:
+      return False
+
+  def get(self, key, default=None):
+    try:
+      return self[key]
+    except KeyError:
+      return default
+
+  def items(self) -> ItemsView:
+    return _DictItemsView(self)
+
+  def add_student(self, student_id: int):
+    """
+    Makes room for the grades of a student. Existing grades of the student are kept.
+
+    Parameters:
+        student_id (int): The ID of the student.
+    """
+    # Nothing to allocate up front, set() creates the student's grade dict on their first submission
+
+  def add_assignment(self, assignment_id: int):
+    """
+    Makes room for the grades of an assignment.
+
+    Parameters:
+        assignment_id (int): The ID of the assignment.
+    """
+    self.by_assignment.setdefault(assignment_id, {})
+
+  def remove_assignment(self, assignment_id: int) -> Dict[int, int]:
+    """
+    Removes an assignment and every grade submitted for it, in time proportional to its grades.
+
+    Parameters:
+        assignment_id (int): The ID of the assignment.
+
+    Returns:
+        Dict[int, int]: The removed grades keyed by student ID.
+    """
+    assignment_grades = self.by_assignment.pop(assignment_id, {})
+    for student_id in assignment_grades:
+      del self._writable_student_grades(student_id)[assignment_id]
+    self.count -= len(assignment_grades)
+    return assignment_grades
+
+  def remove_student(self, student_id: int) -> Dict[int, int]:
+    """
+    Removes every grade of a student, in time proportional to their grades.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        Dict[int, int]: The removed grades keyed by assignment ID.
+    """
+    student_grades = self.by_student.pop(student_id, {})
+    for assignment_id in student_grades:
+      del self._writable_assignment_grades(assignment_id)[student_id]
+    self.count -= len(student_grades)
+    return student_grades
+
+  def set(self, student_id: int, assignment_id: int, grade: int):
+    """
+    Stores a grade.
+
+    Parameters:
+        student_id (int): The ID of the student.
+        assignment_id (int): The ID of the assignment.
+        grade (int): The grade of the submission.
+    """
+    if self.owned_students is None:
+      student_grades = self.by_student.get(student_id)
+      if student_grades is None:
+        student_grades = self.by_student[student_id] = {}
+      assignment_grades = self.by_assignment[assignment_id]
+    else:
+      student_grades = self._writable_student_grades(student_id)
+      assignment_grades = self._writable_assignment_grades(assignment_id)
+    if assignment_id not in student_grades:
+      self.count += 1
+    student_grades[assignment_id] = grade
+    assignment_grades[student_id] = grade
+
+  def student_grades(self, student_id: int, live: bool = True) -> Mapping:
+    """
+    Returns a read-only view of a student's grades keyed by assignment ID. Never allocates, whatever `live`.
+
+    Parameters:
+        student_id (int): The ID of the student.
+        live (bool): Whether the view has to follow the student's first submission, which allocates their grade dict.
+            A live view looks the grade dict up on every access, a non-live one wraps the current dict directly.
+    """
+    if not live:
+      return MappingProxyType(self.by_student.get(student_id, NO_GRADES))
+    return _DictStudentView(self, student_id)
+
+  def assignment_grades(self, assignment_id: int) -> Mapping:
+    """
+    Returns a read-only live view of an assignment's grades keyed by student ID.
+    """
+    return MappingProxyType(self.by_assignment[assignment_id])
+
+
+class CompactGradeStore(Mapping):
+  """
+  Memory-lean grade storage, keeping grades as a dense student-row by assignment-column matrix of unsigned bytes.
+
+  A cell costs a single byte instead of the 100+ bytes of a dict entry with a tuple key, at the price of only
+  holding integer grades. Columns are assignment IDs, which each course hands out densely from 0.
+  """
+  NOT_SUBMITTED = 255  # Sentinel for cells without a submission, grades only go up to 100
+  integer_grades_only = True
+
+  def __init__(self):
+    """
+    Initializes an empty CompactGradeStore.
+    """
+    self.matrix = bytearray()  # Row-major grade matrix, `stride` cells per student row
+    self.stride = 0  # Number of assignment columns allocated per row
+    self.rows: Dict[int, int] = {}  # Stores the matrix row of every student with student IDs as keys
+    self.row_students = []  # Student ID owning each matrix row
+    self.assignment_ids = set()  # IDs of the assignments that have a column
+    self.count = 0  # Number of submitted cells
+
+  def _widen(self, columns: int):
+    """
+    Re-lays the matrix out so that every row has room for at least `columns` assignments.
+    """
+    stride = max(columns, self.stride * 2, 8)
+    padding = bytes([self.NOT_SUBMITTED]) * (stride - self.stride)
+    matrix = bytearray()
+    for row in range(len(self.row_students)):
+      matrix += self.matrix[row * self.stride:(row + 1) * self.stride]
+      matrix += padding
+    self.matrix, self.stride = matrix, stride
+
+  def _cell(self, student_id: int, assignment_id: int) -> int:
+    if assignment_id not in self.assignment_ids:
+      raise KeyError((student_id, assignment_id))
+    return self.rows[student_id] * self.stride + assignment_id
+
+  def __getitem__(self, key: Tuple[int, int]) -> int:
+    try:
+      grade = self.matrix[self._cell(*key)]
+    except (KeyError, TypeError):
+      raise KeyError(key)
+    if grade == self.NOT_SUBMITTED:
+      raise KeyError(key)
+    return grade
+
+  def __iter__(self) -> Iterator[Tuple[int, int]]:
+    for row, student_id in enumerate(self.row_students):
+      cells = self.matrix[row * self.stride:(row + 1) * self.stride]
+      for assignment_id, grade in enumerate(cells):
+        if grade != self.NOT_SUBMITTED:
+          yield (student_id, assignment_id)
+
+  def __len__(self) -> int:
+    return self.count
+
+  def copy(self) -> "CompactGradeStore":
+    """
+    Returns an independent copy of the store.
+    """
+    grades = CompactGradeStore()
+    grades.matrix = self.matrix.copy()
+    grades.stride = self.stride
+    grades.rows = self.rows.copy()
+    grades.row_students = self.row_students.copy()
+    grades.assignment_ids = self.assignment_ids.copy()
+    grades.count = self.count
+    return grades
+
+  def items(self) -> ItemsView:
+    return _CompactItemsView(self)
+
+  def add_student(self, student_id: int):
+    """
+    Allocates a matrix row for a student. Existing grades of the student are kept.
+
+    Parameters:
+        student_id (int): The ID of the student.
+    """
+    if student_id in self.rows:
+      return
+    self.rows[student_id] = len(self.row_students)
+    self.row_students.append(student_id)
+    self.matrix += bytes([self.NOT_SUBMITTED]) * self.stride
+
+  def add_assignment(self, assignment_id: int):
+    """
+    Allocates a matrix column for an assignment.
+
+    Parameters:
+        assignment_id (int): The ID of the assignment.
+    """
+    if assignment_id >= self.stride:
+      self._widen(assignment_id + 1)
+    self.assignment_ids.add(assignment_id)
+
+  def remove_assignment(self, assignment_id: int) -> Dict[int, int]:
+    """
+    Removes an assignment and every grade submitted for it. Its column stays allocated, as IDs are never reused.
+
+    Parameters:
+        assignment_id (int): The ID of the assignment.
+
+    Returns:
+        Dict[int, int]: The removed grades keyed by student ID.
+    """
+    if assignment_id not in self.assignment_ids:
+      return {}
+    self.assignment_ids.remove(assignment_id)
+    stride = self.stride
+    cells = self.matrix[assignment_id::stride]
+    removed = {self.row_students[row]: grade for row, grade in enumerate(cells) if grade != self.NOT_SUBMITTED}
+    self.matrix[assignment_id::stride] = bytes([self.NOT_SUBMITTED]) * len(cells)
+    self.count -= len(removed)
+    return removed
+
+  def remove_student(self, student_id: int) -> Dict[int, int]:
+    """
+    Removes every grade of a student and releases their matrix row, by moving the last row into its place.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        Dict[int, int]: The removed grades keyed by assignment ID.
+    """
+    row = self.rows.pop(student_id, None)
+    if row is None:
+      return {}
+    stride = self.stride
+    cells = self.matrix[row * stride:(row + 1) * stride]
+    removed = {assignment_id: grade for assignment_id, grade in enumerate(cells) if grade != self.NOT_SUBMITTED}
+
+    last_row = len(self.row_students) - 1
+    moved_student_id = self.row_students.pop()
+    if row != last_row:
+      self.matrix[row * stride:(row + 1) * stride] = self.matrix[last_row * stride:]
+      self.row_students[row] = moved_student_id
+      self.rows[moved_student_id] = row
+    del self.matrix[last_row * stride:]
+    self.count -= len(removed)
+    return removed
+
+  def set(self, student_id: int, assignment_id: int, grade: int):
+    """
+    Stores a grade.
+
+    Parameters:
+        student_id (int): The ID of the student.
+        assignment_id (int): The ID of the assignment.
+        grade (int): The grade of the submission.
+
+    Raises:
+        ValueError: If the grade is not an integer between 0 and 100.
+    """
+    if not isinstance(grade, int) or not 0 <= grade <= 100:
+      raise ValueError(f"Compact grade storage only holds integer grades between 0 and 100, got {grade!r}")
+    cell = self._cell(student_id, assignment_id)
+    if self.matrix[cell] == self.NOT_SUBMITTED:
+      self.count += 1
+    self.matrix[cell] = grade
+
+  def student_grades(self, student_id: int, live: bool = True) -> Mapping:
+    """
+    Returns a read-only live view of a student's grades keyed by assignment ID. Never allocates, whatever `live`.
+    """
+    self.rows[student_id]  # Ensures the student has a row
+    return _CompactStudentView(self, student_id)
+
+  def assignment_grades(self, assignment_id: int) -> Mapping:
+    """
+    Returns a read-only live view of an assignment's grades keyed by student ID.
+    """
+    if assignment_id not in self.assignment_ids:
+      raise KeyError(assignment_id)
+    return _CompactAssignmentView(self, assignment_id)
+
+
+class _DictItemsView(ItemsView):
+  """
+  Items view of a DictGradeStore that walks the student index instead of looking every key up again.
+  """
+  def __iter__(self):
+    for student_id, student_grades in self._mapping.by_student.items():
+      for assignment_id, grade in student_grades.items():
+        yield ((student_id, assignment_id), grade)
+
+
+class _CompactItemsView(ItemsView):
+  """
+  Items view of a CompactGradeStore that walks the matrix row by row instead of looking every key up again.
+  """
+  def __iter__(self):
+    store = self._mapping
+    for row, student_id in enumerate(store.row_students):
+      cells = store.matrix[row * store.stride:(row + 1) * store.stride]
+      for assignment_id, grade in enumerate(cells):
+        if grade != store.NOT_SUBMITTED:
+          yield ((student_id, assignment_id), grade)
+
+
+class _DictStudentView(Mapping):
+  """
+  Read-only live view of one student's grades in a DictGradeStore, which may not have allocated their grade dict yet.
+  """
+  def __init__(self, store: DictGradeStore, student_id: int):
+    self.store = store
+    self.student_id = student_id
+
+  def __getitem__(self, assignment_id: int) -> int:
+    return self.store.by_student.get(self.student_id, NO_GRADES)[assignment_id]
+
+  def __iter__(self) -> Iterator[int]:
+    return iter(self.store.by_student.get(self.student_id, NO_GRADES))
+
+  def __len__(self) -> int:
+    return len(self.store.by_student.get(self.student_id, NO_GRADES))
+
+
+class _CompactStudentView(Mapping):
+  """
+  Read-only view over one row of a CompactGradeStore.
+  """
+  def __init__(self, store: CompactGradeStore, student_id: int):
+    self.store = store
+    self.student_id = student_id
+
+  def __getitem__(self, assignment_id: int) -> int:
+    return self.store[(self.student_id, assignment_id)]
+
+  def __iter__(self) -> Iterator[int]:
+    store = self.store
+    row = store.rows[self.student_id]
+    cells = store.matrix[row * store.stride:(row + 1) * store.stride]
+    return (assignment_id for assignment_id, grade in enumerate(cells) if grade != store.NOT_SUBMITTED)
+
+  def __len__(self) -> int:
+    store = self.store
+    row = store.rows[self.student_id]
+    cells = store.matrix[row * store.stride:(row + 1) * store.stride]
+    return len(cells) - cells.count(store.NOT_SUBMITTED)
+
+
+class _CompactAssignmentView(Mapping):
+  """
+  Read-only view over one column of a CompactGradeStore.
+  """
+  def __init__(self, store: CompactGradeStore, assignment_id: int):
+    self.store = store
+    self.assignment_id = assignment_id
+
+  def __getitem__(self, student_id: int) -> int:
+    return self.store[(student_id, self.assignment_id)]
+
+  def __iter__(self) -> Iterator[int]:
+    store = self.store
+    cells = store.matrix[self.assignment_id::store.stride]
+    return (store.row_students[row] for row, grade in enumerate(cells) if grade != store.NOT_SUBMITTED)
+
+  def __len__(self) -> int:
+    store = self.store
+    cells = store.matrix[self.assignment_id::store.stride]
+    return len(cells) - cells.count(store.NOT_SUBMITTED)
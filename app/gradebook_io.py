@@ -0,0 +1,223 @@
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, TextIO, Tuple
+
+from app.bulk_result import RowError
+
+# Gradebook file formats:
+#
+#   csv       long format, one submission per line under a "student_id,assignment_id,grade" header
+#   ndjson    long format, one {"student_id": ..., "assignment_id": ..., "grade": ...} object per line
+#   wide-csv  one line per enrolled student under a "student_id,<assignment id>,..." header, empty cells for missing
+#             submissions
+#
+# Files are read and written line by line, so their size is not bounded by memory. Imports go through
+# submit_assignments_bulk() one chunk of rows at a time.
+LONG_CSV, NDJSON, WIDE_CSV = "csv", "ndjson", "wide-csv"
+FORMATS = (LONG_CSV, NDJSON, WIDE_CSV)
+LONG_HEADER = ["student_id", "assignment_id", "grade"]
+EXPORT_CHUNK_SIZE = 10000  # Rows formatted per write
+
+
+@dataclass
+class ImportResult:
+  """
+  Outcome of a gradebook import. Unlike bulk operations, valid rows are applied even when other rows are rejected.
+  """
+  applied: int = 0  # Number of submissions applied
+  rejected: int = 0  # Number of rows rejected, including the ones past max_errors
+  errors: List[RowError] = field(default_factory=list)  # The first rejected rows, indexed from 0 after the header
+
+  @property
+  def ok(self) -> bool:
+    """
+    Whether every row was applied.
+    """
+    return not self.rejected
+
+
+def _grade(value: str):
+  try:
+    return int(value)
+  except ValueError:
+    grade = float(value)
+    if not math.isfinite(grade):
+      raise
+    return grade
+
+
+def _long_csv_rows(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+  reader = csv.reader(lines)
+  header = next(reader, None)
+  if header is not None and [column.strip() for column in header] != LONG_HEADER:
+    raise ValueError(f"Expected the header {','.join(LONG_HEADER)}, got {','.join(header)}")
+  for index, row in enumerate(reader):
+    try:
+      student_id, assignment_id, grade = row
+      yield index, (int(student_id), int(assignment_id), _grade(grade))
+    except ValueError:
+      yield index, RowError(index, row, f"Expected integer student_id and assignment_id and a numeric grade, got {row}")
+
+
+def _ndjson_rows(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+  for index, line in enumerate(lines):
+    try:
+      record = json.loads(line)
+      grade = record["grade"]
+      if isinstance(grade, bool) or not isinstance(grade, (int, float)) or not math.isfinite(grade):
+        raise TypeError(grade)
+      yield index, (int(record["student_id"]), int(record["assignment_id"]), grade)
+    except (ValueError, TypeError, KeyError):
+      yield index, RowError(index, line.rstrip("\n"), f"Expected an object with integer student_id and assignment_id and a numeric grade, got {line.strip()}")
+
+
+def _wide_csv_rows(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+  reader = csv.reader(lines)
+  header = next(reader, None)
+  if header is None:
+    return
+  if header[0].strip() != "student_id":
+    raise ValueError(f"Expected student_id as first column, got {header[0]}")
+  try:
+    assignment_ids = [int(column) for column in header[1:]]
+  except ValueError:
+    raise ValueError(f"Expected assignment IDs as column names, got {','.join(header[1:])}")
+  for index, row in enumerate(reader):
+    try:
+      if len(row) != len(header):
+        raise ValueError(row)
+      student_id = int(row[0])
+      submissions = [(student_id, assignment_id, _grade(cell)) for assignment_id, cell in zip(assignment_ids, row[1:]) if cell != ""]
+    except ValueError:
+      yield index, RowError(index, row, f"Expected an integer student_id and {len(assignment_ids)} numeric or empty grades, got {row}")
+      continue
+    for submission in submissions:
+      yield index, submission
+
+
+PARSERS = {LONG_CSV: _long_csv_rows, NDJSON: _ndjson_rows, WIDE_CSV: _wide_csv_rows}
+
+
+def import_grades(course_service, course_id: int, lines: Iterable[str], file_format: str = LONG_CSV, chunk_size: int = 10000, max_errors: int = 1000) -> ImportResult:
+  """
+  Streams submissions from a gradebook file into a course, chunk by chunk.
+
+  Every chunk goes through submit_assignments_bulk(). When it rejects rows, the chunk is submitted again without them.
+  Rows are only held one chunk at a time.
+
+  Parameters:
+      course_service (CourseServiceImpl): The service holding the course.
+      course_id (int): The ID of the course.
+      lines (Iterable[str]): The lines of the file, e.g. a file opened with newline="".
+      file_format (str): One of FORMATS.
+      chunk_size (int): The number of submissions per bulk call.
+      max_errors (int): The number of rejected rows kept in the result.
+
+  Returns:
+      ImportResult: The number of applied and rejected rows, and the first rejected rows.
+
+  Raises:
+      KeyError: If the course does not exist.
+      ValueError: If the format is unknown, chunk_size is not positive or the header does not match the format.
+  """
+  if file_format not in PARSERS:
+    raise ValueError(f"Unknown gradebook format {file_format}, expected one of {', '.join(FORMATS)}")
+  if chunk_size <= 0:
+    raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+  course_service.get_course_by_id(course_id)  # Ensures the course exists before reading anything
+  result = ImportResult()
+  rejected_rows = set()  # Indexes of the wide rows already rejected, whose other submissions must not count again
+
+  def reject(error: RowError):
+    if file_format == WIDE_CSV:
+      if error.index in rejected_rows:
+        return
+      rejected_rows.add(error.index)
+    result.rejected += 1
+    if len(result.errors) < max_errors:
+      result.errors.append(error)
+
+  rows = PARSERS[file_format](lines)
+  while True:
+    chunk = list(islice(rows, chunk_size))
+    if not chunk:
+      break
+    indexes, submissions = [], []
+    for index, parsed in chunk:
+      if isinstance(parsed, RowError):
+        reject(parsed)
+      else:
+        indexes.append(index)
+        submissions.append(parsed)
+    while submissions:
+      bulk_result = course_service.submit_assignments_bulk(course_id, submissions)
+      if not bulk_result.errors:
+        result.applied += bulk_result.applied
+        break
+      rejected = set()
+      for error in bulk_result.errors:
+        rejected.add(error.index)
+        reject(RowError(indexes[error.index], error.row, error.message))
+      kept = [position for position in range(len(submissions)) if position not in rejected]
+      indexes = [indexes[position] for position in kept]
+      submissions = [submissions[position] for position in kept]
+  return result
+
+
+def _long_rows(course) -> Iterator[Tuple[int, int, object]]:
+  for student_id in course.students_enrolled:
+    for assignment_id, grade in course.grades.student_grades(student_id, live=False).items():
+      yield student_id, assignment_id, grade
+
+
+def export_grades(course_service, course_id: int, output: TextIO, file_format: str = LONG_CSV) -> int:
+  """
+  Writes the submissions of a course's enrolled students to a gradebook file, one line at a time.
+
+  Grades are read from the course as the export goes, so it should not be mutated meanwhile. To export while writes
+  continue, export from a view returned by course_service.snapshot().
+
+  Parameters:
+      course_service (CourseServiceImpl): The service holding the course.
+      course_id (int): The ID of the course.
+      output (TextIO): The file to write to, e.g. opened with newline="".
+      file_format (str): One of FORMATS. The wide format has a column per assignment, in ascending ID order.
+
+  Returns:
+      int: The number of lines written after the header.
+
+  Raises:
+      KeyError: If the course does not exist.
+      ValueError: If the format is unknown.
+  """
+  if file_format not in PARSERS:
+    raise ValueError(f"Unknown gradebook format {file_format}, expected one of {', '.join(FORMATS)}")
+  course = course_service.get_course_by_id(course_id)
+  writer = csv.writer(output)
+  if file_format == WIDE_CSV:
+    assignment_ids = sorted(course.assignments)
+    writer.writerow(["student_id", *assignment_ids])
+    rows = (
+      [student_id, *[grades.get(assignment_id, "") for assignment_id in assignment_ids]]
+      for student_id in course.students_enrolled
+      for grades in (course.grades.student_grades(student_id, live=False),)
+    )
+  elif file_format == LONG_CSV:
+    writer.writerow(LONG_HEADER)
+    rows = _long_rows(course)
+  else:
+    rows = _long_rows(course)
+
+  lines = 0
+  while True:
+    chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+    if not chunk:
+      return lines
+    if file_format == NDJSON:
+      output.write("".join(f'{{"student_id": {student_id}, "assignment_id": {assignment_id}, "grade": {grade}}}\n' for student_id, assignment_id, grade in chunk))
+    else:
+      writer.writerows(chunk)
+    lines += len(chunk)
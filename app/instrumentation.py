@@ -0,0 +1,262 @@
+import cProfile
+import heapq
+import inspect
+import io
+import json
+import pstats
+import random
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import count
+from typing import Dict, List, Optional
+
+# Upper bounds of the latency histogram buckets in seconds, from 1 microsecond to 1 second, Prometheus style
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+# Public methods of a service that are hooks, internal helpers, generators or context managers rather than calls worth timing
+NOT_INSTRUMENTED = frozenset({
+  "log_mutation", "index_enrollment", "unindex_enrollment", "writable_enrollments", "iter_courses", "get_course_lock",
+  "unshare", "writable_course", "replace_course", "attached_write_ahead_log", "all_courses_read_locked",
+})
+
+
+class MethodStatistics:
+  """
+  Counters of one instrumented method.
+  """
+  __slots__ = ("calls", "seconds", "buckets", "errors")
+
+  def __init__(self):
+    self.calls = 0
+    self.seconds = 0.0  # Total time spent in the method
+    self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Stores the number of calls per latency bucket, the last one unbounded
+    self.errors: Dict[str, int] = {}  # Stores the number of raised exceptions with their type names as keys
+
+
+@dataclass(frozen=True)
+class SlowCall:
+  """
+  One of the slowest calls recorded, with its profile when it was sampled for profiling.
+  """
+  seconds: float
+  method: str
+  args: str  # repr of the positional arguments
+  profile: Optional[str] = None  # pstats report, sorted by cumulative time
+
+
+class Instrumentation:
+  """
+  Opt-in instrumentation of a course service: call counts, latency histograms and raised exceptions per method, and the
+  slowest calls, optionally profiled with cProfile.
+
+  enable() shadows every public method of the service with a timing wrapper set on the instance, and disable() deletes
+  the wrappers, so a disabled service runs its original methods without any overhead. Calls a method makes to other
+  methods of the service are recorded as well, e.g. the get_course_by_id() lookup behind every course-scoped call.
+  """
+  def __init__(self, course_service, slowest_calls: int = 10, profile_rate: float = 0.0):
+    """
+    Initializes a new, disabled instance of Instrumentation.
+
+    Parameters:
+        course_service (CourseServiceImpl): The service to instrument.
+        slowest_calls (int): The number of slowest calls to keep, 0 to keep none.
+        profile_rate (float): The fraction of calls run under cProfile, 0 to never profile.
+
+    Raises:
+        ValueError: If slowest_calls is negative or profile_rate is not between 0 and 1.
+    """
+    if slowest_calls < 0:
+      raise ValueError(f"The number of slowest calls must not be negative, got {slowest_calls}")
+    if not 0 <= profile_rate <= 1:
+      raise ValueError(f"The profile rate must be between 0 and 1, got {profile_rate}")
+    self.course_service = course_service
+    self.slowest_calls = slowest_calls
+    self.profile_rate = profile_rate
+    self.enabled = False
+    self.methods: Dict[str, MethodStatistics] = {}  # Stores the counters of every method with method names as keys
+    self.slowest = []  # Min-heap of (seconds, tie breaker, SlowCall)
+    self.tie_breaker = count()
+    self.lock = threading.Lock()  # Guards the counters and the slowest calls
+    self.profile_lock = threading.Lock()  # Held while a call is profiled, as only one profiler can be active at a time
+
+  def method_names(self) -> List[str]:
+    """
+    Returns the names of the methods of the service that get instrumented.
+    """
+    service_type = type(self.course_service)
+    return [
+      name for name in dir(service_type)
+      if not name.startswith("_") and name not in NOT_INSTRUMENTED and inspect.isfunction(getattr(service_type, name))
+    ]
+
+  def enable(self):
+    """
+    Installs the timing wrappers on the service. Counters recorded earlier are kept.
+    """
+    if self.enabled:
+      return
+    for name in self.method_names():
+      statistics = self.methods.get(name)
+      if statistics is None:
+        statistics = self.methods[name] = MethodStatistics()
+      setattr(self.course_service, name, self._instrumented(name, getattr(self.course_service, name), statistics))
+    self.enabled = True
+
+  def disable(self):
+    """
+    Removes the timing wrappers from the service, restoring its original methods.
+    """
+    if not self.enabled:
+      return
+    for name in self.methods:
+      self.course_service.__dict__.pop(name, None)
+    self.enabled = False
+
+  def reset(self):
+    """
+    Zeroes every counter and forgets the slowest calls.
+    """
+    with self.lock:
+      for statistics in self.methods.values():
+        statistics.calls = 0
+        statistics.seconds = 0.0
+        statistics.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        statistics.errors = {}
+      self.slowest = []
+
+  def _instrumented(self, name: str, method, statistics: MethodStatistics):
+    clock = time.perf_counter
+
+    def instrumented(*args, **kwargs):
+      if self.profile_rate and random.random() < self.profile_rate and self.profile_lock.acquire(blocking=False):
+        return self._profiled(name, method, statistics, args, kwargs)
+      started = clock()
+      error = None
+      try:
+        return method(*args, **kwargs)
+      except Exception as raised:
+        error = raised
+        raise
+      finally:
+        self._record(name, statistics, clock() - started, error, args)
+
+    instrumented.__name__ = name
+    instrumented.__doc__ = method.__doc__
+    return instrumented
+
+  def _profiled(self, name: str, method, statistics: MethodStatistics, args: tuple, kwargs: dict):
+    profiler = cProfile.Profile()
+    error = None
+    try:
+      started = time.perf_counter()
+      profiler.enable()
+      try:
+        return method(*args, **kwargs)
+      except Exception as raised:
+        error = raised
+        raise
+      finally:
+        profiler.disable()
+        self._record(name, statistics, time.perf_counter() - started, error, args, profiler)
+    finally:
+      self.profile_lock.release()
+
+  def _record(self, name: str, statistics: MethodStatistics, seconds: float, error: Optional[Exception], args: tuple, profiler: Optional[cProfile.Profile] = None):
+    with self.lock:
+      statistics.calls += 1
+      statistics.seconds += seconds
+      statistics.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+      if error is not None:
+        error_name = type(error).__name__
+        statistics.errors[error_name] = statistics.errors.get(error_name, 0) + 1
+      if self.slowest_calls and (len(self.slowest) < self.slowest_calls or seconds > self.slowest[0][0]):
+        slow_call = SlowCall(seconds, name, repr(args), _format_profile(profiler) if profiler is not None else None)
+        entry = (seconds, next(self.tie_breaker), slow_call)
+        if len(self.slowest) < self.slowest_calls:
+          heapq.heappush(self.slowest, entry)
+        else:
+          heapq.heapreplace(self.slowest, entry)
+
+  def slowest_calls_recorded(self) -> List[SlowCall]:
+    """
+    Returns the slowest calls recorded, slowest first.
+    """
+    with self.lock:
+      return [entry[2] for entry in sorted(self.slowest, reverse=True)]
+
+  def _course_sizes(self) -> Dict[int, Dict[str, int]]:
+    return {
+      course.id: {"students": len(course.students_enrolled), "assignments": len(course.assignments), "submissions": len(course.grades)}
+      for course in list(self.course_service.courses.values())
+    }
+
+  def to_dict(self) -> dict:
+    """
+    Returns every counter, the slowest calls and the current size of every course.
+
+    Returns:
+        dict: The counters, ready to be serialized as JSON.
+    """
+    with self.lock:
+      methods = {
+        name: {
+          "calls": statistics.calls,
+          "seconds": statistics.seconds,
+          "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], statistics.buckets)),
+          "errors": dict(statistics.errors),
+        }
+        for name, statistics in self.methods.items() if statistics.calls
+      }
+    slowest = [slow_call.__dict__ for slow_call in self.slowest_calls_recorded()]
+    return {"enabled": self.enabled, "methods": methods, "slowest_calls": slowest, "courses": self._course_sizes()}
+
+  def to_json(self) -> str:
+    """
+    Returns the output of to_dict() as JSON.
+    """
+    return json.dumps(self.to_dict(), indent=2)
+
+  def to_prometheus(self) -> str:
+    """
+    Returns the counters and the course sizes in the Prometheus text exposition format.
+    """
+    lines = [
+      "# HELP course_service_calls_total Calls of a course service method.",
+      "# TYPE course_service_calls_total counter",
+    ]
+    with self.lock:
+      methods = [(name, statistics.calls, statistics.seconds, list(statistics.buckets), dict(statistics.errors))
+                 for name, statistics in sorted(self.methods.items()) if statistics.calls]
+    for name, calls, _, _, _ in methods:
+      lines.append(f'course_service_calls_total{{method="{name}"}} {calls}')
+    lines += [
+      "# HELP course_service_errors_total Exceptions raised by a course service method.",
+      "# TYPE course_service_errors_total counter",
+    ]
+    for name, _, _, _, errors in methods:
+      for error_name, errors_raised in sorted(errors.items()):
+        lines.append(f'course_service_errors_total{{method="{name}",exception="{error_name}"}} {errors_raised}')
+    lines += [
+      "# HELP course_service_call_seconds Latency of a course service method.",
+      "# TYPE course_service_call_seconds histogram",
+    ]
+    for name, calls, seconds, buckets, _ in methods:
+      cumulative = 0
+      for bound, bucket in zip([*map(repr, LATENCY_BUCKETS), "+Inf"], buckets):
+        cumulative += bucket
+        lines.append(f'course_service_call_seconds_bucket{{method="{name}",le="{bound}"}} {cumulative}')
+      lines.append(f'course_service_call_seconds_sum{{method="{name}"}} {seconds!r}')
+      lines.append(f'course_service_call_seconds_count{{method="{name}"}} {calls}')
+    sizes = self._course_sizes()
+    for size in ("students", "assignments", "submissions"):
+      lines += [f"# HELP course_service_course_{size} Current number of {size} of a course.", f"# TYPE course_service_course_{size} gauge"]
+      lines += [f'course_service_course_{size}{{course_id="{course_id}"}} {course[size]}' for course_id, course in sorted(sizes.items())]
+    return "\n".join(lines) + "\n"
+
+
+def _format_profile(profiler: cProfile.Profile, limit: int = 20) -> str:
+  stream = io.StringIO()
+  pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+  return stream.getvalue()
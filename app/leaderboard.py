@@ -0,0 +1,111 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+# Averages are floored integers between 0 and 100, so the ranking is kept as one bucket per possible
+# average rather than a general-purpose balanced tree. Ties inside a bucket are broken by ascending student ID.
+MAX_AVERAGE = 100
+
+
+class Leaderboard:
+  """
+  Maintains the students of a course ordered by their average grade.
+  """
+  def __init__(self):
+    """
+    Initializes an empty leaderboard.
+    """
+    self.buckets = [[] for _ in range(MAX_AVERAGE + 1)]  # Sorted student IDs per floored average
+    self.ungraded = []  # Sorted IDs of students without any submission, ranked after everyone else
+    self.positions: Dict[int, Optional[int]] = {}  # Stores the current average (or None) of every ranked student
+
+  def __len__(self) -> int:
+    return len(self.positions)
+
+  def copy(self) -> "Leaderboard":
+    """
+    Returns an independent copy of the leaderboard.
+    """
+    leaderboard = Leaderboard.__new__(Leaderboard)
+    leaderboard.buckets = [bucket.copy() for bucket in self.buckets]
+    leaderboard.ungraded = self.ungraded.copy()
+    leaderboard.positions = self.positions.copy()
+    return leaderboard
+
+  def __contains__(self, student_id: int) -> bool:
+    return student_id in self.positions
+
+  def _bucket(self, average: Optional[int]) -> List[int]:
+    return self.ungraded if average is None else self.buckets[average]
+
+  def update(self, student_id: int, average: Optional[int]):
+    """
+    Inserts a student or moves them to their new average.
+
+    Parameters:
+        student_id (int): The ID of the student.
+        average (Optional[int]): The floored average of the student, or None if they have no submissions.
+    """
+    if student_id in self.positions:
+      if self.positions[student_id] == average:
+        return
+      self.remove(student_id)
+    insort(self._bucket(average), student_id)
+    self.positions[student_id] = average
+
+  def remove(self, student_id: int):
+    """
+    Removes a student from the leaderboard.
+
+    Parameters:
+        student_id (int): The ID of the student to remove.
+
+    Raises:
+        KeyError: If the student is not on the leaderboard.
+    """
+    bucket = self._bucket(self.positions.pop(student_id))
+    del bucket[bisect_left(bucket, student_id)]
+
+  def rank(self, student_id: int) -> int:
+    """
+    Returns the rank of a student, in the order of top().
+
+    Only the buckets above the student's are counted, at most 101 of them, so the rank takes a bisect within the
+    student's bucket plus a bounded sum whatever the number of students.
+
+    Parameters:
+        student_id (int): The ID of the student.
+
+    Returns:
+        int: The 1-based rank of the student, 1 being the best.
+
+    Raises:
+        KeyError: If the student is not on the leaderboard.
+    """
+    average = self.positions[student_id]
+    bucket = self._bucket(average)
+    if average is None:
+      ahead = len(self.positions) - len(self.ungraded)
+    else:
+      ahead = sum(map(len, self.buckets[average + 1:]))
+    return ahead + bisect_left(bucket, student_id) + 1
+
+  def top(self, k: int) -> List[int]:
+    """
+    Returns the IDs of the k best ranked students, best first.
+
+    Parameters:
+        k (int): The number of students to return.
+
+    Returns:
+        List[int]: Up to k student IDs.
+    """
+    top_student_ids = []
+    for average in range(MAX_AVERAGE, -1, -1):
+      if len(top_student_ids) >= k:
+        break
+      bucket = self.buckets[average]
+      if bucket:
+        top_student_ids.extend(bucket[:k - len(top_student_ids)])
+    if len(top_student_ids) < k:
+      top_student_ids.extend(self.ungraded[:k - len(top_student_ids)])
+    return top_student_ids
@@ -0,0 +1,74 @@
+from bisect import bisect_left, insort
+from typing import List, Tuple
+
+
+class NameIndex:
+  """
+  Maintains IDs ordered by name for prefix search, duplicate names included.
+
+  Entries are (name, id) pairs in a sorted list, so a prefix search is a bisect to the first name that could match
+  followed by a walk over the k matches. Inserts and removals shift the tail of the list, which stays cheaper than the
+  per-character nodes of a trie at the sizes of a course catalogue.
+  """
+  def __init__(self):
+    """
+    Initializes an empty index.
+    """
+    self.entries: List[Tuple[str, int]] = []  # Sorted (name, id) pairs
+
+  def __len__(self) -> int:
+    return len(self.entries)
+
+  def copy(self) -> "NameIndex":
+    """
+    Returns an independent copy of the index.
+    """
+    index = NameIndex()
+    index.entries = self.entries.copy()
+    return index
+
+  def add(self, name, item_id: int):
+    """
+    Indexes an ID under a name.
+
+    Parameters:
+        name: The name, indexed as a string.
+        item_id (int): The ID to index.
+    """
+    insort(self.entries, (str(name), item_id))
+
+  def remove(self, name, item_id: int):
+    """
+    Removes an ID from under a name.
+
+    Parameters:
+        name: The name the ID was indexed under.
+        item_id (int): The ID to remove.
+
+    Raises:
+        KeyError: If the ID is not indexed under the name.
+    """
+    entry = (str(name), item_id)
+    position = bisect_left(self.entries, entry)
+    if position == len(self.entries) or self.entries[position] != entry:
+      raise KeyError(entry)
+    del self.entries[position]
+
+  def find(self, prefix: str) -> List[int]:
+    """
+    Returns the IDs whose name starts with a prefix, ordered by name and then by ID.
+
+    Parameters:
+        prefix (str): The prefix to search, "" matches every name.
+
+    Returns:
+        List[int]: The matching IDs.
+    """
+    entries = self.entries
+    item_ids = []
+    for position in range(bisect_left(entries, (prefix,)), len(entries)):
+      name, item_id = entries[position]
+      if not name.startswith(prefix):
+        break
+      item_ids.append(item_id)
+    return item_ids
@@ -0,0 +1,53 @@
+import threading
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+  """
+  A writer-preferring reader/writer lock: any number of readers, or a single writer, may hold it.
+
+  The lock is not reentrant, a thread holding it must not acquire it again.
+  """
+  def __init__(self):
+    """
+    Initializes an unlocked ReadWriteLock.
+    """
+    self._condition = threading.Condition(threading.Lock())
+    self._readers = 0  # Number of threads holding the lock for reading
+    self._writer = False  # Whether a thread holds the lock for writing
+    self._waiting_writers = 0  # Number of writers queued, new readers wait behind them
+
+  @contextmanager
+  def read(self):
+    """
+    Holds the lock for reading for the duration of the `with` block.
+    """
+    with self._condition:
+      while self._writer or self._waiting_writers:
+        self._condition.wait()
+      self._readers += 1
+    try:
+      yield
+    finally:
+      with self._condition:
+        self._readers -= 1
+        if not self._readers:
+          self._condition.notify_all()
+
+  @contextmanager
+  def write(self):
+    """
+    Holds the lock for writing for the duration of the `with` block.
+    """
+    with self._condition:
+      self._waiting_writers += 1
+      while self._writer or self._readers:
+        self._condition.wait()
+      self._waiting_writers -= 1
+      self._writer = True
+    try:
+      yield
+    finally:
+      with self._condition:
+        self._writer = False
+        self._condition.notify_all()
@@ -0,0 +1,249 @@
+import abc
+import heapq
+import multiprocessing
+import os
+import threading
+from collections.abc import Iterator as AnyIterator, Mapping
+from contextlib import ExitStack
+from typing import Dict, Iterator, List, Optional
+
+from app.course_service import CourseService
+from app.course_service_impl import Course, CourseServiceImpl
+from app.course_summary import CourseSummary
+from app.thread_safe_course_service import COURSE_READS, COURSE_WRITES
+
+# Methods of CourseServiceImpl whose first argument is a course ID, sent to the shard owning the course
+ROUTED_METHODS = (
+  "get_course_by_id",
+  "delete_course",
+  "get_archived_course",
+  "rename_course",
+  "get_top_five_students",
+) + COURSE_READS + COURSE_WRITES
+
+
+def _create_course_with_id(course_service: CourseServiceImpl, course_id: int, course_name: str) -> int:
+  course_service.course_id = course_id  # IDs are handed out by the front-end, as in CourseServiceImpl.replay()
+  return course_service.create_course(course_name)
+
+
+def _all_courses(course_service: CourseServiceImpl) -> List[Course]:
+  return [course_service.courses[course_id] for course_id in course_service.course_ids]
+
+
+# Commands a shard understands besides the methods of CourseServiceImpl
+SHARD_COMMANDS = {
+  "create_course_with_id": _create_course_with_id,
+  "all_courses": _all_courses,
+}
+
+
+def _serve(connection, compact_grades: bool, archive: bool):
+  """
+  Main loop of a shard process: answers (method name, args) requests with ("ok", result) or ("error", exception)
+  until it receives None.
+  """
+  course_service = CourseServiceImpl(compact_grades, archive)
+  while True:
+    request = connection.recv()
+    if request is None:
+      break
+    method_name, args = request
+    try:
+      command = SHARD_COMMANDS.get(method_name)
+      result = command(course_service, *args) if command is not None else getattr(course_service, method_name)(*args)
+      if isinstance(result, Mapping) and not isinstance(result, dict):  # Live grade views only exist in the shard
+        result = dict(result)
+      connection.send(("ok", result))  # Pickles before writing, so a result that does not pickle sends nothing
+    except Exception as error:
+      try:
+        connection.send(("error", error))
+      except Exception:  # The exception does not pickle
+        connection.send(("error", RuntimeError(repr(error))))
+  connection.close()
+
+
+class ShardedCourseService(CourseService):
+  """
+  CourseService partitioning courses across worker processes, each owning a CourseServiceImpl, so that queries on
+  courses of different shards run on different cores.
+
+  A course lives on shard course_id % shards. Course-scoped calls are sent over the pipe of the owning shard, and
+  cross-course queries are sent to every shard at once and their answers merged. Course IDs are handed out by the
+  front-end. The front-end can be shared between threads: each pipe is guarded by its own lock, so calls to different
+  shards run concurrently. Results are pickled copies, mutating a returned Course does not change the shard's course.
+  Snapshots and write-ahead logs are not supported across shards.
+  """
+  def __init__(self, shards: Optional[int] = None, compact_grades: bool = False, archive: bool = False):
+    """
+    Initializes a new instance of ShardedCourseService and starts its shard processes.
+
+    Parameters:
+        shards (Optional[int]): The number of shard processes, the number of CPUs by default.
+        compact_grades (bool): Whether new courses keep their grades in a byte matrix, see CompactGradeStore.
+        archive (bool): Whether dropouts keep their submissions and deleted courses are archived instead of purged.
+
+    Raises:
+        ValueError: If shards is not positive.
+    """
+    shards = shards if shards is not None else os.cpu_count() or 1
+    if shards <= 0:
+      raise ValueError(f"At least one shard is needed, got {shards}")
+    context = multiprocessing.get_context()
+    self.connections = []  # Stores the front-end end of every shard's pipe
+    self.processes = []
+    for _ in range(shards):
+      connection, shard_connection = context.Pipe()
+      process = context.Process(target=_serve, args=(shard_connection, compact_grades, archive), daemon=True)
+      process.start()
+      shard_connection.close()
+      self.connections.append(connection)
+      self.processes.append(process)
+    self.shard_locks = [threading.Lock() for _ in range(shards)]  # Guards the pipe of every shard
+    self.course_id = 0  # Course ID generator
+    self.courses_lock = threading.Lock()  # Guards the course ID generator
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+  def close(self):
+    """
+    Stops the shard processes. Their courses are lost.
+    """
+    for connection, lock in zip(self.connections, self.shard_locks):
+      with lock:
+        if not connection.closed:
+          connection.send(None)
+          connection.close()
+    for process in self.processes:
+      process.join()
+
+  def shard_of(self, course_id: int) -> int:
+    """
+    Returns the index of the shard owning a course.
+    """
+    return course_id % len(self.connections)
+
+  def call(self, shard: int, method_name: str, *args):
+    """
+    Runs a method on one shard and returns its result, or raises its exception.
+
+    Parameters:
+        shard (int): The index of the shard.
+        method_name (str): The name of a CourseServiceImpl method or of a shard command.
+        *args: The arguments of the method.
+    """
+    with self.shard_locks[shard]:
+      self.connections[shard].send((method_name, args))
+      status, value = self.connections[shard].recv()
+    if status == "error":
+      raise value
+    return value
+
+  def fan_out(self, method_name: str, *args) -> list:
+    """
+    Runs a method on every shard in parallel and returns their results in shard order. If shards fail, the first
+    exception is raised once every shard has answered.
+    """
+    with ExitStack() as stack:
+      for lock in self.shard_locks:
+        stack.enter_context(lock)
+      for connection in self.connections:
+        connection.send((method_name, args))
+      answers = [connection.recv() for connection in self.connections]
+    for status, value in answers:
+      if status == "error":
+        raise value
+    return [value for _, value in answers]
+
+  def create_course(self, course_name: str) -> int:
+    """
+    Creates a new course on the shard its ID maps to.
+
+    Parameters:
+        course_name (str): The name of the course to create.
+
+    Returns:
+        int: The ID of the new course.
+    """
+    with self.courses_lock:
+      course_id = self.course_id
+      self.course_id += 1
+    return self.call(self.shard_of(course_id), "create_course_with_id", course_id, course_name)
+
+  def get_courses(self) -> List[Course]:
+    """
+    Retrieves all courses in ascending ID order.
+
+    Returns:
+        List[Course]: A list of all courses.
+
+    Raises:
+        LookupError: If no courses are found.
+    """
+    courses = list(heapq.merge(*self.fan_out("all_courses"), key=lambda course: course.id))
+    if not courses:
+      raise LookupError("No courses found")
+    return courses
+
+  def get_course_after(self, after_id: Optional[int]) -> Optional[Course]:
+    """
+    Retrieves the course with the smallest ID greater than a cursor, across every shard.
+    """
+    courses = [course for course in self.fan_out("get_course_after", after_id) if course is not None]
+    return min(courses, key=lambda course: course.id, default=None)
+
+  def iter_courses(self, after_id: Optional[int] = None) -> Iterator[Course]:
+    """
+    Lazily iterates over the courses in ascending ID order, one round trip to every shard per course.
+    """
+    course = self.get_course_after(after_id)
+    while course is not None:
+      yield course
+      course = self.get_course_after(course.id)
+
+  def list_courses(self, after_id: Optional[int] = None, limit: int = 50) -> List[CourseSummary]:
+    """
+    Retrieves one page of course summaries in ascending ID order, merged from a page of every shard.
+
+    Raises:
+        ValueError: If limit is not positive.
+    """
+    pages = self.fan_out("list_courses", after_id, limit)
+    return list(heapq.merge(*pages, key=lambda summary: summary.course_id))[:limit]
+
+  def find_courses(self, prefix: str) -> List[Course]:
+    """
+    Retrieves the courses whose name starts with a prefix, ordered by name, courses with the same name by ID.
+    """
+    return list(heapq.merge(*self.fan_out("find_courses", prefix), key=lambda course: (str(course.name), course.id)))
+
+  def get_student_courses(self, student_id: int) -> List[int]:
+    """
+    Retrieves the IDs of the courses a student is enrolled in, in ascending order.
+    """
+    return list(heapq.merge(*self.fan_out("get_student_courses", student_id)))
+
+  def get_student_transcript(self, student_id: int) -> Dict[int, Optional[int]]:
+    """
+    Retrieves a student's floored average grade per course ID, None for courses without submissions.
+    """
+    transcripts = self.fan_out("get_student_transcript", student_id)
+    return dict(sorted(item for transcript in transcripts for item in transcript.items()))
+
+
+def _routed(method_name: str):
+  def routed(self, course_id: int, *args):
+    args = tuple(list(arg) if isinstance(arg, AnyIterator) else arg for arg in args)  # Generators do not pickle
+    return self.call(self.shard_of(course_id), method_name, course_id, *args)
+  routed.__name__ = method_name
+  routed.__doc__ = getattr(CourseServiceImpl, method_name).__doc__
+  return routed
+
+
+for _method_name in ROUTED_METHODS:
+  setattr(ShardedCourseService, _method_name, _routed(_method_name))
+abc.update_abstractmethods(ShardedCourseService)
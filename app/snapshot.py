@@ -0,0 +1,261 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter
+from itertools import chain
+from typing import Dict, Tuple
+
+from app.course_service_impl import Assignment, Course, GradeAggregate, GradeDistribution
+from app.grade_store import CompactGradeStore
+
+# Snapshot file layout, every integer little-endian unless stored in a packed array:
+#
+#   header   MAGIC | byte order of the packed arrays (u8) | course ID generator (q) | last logged mutation (Q) |
+#            course count (I)
+#   course*  record length (Q) | course record
+#
+# A course record holds the course's id, name, assignment ID generator, assignments and enrolled students, followed by
+# its grades. Compact courses store their grade matrix as is. Dict courses store every grade twice as packed arrays,
+# grouped by student and grouped by assignment, so that both indexes are rebuilt with one C-level zip per student and
+# per assignment instead of a Python loop per submission.
+
+MAGIC = b"CMSNAP02"
+HEADER = struct.Struct("<8sBqQI")
+RECORD_LENGTH = struct.Struct("<Q")
+COURSE_HEADER = struct.Struct("<qqBII")  # course id, assignment ID generator, compact flag, assignment count, enrolled count
+ASSIGNMENT_HEADER = struct.Struct("<qI")  # assignment id, name length
+STRING_LENGTH = struct.Struct("<I")
+COMPACT_GRADES_HEADER = struct.Struct("<III")  # stride, row count, assignment column count
+DICT_GRADES_HEADER = struct.Struct("<BIIQ")  # grade typecode, student count, assignment count, submission count
+
+BYTE_ORDERS = {"little": 0, "big": 1}
+INTEGER_GRADES, FLOAT_GRADES = "B", "d"
+
+
+def save_snapshot(course_service, path: str):
+  """
+  Writes the courses of a service to a snapshot file. The file is replaced atomically, a crash never leaves a partial
+  snapshot behind.
+
+  Parameters:
+      course_service (CourseServiceImpl): The service to save.
+      path (str): The path of the snapshot file.
+  """
+  directory = os.path.dirname(os.path.abspath(path))
+  with tempfile.NamedTemporaryFile("wb", dir=directory, prefix=".snapshot-", delete=False) as snapshot_file:
+    try:
+      write_ahead_log = course_service.write_ahead_log
+      log_sequence = write_ahead_log.sequence if write_ahead_log is not None else course_service.log_sequence
+      snapshot_file.write(HEADER.pack(MAGIC, BYTE_ORDERS[sys.byteorder], course_service.course_id, log_sequence, len(course_service.courses)))
+      for course in course_service.courses.values():
+        record = _pack_course(course)
+        snapshot_file.write(RECORD_LENGTH.pack(len(record)))
+        snapshot_file.write(record)
+      snapshot_file.flush()
+      os.fsync(snapshot_file.fileno())
+    except BaseException:
+      snapshot_file.close()
+      os.unlink(snapshot_file.name)
+      raise
+  os.replace(snapshot_file.name, path)
+
+
+def load_snapshot(path: str) -> Tuple[int, int, Dict[int, Course]]:
+  """
+  Reads a snapshot file.
+
+  Parameters:
+      path (str): The path of the snapshot file.
+
+  Returns:
+      Tuple[int, int, Dict[int, Course]]: The course ID generator, the sequence number of the last logged mutation
+      reflected in the snapshot, and the courses with their IDs as keys.
+
+  Raises:
+      ValueError: If the file is not a snapshot or was written on a machine with a different byte order.
+  """
+  with open(path, "rb") as snapshot_file, mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+    view = memoryview(mapped)
+    try:
+      magic, byte_order, course_id, log_sequence, course_count = HEADER.unpack_from(view, 0)
+      if magic != MAGIC:
+        raise ValueError(f"{path} is not a course snapshot")
+      if byte_order != BYTE_ORDERS[sys.byteorder]:
+        raise ValueError(f"{path} was written on a machine with a different byte order")
+
+      courses = {}
+      offset = HEADER.size
+      for _ in range(course_count):
+        (length,) = RECORD_LENGTH.unpack_from(view, offset)
+        offset += RECORD_LENGTH.size
+        course = _unpack_course(view[offset:offset + length])
+        courses[course.id] = course
+        offset += length
+      return course_id, log_sequence, courses
+    finally:
+      view.release()
+
+
+def _pack_string(value: str) -> bytes:
+  encoded = value.encode("utf-8")
+  return STRING_LENGTH.pack(len(encoded)) + encoded
+
+
+def _pack_course(course: Course) -> bytes:
+  compact = isinstance(course.grades, CompactGradeStore)
+  parts = [
+    COURSE_HEADER.pack(course.id, course.assignment_id, compact, len(course.assignments), len(course.students_enrolled)),
+    _pack_string(str(course.name)),
+  ]
+  for assignment in course.assignments.values():
+    name = str(assignment.name).encode("utf-8")
+    parts.append(ASSIGNMENT_HEADER.pack(assignment.id, len(name)))
+    parts.append(name)
+  parts.append(array("q", course.students_enrolled).tobytes())
+  parts.extend(_pack_compact_grades(course.grades) if compact else _pack_dict_grades(course.grades))
+  return b"".join(parts)
+
+
+def _pack_compact_grades(grades: CompactGradeStore):
+  assignment_ids = sorted(grades.assignment_ids)
+  return [
+    COMPACT_GRADES_HEADER.pack(grades.stride, len(grades.row_students), len(assignment_ids)),
+    array("q", grades.row_students).tobytes(),
+    array("q", assignment_ids).tobytes(),
+    bytes(grades.matrix),
+  ]
+
+
+def _pack_dict_grades(grades):
+  by_student = {student_id: student_grades for student_id, student_grades in grades.by_student.items() if student_grades}
+  values = chain.from_iterable(student_grades.values() for student_grades in by_student.values())
+  typecode = INTEGER_GRADES if all(type(grade) is int for grade in values) else FLOAT_GRADES
+  by_assignment = grades.by_assignment
+  return [
+    DICT_GRADES_HEADER.pack(ord(typecode), len(by_student), len(by_assignment), len(grades)),
+    array("q", by_student).tobytes(),
+    array("I", map(len, by_student.values())).tobytes(),
+    array("q", chain.from_iterable(by_student.values())).tobytes(),
+    array(typecode, chain.from_iterable(student_grades.values() for student_grades in by_student.values())).tobytes(),
+    array("q", by_assignment).tobytes(),
+    array("I", map(len, by_assignment.values())).tobytes(),
+    array("q", chain.from_iterable(by_assignment.values())).tobytes(),
+    array(typecode, chain.from_iterable(assignment_grades.values() for assignment_grades in by_assignment.values())).tobytes(),
+  ]
+
+
+class _Reader:
+  """
+  Sequential reader over a memoryview of a snapshot record.
+  """
+  def __init__(self, view: memoryview):
+    self.view = view
+    self.offset = 0
+
+  def unpack(self, layout: struct.Struct) -> tuple:
+    values = layout.unpack_from(self.view, self.offset)
+    self.offset += layout.size
+    return values
+
+  def bytes(self, length: int) -> memoryview:
+    chunk = self.view[self.offset:self.offset + length]
+    self.offset += length
+    return chunk
+
+  def string(self) -> str:
+    (length,) = self.unpack(STRING_LENGTH)
+    return str(self.bytes(length), "utf-8")
+
+  def list(self, typecode: str, count: int) -> list:
+    itemsize = array(typecode).itemsize
+    return self.bytes(count * itemsize).cast(typecode).tolist()
+
+
+def _unpack_course(view: memoryview) -> Course:
+  reader = _Reader(view)
+  course_id, assignment_id_generator, compact, assignment_count, enrolled_count = reader.unpack(COURSE_HEADER)
+  course = Course(reader.string(), course_id, bool(compact))
+
+  for _ in range(assignment_count):
+    assignment_id, name_length = reader.unpack(ASSIGNMENT_HEADER)
+    assignment_name = str(reader.bytes(name_length), "utf-8")
+    course.assignments[assignment_id] = Assignment(assignment_name, assignment_id)
+    course.assignment_names.add(assignment_name, assignment_id)
+    course.assignment_aggregates[assignment_id] = GradeDistribution()
+    course.grades.add_assignment(assignment_id)
+  course.assignment_id = assignment_id_generator
+  enrolled = reader.list("q", enrolled_count)
+
+  if compact:
+    _unpack_compact_grades(reader, course)
+  else:
+    _unpack_dict_grades(reader, course)
+
+  for student_id in enrolled:
+    course.enroll_student_in_course(student_id)
+  return course
+
+
+def _unpack_compact_grades(reader: _Reader, course: Course):
+  grades = course.grades
+  stride, row_count, column_count = reader.unpack(COMPACT_GRADES_HEADER)
+  grades.row_students = reader.list("q", row_count)
+  grades.rows = {student_id: row for row, student_id in enumerate(grades.row_students)}
+  grades.assignment_ids = set(reader.list("q", column_count))
+  grades.stride = stride
+  grades.matrix = bytearray(reader.bytes(stride * row_count))
+  not_submitted = CompactGradeStore.NOT_SUBMITTED
+
+  for row, student_id in enumerate(grades.row_students):
+    cells = grades.matrix[row * stride:(row + 1) * stride]
+    missing = cells.count(not_submitted)
+    aggregate = course.student_aggregates[student_id] = GradeAggregate()
+    aggregate.add_many(sum(cells) - missing * not_submitted, stride - missing)
+  for assignment_id in grades.assignment_ids:
+    cells = grades.matrix[assignment_id::stride] if stride else b""
+    histogram = Counter(cells)
+    missing = histogram.pop(not_submitted, 0)
+    course.assignment_aggregates[assignment_id].add_many(sum(cells) - missing * not_submitted, len(cells) - missing, histogram)
+  grades.count = sum(aggregate.count for aggregate in course.student_aggregates.values())
+
+
+def _sum(values: list):
+  total = 0
+  for value in values:  # Adds in submission order, so float totals match the ones built by record_grade()
+    total += value
+  return total
+
+
+def _unpack_dict_grades(reader: _Reader, course: Course):
+  grades = course.grades
+  typecode, student_count, assignment_count, submission_count = reader.unpack(DICT_GRADES_HEADER)
+  typecode = chr(typecode)
+  total = sum if typecode == INTEGER_GRADES else _sum
+
+  student_ids = reader.list("q", student_count)
+  student_counts = reader.list("I", student_count)
+  student_assignment_ids = reader.list("q", submission_count)
+  student_values = reader.list(typecode, submission_count)
+  offset = 0
+  for student_id, count in zip(student_ids, student_counts):
+    values = student_values[offset:offset + count]
+    grades.by_student[student_id] = dict(zip(student_assignment_ids[offset:offset + count], values))
+    aggregate = course.student_aggregates[student_id] = GradeAggregate()
+    aggregate.add_many(total(values), count)
+    offset += count
+
+  assignment_ids = reader.list("q", assignment_count)
+  assignment_counts = reader.list("I", assignment_count)
+  assignment_student_ids = reader.list("q", submission_count)
+  assignment_values = reader.list(typecode, submission_count)
+  offset = 0
+  for assignment_id, count in zip(assignment_ids, assignment_counts):
+    values = assignment_values[offset:offset + count]
+    grades.by_assignment[assignment_id] = dict(zip(assignment_student_ids[offset:offset + count], values))
+    histogram = Counter(values) if typecode == INTEGER_GRADES else Counter(map(int, values))
+    course.assignment_aggregates[assignment_id].add_many(total(values), count, histogram)
+    offset += count
+  grades.count = submission_count
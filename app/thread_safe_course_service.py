@@ -0,0 +1,201 @@
+import threading
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from app.course_service_impl import Course, CourseServiceImpl
+from app.rw_lock import ReadWriteLock
+
+if TYPE_CHECKING:
+  from app.course_service_view import CourseServiceView
+
+# Course-scoped methods of CourseServiceImpl, by the kind of lock they need on their course.
+# Only methods that do not call other locked methods are listed, as the per-course locks are not reentrant
+# (get_top_five_students for instance delegates to get_top_k_students and is not listed).
+COURSE_READS = (
+  "get_assignment_grade_avg",
+  "get_assignment_percentile",
+  "get_assignment_median",
+  "get_assignment_distribution",
+  "get_student_grade_avg",
+  "get_student_grades",
+  "get_assignment_grades",
+  "get_course_statistics",
+  "get_top_k_students",
+  "get_student_rank",
+  "get_student_percentile",
+  "find_assignments",
+)
+COURSE_WRITES = (
+  "create_assignment",
+  "create_assignments_bulk",
+  "delete_assignment",
+  "rename_assignment",
+  "enroll_student",
+  "enroll_students_bulk",
+  "dropout_student",
+  "submit_assignment",
+  "submit_assignments_bulk",
+)
+
+
+class ThreadSafeCourseServiceImpl(CourseServiceImpl):
+  """
+  CourseServiceImpl that can be shared between threads.
+
+  Course IDs are handed out under a service-wide lock, and every course gets its own reader/writer lock, so calls on
+  different courses never contend and reads of the same course run in parallel. Live views such as
+  get_student_grades() are only guaranteed to be consistent while no writer is active on their course.
+  """
+  def __init__(self, compact_grades: bool = False, archive: bool = False):
+    """
+    Initializes a new instance of ThreadSafeCourseServiceImpl.
+
+    Parameters:
+        compact_grades (bool): Whether new courses keep their grades in a byte matrix, see CompactGradeStore.
+        archive (bool): Whether dropouts keep their submissions and deleted courses are archived instead of purged.
+    """
+    super().__init__(compact_grades, archive)
+    self.courses_lock = threading.Lock()  # Guards the courses and archived courses dicts and the course ID generator
+    self.course_locks = {}  # Stores a ReadWriteLock per course with course IDs as keys
+    self.student_courses_lock = threading.Lock()  # Guards the global student index, shared by every course
+
+  def get_course_lock(self, course_id: int) -> ReadWriteLock:
+    """
+    Retrieves the lock of a course.
+
+    Parameters:
+        course_id (int): The ID of the course.
+
+    Returns:
+        ReadWriteLock: The lock guarding the course.
+
+    Raises:
+        KeyError: If no course with the given ID is found.
+    """
+    try:
+      return self.course_locks[course_id]
+    except KeyError:
+      raise KeyError(f"Course with ID {course_id} not found")
+
+  def index_enrollment(self, student_id: int, course_id: int):
+    with self.student_courses_lock:
+      super().index_enrollment(student_id, course_id)
+
+  def unindex_enrollment(self, student_id: int, course_id: int):
+    with self.student_courses_lock:
+      super().unindex_enrollment(student_id, course_id)
+
+  def get_student_courses(self, student_id: int) -> List[int]:
+    with self.student_courses_lock:
+      return super().get_student_courses(student_id)
+
+  def get_student_transcript(self, student_id: int) -> Dict[int, Optional[int]]:
+    transcript = {}
+    for course_id in self.get_student_courses(student_id):
+      try:
+        transcript[course_id] = self.get_student_grade_avg(course_id, student_id)
+      except ValueError:  # No submissions in this course yet
+        transcript[course_id] = None
+      except KeyError:  # Dropped, or the course deleted, since the courses were listed
+        pass
+    return transcript
+
+  def get_courses(self) -> List[Course]:
+    with self.courses_lock:
+      return super().get_courses()
+
+  def get_course_after(self, after_id: Optional[int]) -> Optional[Course]:
+    with self.courses_lock:
+      return super().get_course_after(after_id)
+
+  def find_courses(self, prefix: str) -> List[Course]:
+    with self.courses_lock:
+      return super().find_courses(prefix)
+
+  def get_archived_course(self, course_id: int) -> Course:
+    with self.courses_lock:
+      return super().get_archived_course(course_id)
+
+  def create_course(self, course_name: str) -> int:
+    with self.courses_lock:
+      course_id = super().create_course(course_name)
+      self.course_locks[course_id] = ReadWriteLock()
+      return course_id
+
+  @contextmanager
+  def all_courses_read_locked(self):
+    """
+    Holds every course's lock for reading, and the service-wide lock, for the duration of the `with` block.
+
+    Readers keep going while writers wait. The course locks are taken before the service-wide one, in the same order
+    as delete_course(), and the attempt is retried if courses were created or deleted in the meantime.
+    """
+    while True:
+      with self.courses_lock:
+        course_locks = dict(self.course_locks)
+      with ExitStack() as held_locks:
+        for course_id in sorted(course_locks):
+          held_locks.enter_context(course_locks[course_id].read())
+        with self.courses_lock:
+          if self.course_locks == course_locks:
+            yield
+            return
+
+  def save_snapshot(self, path: str):
+    with self.all_courses_read_locked():
+      super().save_snapshot(path)
+
+  def snapshot(self) -> "CourseServiceView":
+    with self.all_courses_read_locked():  # Waits for in-flight writes, so the view never sees half of a mutation
+      return super().snapshot()
+
+  def replace_course(self, course: Course):
+    with self.courses_lock:
+      super().replace_course(course)
+
+  def compact_write_ahead_log(self, snapshot_path: str):
+    write_ahead_log = self.attached_write_ahead_log()
+    with self.all_courses_read_locked():  # No mutation can slip in between the snapshot and the truncation
+      CourseServiceImpl.save_snapshot(self, snapshot_path)
+      write_ahead_log.truncate()
+
+  def load_snapshot(self, path: str):
+    with self.courses_lock:
+      super().load_snapshot(path)
+      self.course_locks = {course_id: ReadWriteLock() for course_id in self.courses}
+
+  def delete_course(self, course_id: int):
+    with self.get_course_lock(course_id).write():  # Waits for in-flight calls on the course to finish
+      with self.courses_lock:
+        super().delete_course(course_id)
+        del self.course_locks[course_id]
+
+  def rename_course(self, course_id: int, course_name: str):
+    with self.get_course_lock(course_id).write():
+      self.writable_course(course_id)  # Copies a course shared with a view before courses_lock is taken
+      with self.courses_lock:
+        super().rename_course(course_id, course_name)
+
+
+def _course_locked(method_name: str, mode: str):
+  """
+  Wraps a course-scoped CourseServiceImpl method so that it runs under its course's lock.
+
+  Parameters:
+      method_name (str): The name of the method to wrap.
+      mode (str): "read" or "write".
+  """
+  method = getattr(CourseServiceImpl, method_name)
+
+  @wraps(method)
+  def locked_method(self, course_id, *args, **kwargs):
+    with getattr(self.get_course_lock(course_id), mode)():
+      return method(self, course_id, *args, **kwargs)
+  return locked_method
+
+
+for _method_name in COURSE_READS:
+  setattr(ThreadSafeCourseServiceImpl, _method_name, _course_locked(_method_name, "read"))
+for _method_name in COURSE_WRITES:
+  setattr(ThreadSafeCourseServiceImpl, _method_name, _course_locked(_method_name, "write"))
@@ -0,0 +1,55 @@
+# Measures the heap cost of one enrollment and of one submission across a whole CourseServiceImpl.
+# Run from the repository root: python -m benchmarks.domain_model_memory [courses] [students] [assignments]
+
+import random
+import sys
+import tracemalloc
+
+from app.course_service_impl import CourseServiceImpl
+
+
+def measure(courses: int, students: int, assignments: int):
+  """
+  Enrolls every student in every course, then grades every assignment, tracing the bytes each phase leaves allocated.
+
+  Parameters:
+      courses (int): The number of courses.
+      students (int): The number of students enrolled in each course.
+      assignments (int): The number of assignments per course.
+
+  Returns:
+      Tuple[int, int]: The bytes allocated by the enrollments and by the submissions.
+  """
+  rng = random.Random(0)
+  course_service = CourseServiceImpl()
+  for course_id in range(courses):
+    course_service.create_course(f"Course{course_id}")
+    for assignment_id in range(assignments):
+      course_service.create_assignment(course_id, f"Assignment{assignment_id}")
+
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  for course_id in range(courses):
+    for student_id in range(students):
+      course_service.enroll_student(course_id, student_id)
+  enrolled = tracemalloc.get_traced_memory()[0]
+  for course_id in range(courses):
+    for student_id in range(students):
+      for assignment_id in range(assignments):
+        course_service.submit_assignment(course_id, student_id, assignment_id, rng.randint(0, 100))
+  graded = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  return enrolled - before, graded - enrolled
+
+
+if __name__ == "__main__":
+  courses = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+  students = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+  assignments = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+  enrollments = courses * students
+  submissions = enrollments * assignments
+
+  enrollment_bytes, submission_bytes = measure(courses, students, assignments)
+  print(f"{courses} courses x {students} students x {assignments} assignments")
+  print(f"enrollments: {enrollments:>9}, {enrollment_bytes / 2**20:8.2f} MiB, {enrollment_bytes / enrollments:7.1f} bytes each")
+  print(f"submissions: {submissions:>9}, {submission_bytes / 2**20:8.2f} MiB, {submission_bytes / submissions:7.1f} bytes each")
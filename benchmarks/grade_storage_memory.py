@@ -0,0 +1,48 @@
+# Measures the heap cost of a course's grades with the default dict layout and with compact grade storage.
+# Run from the repository root: python -m benchmarks.grade_storage_memory [students] [assignments]
+
+import random
+import sys
+import tracemalloc
+
+from app.course_service_impl import CourseServiceImpl
+
+
+def measure(compact_grades: bool, students: int, assignments: int) -> int:
+  """
+  Builds a fully graded course and returns the bytes it holds, enrollments and assignments included.
+
+  Parameters:
+      compact_grades (bool): Whether the course uses compact grade storage.
+      students (int): The number of enrolled students.
+      assignments (int): The number of assignments.
+
+  Returns:
+      int: The bytes still allocated once every grade is submitted.
+  """
+  rng = random.Random(0)
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  course_service = CourseServiceImpl(compact_grades=compact_grades)
+  course_service.create_course("Benchmark Course")
+  for assignment_id in range(assignments):
+    course_service.create_assignment(0, f"Assignment{assignment_id}")
+  for student_id in range(students):
+    course_service.enroll_student(0, student_id)
+  for student_id in range(students):
+    for assignment_id in range(assignments):
+      course_service.submit_assignment(0, student_id, assignment_id, rng.randint(0, 100))
+  after = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  return after - before
+
+
+if __name__ == "__main__":
+  students = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+  assignments = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+  submissions = students * assignments
+
+  print(f"{students} students x {assignments} assignments = {submissions} submissions")
+  for label, compact_grades in [("dict", False), ("compact", True)]:
+    used = measure(compact_grades, students, assignments)
+    print(f"{label:>8}: {used / 2**20:8.2f} MiB, {used / submissions:7.1f} bytes per submission (course total)")
@@ -0,0 +1,50 @@
+# Times streaming gradebook imports and exports of one large course, in every file format.
+# Run from the repository root: python -m benchmarks.gradebook_io [students] [assignments]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.gradebook_io import FORMATS, export_grades, import_grades
+
+
+def empty_course(students: int, assignments: int) -> CourseServiceImpl:
+  """
+  Builds a service with one course, its assignments and its enrolled students, without any submission.
+  """
+  course_service = CourseServiceImpl()
+  course_service.create_course("Benchmark Course")
+  course_service.create_assignments_bulk(0, [f"Assignment{assignment_id}" for assignment_id in range(assignments)])
+  course_service.enroll_students_bulk(0, range(students))
+  return course_service
+
+
+if __name__ == "__main__":
+  students = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+  assignments = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+  submissions = students * assignments
+  rng = random.Random(0)
+
+  graded = empty_course(students, assignments)
+  graded.submit_assignments_bulk(0, ((student_id, assignment_id, rng.randint(0, 100)) for student_id in range(students) for assignment_id in range(assignments)))
+  print(f"{students} students x {assignments} assignments = {submissions} submissions")
+  with tempfile.TemporaryDirectory() as directory:
+    for file_format in FORMATS:
+      path = os.path.join(directory, f"gradebook.{file_format}")
+      started = time.perf_counter()
+      with open(path, "w", newline="") as output:
+        export_grades(graded, 0, output, file_format)
+      exported = time.perf_counter() - started
+
+      course_service = empty_course(students, assignments)
+      started = time.perf_counter()
+      with open(path, newline="") as lines:
+        result = import_grades(course_service, 0, lines, file_format)
+      imported = time.perf_counter() - started
+      assert result.ok and result.applied == submissions
+
+      size = os.path.getsize(path)
+      print(f"{file_format:>9}: {size / 2**20:6.1f} MiB, export {submissions / exported:9.0f} rows/s, import {submissions / imported:9.0f} rows/s")
@@ -0,0 +1,253 @@
+# Benchmarks the hot paths of CourseServiceImpl on generated data: throughput, latency percentiles and memory per call.
+# Run from the repository root: python -m benchmarks.hot_paths [--scale small|medium|large] [--output results.json]
+#                                                             [--baseline baseline.json] [--tolerance 0.2]
+# Exits with status 1 when an operation is slower than the baseline by more than the tolerance.
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from app.course_service_impl import CourseServiceImpl
+
+# (courses, students per course, graded assignments per course)
+SCALES = {
+  "small": (10, 1000, 10),  # 100 thousand submissions
+  "medium": (20, 5000, 10),  # 1 million submissions
+  "large": (40, 5000, 20),  # 4 million submissions
+}
+
+
+def generate(courses: int, students: int, assignments: int, compact_grades: bool = False, seed: int = 0) -> CourseServiceImpl:
+  """
+  Builds a service where every student of every course submitted every assignment, plus one ungraded assignment per
+  course left for the submit_assignment benchmark. Grades are drawn from a seeded generator, so runs are reproducible.
+
+  Parameters:
+      courses (int): The number of courses.
+      students (int): The number of students enrolled in each course.
+      assignments (int): The number of graded assignments per course.
+      compact_grades (bool): Whether the courses use compact grade storage.
+      seed (int): The seed of the grade generator.
+
+  Returns:
+      CourseServiceImpl: The populated service.
+  """
+  rng = random.Random(seed)
+  course_service = CourseServiceImpl(compact_grades=compact_grades)
+  for course_id in range(courses):
+    course_service.create_course(f"Course{course_id}")
+    course_service.create_assignments_bulk(course_id, [f"Assignment{assignment_id}" for assignment_id in range(assignments + 1)])
+    course_service.enroll_students_bulk(course_id, range(students))
+    course_service.submit_assignments_bulk(
+      course_id,
+      ((student_id, assignment_id, rng.randint(0, 100)) for student_id in range(students) for assignment_id in range(assignments)),
+    )
+  return course_service
+
+
+def _operations(course_service: CourseServiceImpl, courses: int, students: int, assignments: int, seed: int) -> Dict[str, Tuple[Callable, Iterator[tuple]]]:
+  rng = random.Random(seed)
+
+  def random_courses():
+    while True:
+      yield (rng.randrange(courses),)
+
+  def random_assignments():
+    while True:
+      yield rng.randrange(courses), rng.randrange(assignments)
+
+  def random_students():
+    while True:
+      yield rng.randrange(courses), rng.randrange(students)
+
+  def ungraded_submissions():  # Each (course, student) pair submits the held-out assignment once
+    for student_id in range(students):
+      for course_id in range(courses):
+        yield course_id, student_id, assignments, rng.randint(0, 100)
+
+  return {
+    "submit_assignment": (course_service.submit_assignment, ungraded_submissions()),
+    "get_assignment_grade_avg": (course_service.get_assignment_grade_avg, random_assignments()),
+    "get_student_grade_avg": (course_service.get_student_grade_avg, random_students()),
+    "get_top_five_students": (course_service.get_top_five_students, random_courses()),
+  }
+
+
+def _percentile(ordered: List[int], p: float) -> int:
+  return ordered[max(0, -(-len(ordered) * p // 100) - 1)]  # Nearest rank
+
+
+def run_operation(method: Callable, arguments: Iterator[tuple], samples: int, memory_samples: int, warmup: int = 1000, repeats: int = 5) -> Dict[str, float]:
+  """
+  Times calls of one operation one by one, after tracing the memory of a first, separate batch of calls and running an
+  untimed warm-up batch. The timed calls are split into `repeats` rounds, and the throughput is the one of the best
+  round, as with timeit, so that rounds disturbed by the rest of the machine do not move the result.
+
+  Parameters:
+      method (Callable): The bound service method.
+      arguments (Iterator[tuple]): The arguments of successive calls.
+      samples (int): The number of timed calls, over all rounds.
+      memory_samples (int): The number of calls traced by tracemalloc, which slows them down too much to be timed.
+      warmup (int): The number of untimed calls made before the timed rounds.
+      repeats (int): The number of timed rounds.
+
+  Returns:
+      Dict[str, float]: The result row of the operation.
+  """
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  traced = 0
+  for args in arguments:
+    method(*args)
+    traced += 1
+    if traced == memory_samples:
+      break
+  retained, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  for args in islice(arguments, warmup):
+    method(*args)
+
+  latencies = []
+  round_throughputs = []
+  round_samples = max(samples // repeats, 1)
+  clock = time.perf_counter_ns
+  for _ in range(repeats):
+    round_latencies = []
+    for args in arguments:
+      started = clock()
+      method(*args)
+      round_latencies.append(clock() - started)
+      if len(round_latencies) == round_samples:
+        break
+    if not round_latencies:
+      break  # The generated data ran out, as for submissions, which can only be made once
+    round_throughputs.append(len(round_latencies) * 1e9 / sum(round_latencies))
+    latencies += round_latencies
+  if not latencies:
+    raise ValueError("The generated data does not leave any call to time")
+  latencies.sort()
+  return {
+    "samples": len(latencies),
+    "rounds": len(round_throughputs),
+    "ops_per_sec": max(round_throughputs),
+    "p50_us": _percentile(latencies, 50) / 1e3,
+    "p99_us": _percentile(latencies, 99) / 1e3,
+    "peak_bytes": peak - before,  # Highest memory in use during the traced calls, above what was in use before them
+    "retained_bytes_per_op": (retained - before) / max(traced, 1),
+  }
+
+
+def run(courses: int, students: int, assignments: int, compact_grades: bool = False, samples: int = 100000, memory_samples: int = 1000, seed: int = 0, warmup: int = 1000, repeats: int = 5) -> dict:
+  """
+  Generates a dataset and benchmarks every hot path on it.
+
+  Returns:
+      dict: The parameters of the run and a result row per operation, ready to be saved as JSON.
+  """
+  started = time.perf_counter()
+  course_service = generate(courses, students, assignments, compact_grades, seed)
+  generated = time.perf_counter() - started
+
+  results = {}
+  for name, (method, arguments) in _operations(course_service, courses, students, assignments, seed).items():
+    results[name] = run_operation(method, arguments, samples, memory_samples, warmup, repeats)
+  return {
+    "parameters": {
+      "courses": courses,
+      "students": students,
+      "assignments": assignments,
+      "submissions": courses * students * assignments,
+      "compact_grades": compact_grades,
+      "seed": seed,
+      "warmup": warmup,
+      "repeats": repeats,
+    },
+    "environment": {"python": platform.python_version(), "platform": platform.platform()},
+    "generation_seconds": generated,
+    "operations": results,
+  }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+  """
+  Prints each operation next to its baseline and returns the operations whose throughput regressed.
+
+  Parameters:
+      results (dict): The results of this run.
+      baseline (dict): The results of a saved run.
+      tolerance (float): The relative drop of ops/sec tolerated before an operation counts as a regression.
+
+  Returns:
+      List[str]: The names of the regressed operations.
+  """
+  if results["parameters"] != baseline["parameters"]:
+    print(f"warning: the baseline was measured with {baseline['parameters']}")
+  regressions = []
+  for name, row in results["operations"].items():
+    reference = baseline["operations"].get(name)
+    if reference is None:
+      print(f"{name:>26}: not in the baseline")
+      continue
+    changes = ", ".join(f"{metric} {(row[metric] / reference[metric] - 1) * 100:+6.1f}%" for metric in ("ops_per_sec", "p50_us", "p99_us") if reference[metric])
+    regressed = row["ops_per_sec"] < reference["ops_per_sec"] * (1 - tolerance)
+    if regressed:
+      regressions.append(name)
+    print(f"{name:>26}: {changes}{'  REGRESSION' if regressed else ''}")
+  return regressions
+
+
+def _report(results: dict):
+  parameters = results["parameters"]
+  layout = "compact" if parameters["compact_grades"] else "dict"
+  print(f"{parameters['courses']} courses x {parameters['students']} students x {parameters['assignments']} assignments = "
+        f"{parameters['submissions']} submissions ({layout} grades), generated in {results['generation_seconds']:.2f}s")
+  print(f"{'operation':>26} {'ops/sec':>12} {'p50 us':>9} {'p99 us':>9} {'peak KiB':>9} {'kept B/op':>9}")
+  for name, row in results["operations"].items():
+    print(f"{name:>26} {row['ops_per_sec']:12.0f} {row['p50_us']:9.2f} {row['p99_us']:9.2f} {row['peak_bytes'] / 2**10:9.1f} {row['retained_bytes_per_op']:9.1f}")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Benchmarks the hot paths of CourseServiceImpl.")
+  parser.add_argument("--scale", choices=SCALES, default="small")
+  parser.add_argument("--courses", type=int, help="overrides the course count of the scale")
+  parser.add_argument("--students", type=int, help="overrides the student count of the scale")
+  parser.add_argument("--assignments", type=int, help="overrides the graded assignment count of the scale")
+  parser.add_argument("--compact-grades", action="store_true")
+  parser.add_argument("--samples", type=int, default=100000, help="timed calls per operation, over all rounds")
+  parser.add_argument("--memory-samples", type=int, default=1000, help="calls per operation traced for memory")
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--warmup", type=int, default=1000, help="untimed calls per operation before timing")
+  parser.add_argument("--repeats", type=int, default=5, help="timed rounds per operation, ops/sec is the best of them")
+  parser.add_argument("--output", help="saves the results as JSON")
+  parser.add_argument("--baseline", help="compares against results saved with --output")
+  parser.add_argument("--tolerance", type=float, default=0.2, help="tolerated relative drop of ops/sec")
+  options = parser.parse_args()
+
+  courses, students, assignments = SCALES[options.scale]
+  results = run(
+    options.courses or courses,
+    options.students or students,
+    options.assignments or assignments,
+    options.compact_grades,
+    options.samples,
+    options.memory_samples,
+    options.seed,
+    options.warmup,
+    options.repeats,
+  )
+  _report(results)
+  if options.output:
+    with open(options.output, "w") as output_file:
+      json.dump(results, output_file, indent=2)
+  if options.baseline:
+    with open(options.baseline) as baseline_file:
+      baseline = json.load(baseline_file)
+    if compare(results, baseline, options.tolerance):
+      sys.exit(1)
@@ -0,0 +1,97 @@
+# Measures how the read throughput of ShardedCourseService scales with its number of shard processes.
+# Run from the repository root: python -m benchmarks.sharded_scaling [--query get_course_statistics] [--max-shards N]
+# Each shard count serves the same courses, queried by one client thread per shard, against one in-process service.
+
+import argparse
+import os
+import random
+import threading
+import time
+
+from app.course_service_impl import CourseServiceImpl
+from app.sharded_course_service import ShardedCourseService
+
+QUERIES = {
+  "get_course_statistics": lambda course_service, course_id: course_service.get_course_statistics(course_id),
+  "get_top_five_students": lambda course_service, course_id: course_service.get_top_five_students(course_id),
+  "get_assignment_grade_avg": lambda course_service, course_id: course_service.get_assignment_grade_avg(course_id, 0),
+}
+
+
+def populate(course_service, courses: int, students: int, assignments: int):
+  """
+  Creates fully graded courses with bulk calls, one round trip per call on a sharded service.
+  """
+  rng = random.Random(0)
+  for course_id in range(courses):
+    course_service.create_course(f"Course{course_id}")
+    course_service.create_assignments_bulk(course_id, [f"Assignment{assignment_id}" for assignment_id in range(assignments)])
+    course_service.enroll_students_bulk(course_id, range(students))
+    course_service.submit_assignments_bulk(
+      course_id,
+      [(student_id, assignment_id, rng.randint(0, 100)) for student_id in range(students) for assignment_id in range(assignments)],
+    )
+
+
+def throughput(course_service, query, clients: int, courses: int, seconds: float) -> float:
+  """
+  Runs the query from client threads for a fixed time, client i querying the courses of shard i % clients.
+
+  Returns:
+      float: The number of queries answered per second.
+  """
+  answered = [0] * clients
+  deadline = time.perf_counter() + seconds
+
+  def client(index: int):
+    owned = [course_id for course_id in range(courses) if course_id % clients == index]
+    calls = 0
+    while time.perf_counter() < deadline:
+      query(course_service, owned[calls % len(owned)])
+      calls += 1
+    answered[index] = calls
+
+  started = time.perf_counter()
+  threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  return sum(answered) / (time.perf_counter() - started)
+
+
+def shard_counts(max_shards: int):
+  counts, shards = [], 1
+  while shards < max_shards:
+    counts.append(shards)
+    shards *= 2
+  return counts + [max_shards]
+
+
+if __name__ == "__main__":
+  cpus = os.cpu_count() or 1
+  parser = argparse.ArgumentParser(description="Measures the read scaling of ShardedCourseService.")
+  parser.add_argument("--query", choices=QUERIES, default="get_course_statistics")
+  parser.add_argument("--max-shards", type=int, default=cpus)
+  parser.add_argument("--courses", type=int, default=16, help="must be at least --max-shards")
+  parser.add_argument("--students", type=int, default=2000)
+  parser.add_argument("--assignments", type=int, default=20)
+  parser.add_argument("--seconds", type=float, default=3.0, help="duration of each measurement")
+  options = parser.parse_args()
+  query = QUERIES[options.query]
+
+  print(f"{options.courses} courses x {options.students} students x {options.assignments} assignments, {options.query}, {cpus} CPUs")
+  in_process = CourseServiceImpl()
+  populate(in_process, options.courses, options.students, options.assignments)
+  baseline = throughput(in_process, query, 1, options.courses, options.seconds)
+  print(f"{'in-process':>10}: {baseline:10.1f} queries/s")
+  del in_process
+
+  single = None
+  for shards in shard_counts(options.max_shards):
+    with ShardedCourseService(shards) as course_service:
+      populate(course_service, options.courses, options.students, options.assignments)
+      rate = throughput(course_service, query, shards, options.courses, options.seconds)
+    single = single or rate
+    speedup = rate / single
+    print(f"{shards:>4} shard{'s' if shards > 1 else ' '}: {rate:10.1f} queries/s, {speedup:5.2f}x one shard, {speedup / shards * 100:5.1f}% efficiency")
@@ -0,0 +1,47 @@
+# Times save_snapshot() and load_snapshot() on a large generated dataset, for both grade layouts.
+# Run from the repository root: python -m benchmarks.snapshot_restore [courses] [students] [assignments]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.course_service_impl import CourseServiceImpl
+
+
+def build(compact_grades: bool, courses: int, students: int, assignments: int) -> CourseServiceImpl:
+  """
+  Builds a service where every student of every course submitted every assignment.
+  """
+  rng = random.Random(0)
+  course_service = CourseServiceImpl(compact_grades=compact_grades)
+  for course_id in range(courses):
+    course_service.create_course(f"Course{course_id}")
+    for assignment_id in range(assignments):
+      course_service.create_assignment(course_id, f"Assignment{assignment_id}")
+    course_service.enroll_students_bulk(course_id, range(students))
+    course_service.submit_assignments_bulk(
+      course_id,
+      ((student_id, assignment_id, rng.randint(0, 100)) for student_id in range(students) for assignment_id in range(assignments)),
+    )
+  return course_service
+
+
+if __name__ == "__main__":
+  courses = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+  students = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+  assignments = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+  print(f"{courses} courses x {students} students x {assignments} assignments = {courses * students * assignments} submissions")
+  with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, "courses.snapshot")
+    for label, compact_grades in [("dict", False), ("compact", True)]:
+      course_service = build(compact_grades, courses, students, assignments)
+      started = time.perf_counter()
+      course_service.save_snapshot(path)
+      saved = time.perf_counter()
+      CourseServiceImpl().load_snapshot(path)
+      loaded = time.perf_counter()
+      size = os.path.getsize(path)
+      print(f"{label:>8}: {size / 2**20:7.1f} MiB, save {saved - started:6.3f}s, load {loaded - saved:6.3f}s")
@@ -14,7 +14,7 @@ def print_all_courses(course_service):
     course_info = (
       f"course_id: {course.id}\n"
       f"course_name: {course.name}\n"
-      f"course_students_enrolled: {[student for student in course.students_enrolled.keys()]}\n"
+      f"course_students_enrolled: {sorted(course.students_enrolled)}\n"
       f"course_assignments: {[f'{assignment.id} : {assignment.name}' for assignment in course.assignments.values()]}\n"
       f"course_grades: {[f'student_id={s_id}, assignment_id={a_id}) : grade={grade}' for (s_id, a_id), grade in course.grades.items()]}\n"
     )
@@ -27,7 +27,7 @@ def print_course_by_id(course_service, id):
   course_info = (
       f"course_id: {course.id}\n"
       f"course_name: {course.name}\n"
-      f"course_students_enrolled: {[student.id for student in course.students_enrolled]}\n"
+      f"course_students_enrolled: {sorted(course.students_enrolled)}\n"
       f"course_assignments: {[assignment.name for assignment in course.assignments.values()]}\n"
   )
   print(course_info)
@@ -0,0 +1,74 @@
+import asyncio
+import inspect
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.async_course_service import AsyncCourseService
+from app.course_service import CourseService
+
+
+class AsyncCourseServiceTests(unittest.IsolatedAsyncioTestCase):
+    """
+    Unit tests for the AsyncCourseService class.
+    """
+    async def asyncSetUp(self):
+        """
+        Set up a course with one assignment and three enrolled students for each test case.
+        """
+        self.course_service = AsyncCourseService(offload_threshold=2)
+        self.course_id = await self.course_service.create_course("Test Course")
+        await self.course_service.create_assignment(self.course_id, "Assignment0")
+        for student_id in [1, 2, 3]:
+            await self.course_service.enroll_student(self.course_id, student_id)
+
+    def test_mirrors_course_service(self):
+        """
+        Test that every CourseService abstract method has a coroutine counterpart.
+        """
+        for method_name in CourseService.__abstractmethods__:
+            self.assertTrue(inspect.iscoroutinefunction(getattr(AsyncCourseService, method_name)), method_name)
+
+    async def test_submit_and_read(self):
+        """
+        Test that submissions made through the facade are visible to its reads, inline and offloaded.
+        """
+        await asyncio.gather(*(self.course_service.submit_assignment(self.course_id, student_id, 0, grade) for student_id, grade in [(1, 40), (2, 90), (3, 60)]))
+        self.assertEqual(await self.course_service.get_assignment_grade_avg(self.course_id, 0), 63)
+        self.assertEqual(await self.course_service.get_student_grade_avg(self.course_id, 2), 90)
+        self.assertEqual(await self.course_service.get_top_five_students(self.course_id), [2, 3, 1])
+        statistics = await self.course_service.get_course_statistics(self.course_id)
+        self.assertEqual(statistics.submission_count, 3)
+
+    async def test_errors_propagate(self):
+        """
+        Test that the exceptions of the wrapped service reach the caller.
+        """
+        with self.assertRaises(KeyError):
+            await self.course_service.enroll_student(99, 1)
+        with self.assertRaises(ValueError):
+            await self.course_service.submit_assignment(self.course_id, 1, 0, 101)
+
+    async def test_delete_course(self):
+        """
+        Test deleting a course through the facade.
+        """
+        await self.course_service.delete_course(self.course_id)
+        with self.assertRaises(KeyError):
+            await self.course_service.get_course_by_id(self.course_id)
+
+    async def test_submit_assignments_stream(self):
+        """
+        Test that streamed rows are applied batch by batch and invalid batches are reported from the stream start.
+        """
+        async def rows():
+            for row in [(1, 0, 10), (2, 0, 20), (3, 0, 30), (3, 0, 40), (4, 0, 50)]:
+                yield row
+
+        result = await self.course_service.submit_assignments_stream(self.course_id, rows(), batch_size=2)
+        self.assertEqual(result.applied, 2)  # the second and third batches each hold a bad row
+        self.assertEqual([error.index for error in result.errors], [3, 4])
+        self.assertEqual(await self.course_service.get_assignment_grade_avg(self.course_id, 0), 15)
+
+if __name__ == '__main__':
+    unittest.main()
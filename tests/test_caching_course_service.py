@@ -0,0 +1,151 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.caching_course_service import CachingCourseService
+from app.course_service_impl import CourseServiceImpl
+from app.snapshot import save_snapshot
+from app.write_ahead_log import OPERATION_CODES
+
+
+class CachingCourseServiceTests(unittest.TestCase):
+    """
+    Unit tests for the CachingCourseService class.
+    """
+    def setUp(self):
+        """
+        Set up a cached course with two assignments and two graded students for each test case.
+        """
+        self.cache = CachingCourseService()
+        self.course_id = self.cache.create_course("CS101")
+        self.first = self.cache.create_assignment(self.course_id, "Homework 1")
+        self.second = self.cache.create_assignment(self.course_id, "Homework 2")
+        for student_id, grades in ((1, (80, 60)), (2, (100, 90))):
+            self.cache.enroll_student(self.course_id, student_id)
+            self.cache.submit_assignment(self.course_id, student_id, self.first, grades[0])
+            self.cache.submit_assignment(self.course_id, student_id, self.second, grades[1])
+
+    def test_repeated_query_hits(self):
+        """
+        Test that a repeated query is answered from the cache with the same result.
+        """
+        self.assertEqual(self.cache.get_assignment_grade_avg(self.course_id, self.first), 90)
+        self.assertEqual(self.cache.get_assignment_grade_avg(self.course_id, self.first), 90)
+        statistics = self.cache.cache_statistics()
+        self.assertEqual((statistics.hits, statistics.misses, statistics.size), (1, 1, 1))
+
+    def test_cached_lists_are_copies(self):
+        """
+        Test that changing a returned ranking changes neither the cached result nor the next answers.
+        """
+        self.cache.get_top_five_students(self.course_id).append(999)
+        top = self.cache.get_top_five_students(self.course_id)
+        self.assertEqual(top, [2, 1])
+        top.append(999)
+        self.assertEqual(self.cache.get_top_five_students(self.course_id), [2, 1])
+
+    def test_submission_invalidates_only_its_assignment_and_student(self):
+        """
+        Test that a submission recomputes the results of its assignment and student and keeps the others cached.
+        """
+        third = self.cache.create_assignment(self.course_id, "Homework 3")
+        self.cache.submit_assignment(self.course_id, 2, third, 20)
+        self.cache.get_assignment_grade_avg(self.course_id, self.first)
+        self.cache.get_assignment_grade_avg(self.course_id, third)
+        self.cache.get_student_grade_avg(self.course_id, 1)
+        self.cache.get_student_grade_avg(self.course_id, 2)
+        self.cache.submit_assignment(self.course_id, 1, third, 100)
+
+        self.assertEqual(self.cache.get_assignment_grade_avg(self.course_id, third), 60)
+        self.assertEqual(self.cache.get_student_grade_avg(self.course_id, 1), 80)
+        self.assertEqual(self.cache.get_assignment_grade_avg(self.course_id, self.first), 90)
+        self.assertEqual(self.cache.get_student_grade_avg(self.course_id, 2), 70)
+        statistics = self.cache.cache_statistics()
+        self.assertEqual((statistics.hits, statistics.misses), (2, 6))
+
+    def test_rankings_follow_every_mutation_of_the_course(self):
+        """
+        Test that ranking queries are recomputed after an enrollment or a submission in their course.
+        """
+        third = self.cache.create_assignment(self.course_id, "Homework 3")
+        self.assertEqual(self.cache.get_top_five_students(self.course_id), [2, 1])
+        self.cache.submit_assignment(self.course_id, 2, third, 0)
+        self.assertEqual(self.cache.get_top_five_students(self.course_id), [1, 2])
+        self.cache.enroll_student(self.course_id, 3)
+        self.assertEqual(self.cache.get_student_rank(self.course_id, 3), 3)
+
+    def test_dropout_invalidates_purged_assignments(self):
+        """
+        Test that dropping a student recomputes the averages of the assignments their grades were purged from.
+        """
+        self.cache.get_assignment_grade_avg(self.course_id, self.first)
+        self.assertEqual(self.cache.dropout_student(self.course_id, 2), {self.first: 100, self.second: 90})
+        self.assertEqual(self.cache.get_assignment_grade_avg(self.course_id, self.first), 80)
+
+    def test_delete_assignment_invalidates_student_averages(self):
+        """
+        Test that deleting an assignment recomputes the averages of the students who were graded on it.
+        """
+        self.assertEqual(self.cache.get_student_grade_avg(self.course_id, 1), 70)
+        self.cache.delete_assignment(self.course_id, self.second)
+        self.assertEqual(self.cache.get_student_grade_avg(self.course_id, 1), 80)
+        with self.assertRaises(KeyError):
+            self.cache.get_assignment_grade_avg(self.course_id, self.second)
+
+    def test_deleted_course_is_not_served(self):
+        """
+        Test that the results of a deleted course are invalidated, so queries throw KeyError.
+        """
+        self.cache.get_assignment_grade_avg(self.course_id, self.first)
+        self.cache.delete_course(self.course_id)
+        with self.assertRaises(KeyError):
+            self.cache.get_assignment_grade_avg(self.course_id, self.first)
+
+    def test_eviction_of_least_recently_used(self):
+        """
+        Test that the least recently used result is evicted when the cache is full.
+        """
+        cache = CachingCourseService(self.cache.course_service, max_entries=2)
+        cache.get_student_grade_avg(self.course_id, 1)
+        cache.get_student_grade_avg(self.course_id, 2)
+        cache.get_student_grade_avg(self.course_id, 1)
+        cache.get_assignment_grade_avg(self.course_id, self.first)
+        cache.get_student_grade_avg(self.course_id, 1)
+        statistics = cache.cache_statistics()
+        self.assertEqual((statistics.hits, statistics.misses, statistics.evictions, statistics.size), (2, 3, 1, 2))
+
+    def test_invalid_max_entries(self):
+        """
+        Test that a cache without room for any entry throws ValueError.
+        """
+        with self.assertRaises(ValueError):
+            CachingCourseService(max_entries=0)
+
+    def test_every_mutation_is_wrapped(self):
+        """
+        Test that every logged mutation of the service has a wrapper on the cache, so none can bypass invalidation.
+        """
+        for operation in OPERATION_CODES:
+            self.assertIn(operation, vars(CachingCourseService), operation)
+
+    def test_load_snapshot_clears(self):
+        """
+        Test that loading a snapshot drops every cached result.
+        """
+        self.cache.get_assignment_grade_avg(self.course_id, self.first)
+        other = CourseServiceImpl()
+        course_id = other.create_course("CS101")
+        assignment_id = other.create_assignment(course_id, "Homework 1")
+        other.enroll_student(course_id, 1)
+        other.submit_assignment(course_id, 1, assignment_id, 10)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "courses.snapshot")
+            save_snapshot(other, path)
+            self.cache.load_snapshot(path)
+        self.assertEqual(self.cache.get_assignment_grade_avg(course_id, assignment_id), 10)
+        self.assertEqual(self.cache.cache_statistics().size, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
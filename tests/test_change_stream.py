@@ -0,0 +1,136 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.change_stream import (
+    AssignmentCreated, AssignmentDeleted, AssignmentSubmitted, ChangeStream, CourseCreated, CourseDeleted,
+    CourseRenamed, SnapshotLoaded, StudentDropped, StudentEnrolled,
+)
+from app.course_service_impl import CourseServiceImpl
+
+
+class ChangeStreamTests(unittest.TestCase):
+    """
+    Unit tests for the ChangeStream class and its publication by CourseServiceImpl.
+    """
+    def setUp(self):
+        """
+        Set up a service publishing to a fresh stream for each test case.
+        """
+        self.course_service = CourseServiceImpl()
+        self.stream = ChangeStream()
+        self.course_service.attach_change_stream(self.stream)
+
+    def test_every_mutation_is_published_in_order(self):
+        """
+        Test that single and bulk mutations are published as one event per change, with consecutive sequence numbers.
+        """
+        course_id = self.course_service.create_course("CS101")
+        self.course_service.create_assignment(course_id, "Homework 1")
+        self.course_service.create_assignments_bulk(course_id, ["Homework 2", "Homework 3"])
+        self.course_service.enroll_students_bulk(course_id, [1, 2])
+        self.course_service.submit_assignment(course_id, 1, 0, 90)
+        self.course_service.submit_assignments_bulk(course_id, [(2, 0, 80), (2, 1, 70)])
+        self.course_service.dropout_student(course_id, 2)
+        self.course_service.delete_assignment(course_id, 2)
+        self.course_service.rename_course(course_id, "CS102")
+        self.course_service.delete_course(course_id)
+
+        self.assertEqual(self.stream.read(), [
+            CourseCreated(1, course_id, "CS101"),
+            AssignmentCreated(2, course_id, 0, "Homework 1"),
+            AssignmentCreated(3, course_id, 1, "Homework 2"),
+            AssignmentCreated(4, course_id, 2, "Homework 3"),
+            StudentEnrolled(5, course_id, 1),
+            StudentEnrolled(6, course_id, 2),
+            AssignmentSubmitted(7, course_id, 1, 0, 90),
+            AssignmentSubmitted(8, course_id, 2, 0, 80),
+            AssignmentSubmitted(9, course_id, 2, 1, 70),
+            StudentDropped(10, course_id, 2),
+            AssignmentDeleted(11, course_id, 2),
+            CourseRenamed(12, course_id, "CS102"),
+            CourseDeleted(13, course_id),
+        ])
+
+    def test_rejected_mutations_are_not_published(self):
+        """
+        Test that a failing call or a rejected bulk batch publishes nothing.
+        """
+        course_id = self.course_service.create_course("CS101")
+        with self.assertRaises(KeyError):
+            self.course_service.enroll_student(course_id + 1, 1)
+        result = self.course_service.enroll_students_bulk(course_id, [1, 1])
+        self.assertFalse(result.ok)
+        self.assertEqual(self.stream.last_sequence, 1)
+
+    def test_resume_from_offset(self):
+        """
+        Test that reads resume after the given offset and honour the limit.
+        """
+        for index in range(5):
+            self.course_service.create_course(f"Course{index}")
+        self.assertEqual([event.sequence for event in self.stream.read(2, limit=2)], [3, 4])
+        self.assertEqual(self.stream.read(5), [])
+        with self.assertRaises(ValueError):
+            self.stream.read(6)
+        with self.assertRaises(ValueError):
+            self.stream.read(0, limit=0)
+
+    def test_overwritten_events(self):
+        """
+        Test that a full buffer overwrites its oldest events, and reading them throws LookupError.
+        """
+        stream = ChangeStream(capacity=3)
+        for index in range(5):
+            stream.publish("create_course", (index, f"Course{index}"))
+        self.assertEqual(stream.first_sequence, 3)
+        self.assertEqual([event.course_id for event in stream.read(2)], [2, 3, 4])
+        with self.assertRaises(LookupError):
+            stream.read(1)
+
+    def test_subscription_polls_incrementally(self):
+        """
+        Test that a subscription only sees events published after it, and advances past what it polled.
+        """
+        self.course_service.create_course("CS101")
+        subscription = self.stream.subscribe()
+        self.assertEqual(subscription.poll(), [])
+        course_id = self.course_service.create_course("CS102")
+        self.course_service.enroll_student(course_id, 1)
+        self.assertEqual(subscription.poll(limit=1), [CourseCreated(2, course_id, "CS102")])
+        self.assertEqual(subscription.poll(), [StudentEnrolled(3, course_id, 1)])
+        self.assertEqual(subscription.offset, 3)
+
+    def test_read_waits_for_events(self):
+        """
+        Test that a read with a timeout returns as soon as an event is published from another thread.
+        """
+        timer = threading.Timer(0.05, self.course_service.create_course, ["CS101"])
+        timer.start()
+        self.assertEqual(self.stream.read(0, timeout=5), [CourseCreated(1, 0, "CS101")])
+        timer.join()
+        self.assertEqual(self.stream.read(1, timeout=0.01), [])
+
+    def test_load_snapshot_publishes_reset(self):
+        """
+        Test that loading a snapshot publishes a SnapshotLoaded event.
+        """
+        self.course_service.create_course("CS101")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "courses.snapshot")
+            self.course_service.save_snapshot(path)
+            self.course_service.load_snapshot(path)
+        self.assertEqual(self.stream.read(1), [SnapshotLoaded(2)])
+
+    def test_invalid_capacity(self):
+        """
+        Test that a stream without room for any event throws ValueError.
+        """
+        with self.assertRaises(ValueError):
+            ChangeStream(capacity=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
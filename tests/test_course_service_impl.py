@@ -3,8 +3,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.course_service_impl import CourseServiceImpl, Course
+from app.course_summary import CourseSummary
 
-# This Unit Test File contains 33 Test cases for a total of 11 functions of class CourseServiceImpl
+# This Unit Test File contains 93 Test cases for a total of 32 functions of class CourseServiceImpl
 
 class CourseServiceTests(unittest.TestCase):
     """
@@ -37,6 +38,90 @@ class CourseServiceTests(unittest.TestCase):
         actual_courses = self.course_service.get_courses()
         self.assertEqual(expected_courses, actual_courses, "The list of courses should match the expected output.")
         
+    # Tests for list_courses()
+    def test_list_courses_pages(self):
+        """
+        Test that courses are paged in ascending ID order, resuming after the cursor and skipping deleted courses.
+        """
+        for course_id in range(7):
+            self.course_service.create_course(f"Course{course_id}")
+        self.course_service.delete_course(2)
+
+        first_page = self.course_service.list_courses(limit=3)
+        self.assertEqual([summary.course_id for summary in first_page], [0, 1, 3])
+        second_page = self.course_service.list_courses(after_id=first_page[-1].course_id, limit=3)
+        self.assertEqual([summary.course_id for summary in second_page], [4, 5, 6])
+        self.assertEqual(self.course_service.list_courses(after_id=6, limit=3), [])
+        self.assertEqual([summary.course_id for summary in self.course_service.list_courses(after_id=2)], [3, 4, 5, 6])
+
+    def test_list_courses_summary(self):
+        """
+        Test that a course summary holds the course's name, enrollment count and assignment count.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_students_bulk(course_id, [1, 2, 3])
+        self.course_service.dropout_student(course_id, 2)
+        self.assertEqual(self.course_service.list_courses(), [CourseSummary(course_id, "Test Course", 2, 1)])
+
+    def test_list_courses_empty(self):
+        """
+        Test that listing no courses returns an empty page rather than throwing.
+        """
+        self.assertEqual(self.course_service.list_courses(), [])
+
+    def test_list_courses_invalid_limit(self):
+        """
+        Test that a non-positive page limit throws ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.course_service.list_courses(limit=0)
+
+    # Tests for iter_courses()
+    def test_iter_courses_during_changes(self):
+        """
+        Test that the lazy iteration sees courses created and misses courses deleted while it runs.
+        """
+        for course_id in range(4):
+            self.course_service.create_course(f"Course{course_id}")
+        visited = []
+        for course in self.course_service.iter_courses():
+            visited.append(course.id)
+            if course.id == 0:
+                self.course_service.delete_course(1)
+                self.course_service.create_course("Course4")
+        self.assertEqual(visited, [0, 2, 3, 4])
+
+    # Tests for find_courses()
+    def test_find_courses(self):
+        """
+        Test that courses are found by name prefix, ordered by name, and deleted courses are not found.
+        """
+        for course_name in ["CS102", "CS101", "MATH200", "CS101"]:
+            self.course_service.create_course(course_name)
+        self.assertEqual([course.id for course in self.course_service.find_courses("CS10")], [1, 3, 0])
+        self.course_service.delete_course(1)
+        self.assertEqual([course.id for course in self.course_service.find_courses("CS101")], [3])
+        self.assertEqual(self.course_service.find_courses("BIO"), [])
+
+    # Tests for rename_course()
+    def test_rename_course(self):
+        """
+        Test that a renamed course is only found under its new name.
+        """
+        course_id = self.course_service.create_course("CS101")
+        self.course_service.rename_course(course_id, "PHYS101")
+        self.assertEqual(self.course_service.get_course_by_id(course_id).name, "PHYS101")
+        self.assertEqual(self.course_service.find_courses("CS"), [])
+        self.assertEqual([course.id for course in self.course_service.find_courses("PHYS")], [course_id])
+
+    def test_rename_course_invalid_course(self):
+        """
+        Test that renaming a course that does not exist throws KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.course_service.rename_course(0, "CS101")
+
     # Tests for get_course_by_id()
     def test_get_course_by_id_non_existing(self):
         """
@@ -86,6 +171,32 @@ class CourseServiceTests(unittest.TestCase):
         self.course_service.delete_course(course_id)
         self.assertFalse(course_id in self.course_service.courses, "Course should be deleted.")
 
+    def test_delete_course_archive(self):
+        """
+        Test that in archive mode a deleted course is kept aside, out of every index.
+        """
+        self.course_service = type(self.course_service)(archive=True)
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.delete_course(course_id)
+
+        self.assertEqual(self.course_service.get_archived_course(course_id).students_enrolled, {1: None})
+        self.assertEqual(self.course_service.list_courses(), [])
+        self.assertEqual(self.course_service.find_courses("Test"), [])
+        self.assertEqual(self.course_service.get_student_courses(1), [])
+        with self.assertRaises(KeyError):
+            self.course_service.get_course_by_id(course_id)
+
+    def test_delete_course_without_archive(self):
+        """
+        Test that outside archive mode a deleted course is not kept, and looking it up in the archive throws KeyError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.delete_course(course_id)
+        self.assertEqual(self.course_service.archived_courses, {})
+        with self.assertRaises(KeyError):
+            self.course_service.get_archived_course(course_id)
+
     # Test for create_assignment()
     def test_create_assignment(self):
         """
@@ -107,6 +218,77 @@ class CourseServiceTests(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.course_service.create_assignment(99, assignment_name)
                    
+    # Tests for create_assignments_bulk()
+    def test_create_assignments_bulk(self):
+        """
+        Test that bulk-created assignments get a contiguous block of IDs following the existing assignments.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        assignment_ids = self.course_service.create_assignments_bulk(course_id, (f"Quiz{i}" for i in range(20)))
+        self.assertEqual(assignment_ids, list(range(1, 21)))
+        self.assertEqual(self.course_service.create_assignment(course_id, "Assignment21"), 21)
+        course = self.course_service.get_course_by_id(course_id)
+        self.assertEqual(course.get_assignment_by_id(20).name, "Quiz19")
+        self.assertEqual(len(self.course_service.find_assignments(course_id, "Quiz")), 20)
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.submit_assignment(course_id, 1, 20, 80)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, 20), 80)
+
+    def test_create_assignments_bulk_empty(self):
+        """
+        Test that bulk-creating no assignments leaves the ID sequence untouched.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.assertEqual(self.course_service.create_assignments_bulk(course_id, []), [])
+        self.assertEqual(self.course_service.create_assignment(course_id, "Assignment0"), 0)
+
+    def test_create_assignments_bulk_non_existing_course(self):
+        """
+        Test that bulk-creating assignments in a non-existing course throws KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.course_service.create_assignments_bulk(0, ["Quiz0"])
+
+    # Tests for delete_assignment()
+    def test_delete_assignment(self):
+        """
+        Test that deleting an assignment purges its submissions and updates the students' averages and ranking.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignments_bulk(course_id, ["Quiz0", "Quiz1"])
+        self.course_service.enroll_students_bulk(course_id, [1, 2])
+        self.course_service.submit_assignments_bulk(course_id, [(1, 0, 100), (1, 1, 10), (2, 0, 50)])
+        self.assertEqual(self.course_service.get_top_five_students(course_id), [1, 2])
+
+        self.course_service.delete_assignment(course_id, 0)
+        course = self.course_service.get_course_by_id(course_id)
+        self.assertEqual(len(course.grades), 1)
+        self.assertEqual(self.course_service.get_student_grade_avg(course_id, 1), 10)
+        with self.assertRaises(ValueError):
+            self.course_service.get_student_grade_avg(course_id, 2)
+        self.assertEqual(self.course_service.get_top_five_students(course_id), [1, 2])
+        self.assertEqual(self.course_service.find_assignments(course_id, "Quiz0"), [])
+        with self.assertRaises(KeyError):
+            self.course_service.submit_assignment(course_id, 2, 0, 70)
+
+    def test_delete_assignment_ids_not_reused(self):
+        """
+        Test that assignments created after a deletion never get the deleted assignment's ID.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.delete_assignment(course_id, 0)
+        self.assertEqual(self.course_service.create_assignment(course_id, "Assignment1"), 1)
+
+    def test_delete_assignment_non_existing(self):
+        """
+        Test that deleting an assignment that does not exist throws KeyError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        with self.assertRaises(KeyError):
+            self.course_service.delete_assignment(course_id, 0)
+
     # Test for enroll_student()
     def test_enroll_student(self):
         """
@@ -138,6 +320,133 @@ class CourseServiceTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.course_service.enroll_student(course_id, student_id)
         
+    def test_enroll_student_non_integer_id(self):
+        """
+        Test enrolling a student with a non-integer ID throws ValueError and enrolls nobody.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(course_id, 1)
+        for student_id in ("x", [2], None):
+            with self.assertRaises(ValueError):
+                self.course_service.enroll_student(course_id, student_id)
+        self.assertEqual(list(self.course_service.get_course_by_id(course_id).students_enrolled), [1])
+        self.assertEqual(self.course_service.get_top_five_students(course_id), [1])
+
+    def test_enroll_student_keeps_only_ids(self):
+        """
+        Test that enrollments are stored as student IDs and looked up as one shared Student record.
+        """
+        self.course_service.create_course("Course0")
+        self.course_service.create_course("Course1")
+        self.course_service.enroll_student(0, 7)
+        self.course_service.enroll_student(1, 7)
+        self.assertEqual(self.course_service.get_course_by_id(0).students_enrolled, {7: None})
+        student = self.course_service.get_course_by_id(0).get_student_by_id(7)
+        self.assertEqual(student.id, 7)
+        self.assertIs(self.course_service.get_course_by_id(1).get_student_by_id(7), student)
+
+    def test_domain_model_has_no_instance_dicts(self):
+        """
+        Test that courses, assignments and students are slotted and reject unknown attributes.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_student(course_id, 1)
+        course = self.course_service.get_course_by_id(course_id)
+        for record in [course, course.get_assignment_by_id(assignment_id), course.get_student_by_id(1), course.student_aggregates[1]]:
+            self.assertFalse(hasattr(record, "__dict__"))
+            with self.assertRaises(AttributeError):
+                record.unknown = True
+
+    # Tests for find_assignments()
+    def test_find_assignments(self):
+        """
+        Test that assignments are found by name prefix within their course, duplicate names included.
+        """
+        for course_id in range(2):
+            self.course_service.create_course(f"Course{course_id}")
+        for assignment_name in ["Quiz2", "Lab1", "Quiz1", "Quiz1"]:
+            self.course_service.create_assignment(0, assignment_name)
+        self.course_service.create_assignment(1, "Quiz1")
+        self.assertEqual([assignment.id for assignment in self.course_service.find_assignments(0, "Quiz")], [2, 3, 0])
+        self.assertEqual([assignment.id for assignment in self.course_service.find_assignments(1, "")], [0])
+        self.assertEqual(self.course_service.find_assignments(0, "Exam"), [])
+
+    def test_find_assignments_invalid_course(self):
+        """
+        Test that searching the assignments of a course that does not exist throws KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.course_service.find_assignments(0, "Quiz")
+
+    # Tests for rename_assignment()
+    def test_rename_assignment(self):
+        """
+        Test that a renamed assignment is only found under its new name.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Quiz1")
+        self.course_service.create_assignment(course_id, "Quiz1")
+        self.course_service.rename_assignment(course_id, 0, "Exam1")
+        self.assertEqual(self.course_service.get_course_by_id(course_id).get_assignment_by_id(0).name, "Exam1")
+        self.assertEqual([assignment.id for assignment in self.course_service.find_assignments(course_id, "Quiz")], [1])
+        self.assertEqual([assignment.id for assignment in self.course_service.find_assignments(course_id, "Exam")], [0])
+
+    def test_rename_assignment_invalid_assignment(self):
+        """
+        Test that renaming an assignment that does not exist throws KeyError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        with self.assertRaises(KeyError):
+            self.course_service.rename_assignment(course_id, 0, "Quiz1")
+
+    # Tests for enroll_students_bulk()
+    def test_enroll_students_bulk(self):
+        """
+        Test enrolling a batch of students in an existing course.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        result = self.course_service.enroll_students_bulk(course_id, range(1, 6))
+        self.assertTrue(result.ok)
+        self.assertEqual(result.applied, 5)
+        course = self.course_service.get_course_by_id(course_id)
+        self.assertEqual(list(course.students_enrolled.keys()), [1, 2, 3, 4, 5])
+
+    def test_enroll_students_bulk_invalid_rows(self):
+        """
+        Test that a batch with already enrolled or duplicated students reports every bad row and enrolls nobody.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(course_id, 1)
+        result = self.course_service.enroll_students_bulk(course_id, [1, 2, 3, 2])
+        self.assertFalse(result.ok)
+        self.assertEqual(result.applied, 0)
+        self.assertEqual([error.index for error in result.errors], [0, 3])
+        course = self.course_service.get_course_by_id(course_id)
+        self.assertEqual(list(course.students_enrolled.keys()), [1])
+
+    def test_enroll_students_bulk_non_integer_ids(self):
+        """
+        Test that non-integer and unhashable IDs are reported as row errors and nobody is enrolled.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        result = self.course_service.enroll_students_bulk(course_id, [1, "x", 2, [3]])
+        self.assertEqual(result.applied, 0)
+        self.assertEqual([error.index for error in result.errors], [1, 3])
+        self.assertEqual(len(self.course_service.get_course_by_id(course_id).students_enrolled), 0)
+        self.assertEqual(self.course_service.get_student_courses(1), [])
+
+    def test_enroll_students_bulk_non_existing_course(self):
+        """
+        Test bulk enrolling into a non-existing course throws KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.course_service.enroll_students_bulk(99, [1, 2])
+
     # Test for dropout_student()
     def test_dropout_student_non_existing(self):
         """
@@ -169,6 +478,52 @@ class CourseServiceTests(unittest.TestCase):
         course = self.course_service.get_course_by_id(course_id) 
         self.assertFalse(any(s_id == student_id for s_id in course.students_enrolled.keys()), "Student should be dropped from the course")
     
+    def test_dropout_student_purges_grades(self):
+        """
+        Test that a dropped student's submissions no longer count towards the assignment averages.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.create_assignment(course_id, "Assignment1")
+        self.course_service.enroll_students_bulk(course_id, [1, 2])
+        self.course_service.submit_assignments_bulk(course_id, [(1, 0, 100), (1, 1, 100), (2, 0, 40)])
+        self.course_service.dropout_student(course_id, 1)
+
+        course = self.course_service.get_course_by_id(course_id)
+        self.assertEqual(len(course.grades), 1)
+        self.assertNotIn(1, course.student_aggregates)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, 0), 40)
+        self.assertEqual(self.course_service.get_assignment_median(course_id, 0), 40)
+        with self.assertRaises(ValueError):
+            self.course_service.get_assignment_grade_avg(course_id, 1)
+
+    def test_dropout_student_reenroll_starts_over(self):
+        """
+        Test that a re-enrolled student has no submissions and can submit their assignments again.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.submit_assignment(course_id, 1, 0, 90)
+        self.course_service.dropout_student(course_id, 1)
+        self.course_service.enroll_student(course_id, 1)
+        with self.assertRaises(ValueError):
+            self.course_service.get_student_grade_avg(course_id, 1)
+        self.course_service.submit_assignment(course_id, 1, 0, 60)
+        self.assertEqual(self.course_service.get_student_grade_avg(course_id, 1), 60)
+
+    def test_dropout_student_archive_keeps_grades(self):
+        """
+        Test that in archive mode a dropped student's submissions keep counting towards the assignment averages.
+        """
+        self.course_service = type(self.course_service)(archive=True)
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_students_bulk(course_id, [1, 2])
+        self.course_service.submit_assignments_bulk(course_id, [(1, 0, 100), (2, 0, 40)])
+        self.course_service.dropout_student(course_id, 1)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, 0), 70)
+
     # Test for submit_assignment()
     def test_submit_assignment(self):
         """
@@ -210,6 +565,21 @@ class CourseServiceTests(unittest.TestCase):
             self.course_service.submit_assignment(course_id, student_id, assignment_id, 101)
         with self.assertRaises(ValueError):
             self.course_service.submit_assignment(course_id, student_id, assignment_id, -1)
+
+    def test_submit_assignment_non_finite_grade(self):
+        """
+        Test submitting a NaN or infinite grade throws ValueError and records nothing.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Test Assignment")
+        self.course_service.enroll_student(course_id, 1)
+        for grade in (float("nan"), float("inf"), float("-inf")):
+            with self.assertRaises(ValueError):
+                self.course_service.submit_assignment(course_id, 1, 0, grade)
+        self.assertEqual(dict(self.course_service.get_student_grades(course_id, 1)), {})
+        self.course_service.submit_assignment(course_id, 1, 0, 80)
+        self.assertEqual(self.course_service.get_student_grade_avg(course_id, 1), 80)
     
     def test_submit_assignment_non_existing_student(self):
         """
@@ -248,6 +618,63 @@ class CourseServiceTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.course_service.submit_assignment(course_id, student_id, assignment_id, grade)
         
+    # Tests for submit_assignments_bulk()
+    def test_submit_assignments_bulk(self):
+        """
+        Test that a valid batch of submissions is recorded and reflected in the averages and ranking.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.create_assignment(course_id, "Assignment1")
+        self.course_service.enroll_students_bulk(course_id, [1, 2])
+        result = self.course_service.submit_assignments_bulk(course_id, [(1, 0, 90), (1, 1, 70), (2, 0, 60)])
+        self.assertTrue(result.ok)
+        self.assertEqual(result.applied, 3)
+        self.assertEqual(self.course_service.get_student_grade_avg(course_id, 1), 80)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, 0), 75)
+        self.assertEqual(self.course_service.get_top_five_students(course_id), [1, 2])
+
+    def test_submit_assignments_bulk_invalid_rows(self):
+        """
+        Test that a batch with invalid rows reports each of them and records nothing.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.enroll_student(course_id, 2)
+        self.course_service.submit_assignment(course_id, 2, 0, 50)
+        rows = [
+            (1, 0, 80), # valid
+            (1, 0, 85), # duplicated in the batch
+            (1, 0, 101), # grade out of range
+            (99, 0, 50), # student not enrolled
+            (1, 99, 50), # assignment does not exist
+            (2, 0, 50), # already submitted
+            (1, 0), # malformed
+        ]
+        result = self.course_service.submit_assignments_bulk(course_id, rows)
+        self.assertEqual(result.applied, 0)
+        self.assertEqual([error.index for error in result.errors], [1, 2, 3, 4, 5, 6])
+        self.assertNotIn((1, 0), self.course_service.get_course_by_id(course_id).grades)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, 0), 50)
+
+    def test_submit_assignments_bulk_non_finite_and_unhashable_rows(self):
+        """
+        Test that NaN and infinite grades and unhashable IDs are reported as row errors and record nothing.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_students_bulk(course_id, [1, 2, 3])
+        rows = [(1, 0, 90), (2, 0, float("nan")), (3, 0, float("inf")), ([1], 0, 90), (1, {}, 90)]
+        result = self.course_service.submit_assignments_bulk(course_id, rows)
+        self.assertEqual(result.applied, 0)
+        self.assertEqual([error.index for error in result.errors], [1, 2, 3, 4])
+        self.assertEqual(len(self.course_service.get_course_by_id(course_id).grades), 0)
+        self.assertEqual(len(self.course_service.get_assignment_grades(course_id, 0)), 0)
+
     # Test for get_assignment_grade_avg()
     def test_get_assignment_grade_avg(self):
         """
@@ -300,7 +727,114 @@ class CourseServiceTests(unittest.TestCase):
         self.course_service.create_course("Test Course")
         with self.assertRaises(KeyError):
             self.course_service.get_assignment_grade_avg(course_id, 99)
+
+    def test_get_assignment_grade_avg_no_submissions(self):
+        """
+        Test calculating the average grade for an assignment without submissions throws ValueError.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Test Assignment")
+        with self.assertRaises(ValueError):
+            self.course_service.get_assignment_grade_avg(course_id, 0)
+
+    def test_get_assignment_grade_avg_updates_with_submissions(self):
+        """
+        Test that the assignment average reflects every new submission.
+        """
+        course_id = 0
+        assignment_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Test Assignment")
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.enroll_student(course_id, 2)
+        self.course_service.submit_assignment(course_id, 1, assignment_id, 90)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, assignment_id), 90)
+        self.course_service.submit_assignment(course_id, 2, assignment_id, 45)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(course_id, assignment_id), 67) # 135 / 2 = 67.5 floor'd to 67
     
+    # Tests for get_assignment_percentile()
+    def test_get_assignment_percentile(self):
+        """
+        Test that percentiles follow the nearest-rank definition, over single and bulk submissions.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_students_bulk(course_id, list(range(10)))
+        for student_id in range(5):
+            self.course_service.submit_assignment(course_id, student_id, assignment_id, (student_id + 1) * 10)
+        self.course_service.submit_assignments_bulk(course_id, [(student_id, assignment_id, (student_id + 1) * 10) for student_id in range(5, 10)])
+
+        self.assertEqual(self.course_service.get_assignment_percentile(course_id, assignment_id, 0), 10)
+        self.assertEqual(self.course_service.get_assignment_percentile(course_id, assignment_id, 25), 30)
+        self.assertEqual(self.course_service.get_assignment_percentile(course_id, assignment_id, 90), 90)
+        self.assertEqual(self.course_service.get_assignment_percentile(course_id, assignment_id, 90.5), 100)
+        self.assertEqual(self.course_service.get_assignment_percentile(course_id, assignment_id, 100), 100)
+
+    def test_get_assignment_percentile_invalid(self):
+        """
+        Test that an out of range percentile, or an assignment without submissions, throws ValueError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        with self.assertRaises(ValueError):
+            self.course_service.get_assignment_percentile(course_id, assignment_id, 50)
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.submit_assignment(course_id, 1, assignment_id, 50)
+        with self.assertRaises(ValueError):
+            self.course_service.get_assignment_percentile(course_id, assignment_id, 101)
+        with self.assertRaises(KeyError):
+            self.course_service.get_assignment_percentile(course_id, 1, 50)
+
+    # Tests for get_assignment_median()
+    def test_get_assignment_median(self):
+        """
+        Test that the median is the middle grade for an odd count and the mean of the middle grades for an even count.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        for student_id, grade in enumerate([70, 20, 95]):
+            self.course_service.enroll_student(course_id, student_id)
+            self.course_service.submit_assignment(course_id, student_id, assignment_id, grade)
+        self.assertEqual(self.course_service.get_assignment_median(course_id, assignment_id), 70)
+        self.course_service.enroll_student(course_id, 3)
+        self.course_service.submit_assignment(course_id, 3, assignment_id, 75)
+        self.assertEqual(self.course_service.get_assignment_median(course_id, assignment_id), 72.5)
+
+    def test_get_assignment_median_no_submissions(self):
+        """
+        Test that the median of an assignment without submissions throws ValueError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        with self.assertRaises(ValueError):
+            self.course_service.get_assignment_median(course_id, assignment_id)
+
+    # Tests for get_assignment_distribution()
+    def test_get_assignment_distribution(self):
+        """
+        Test that the distribution counts the grades of every integer grade from 0 to 100.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.create_assignment(course_id, "Assignment1")
+        self.course_service.enroll_students_bulk(course_id, [1, 2, 3, 4])
+        self.course_service.submit_assignments_bulk(course_id, [(1, 0, 0), (2, 0, 100), (3, 0, 100), (4, 1, 50)])
+
+        distribution = self.course_service.get_assignment_distribution(course_id, assignment_id)
+        self.assertEqual(len(distribution), 101)
+        self.assertEqual(sum(distribution), 3)
+        self.assertEqual((distribution[0], distribution[50], distribution[100]), (1, 0, 2))
+
+    def test_get_assignment_distribution_is_a_copy(self):
+        """
+        Test that changing a returned distribution leaves the assignment's distribution untouched.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        assignment_id = self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.get_assignment_distribution(course_id, assignment_id)[10] = 5
+        self.assertEqual(sum(self.course_service.get_assignment_distribution(course_id, assignment_id)), 0)
+
     # Test for get_student_grade_avg()
     def test_get_student_grade_avg(self):
         """
@@ -352,6 +886,17 @@ class CourseServiceTests(unittest.TestCase):
         self.course_service.create_course("Test Course")
         with self.assertRaises(KeyError):
             self.course_service.get_student_grade_avg(course_id, 99)
+
+    def test_get_student_grade_avg_no_submissions(self):
+        """
+        Test calculating the average grade for a student without submissions throws ValueError.
+        """
+        course_id = 0
+        student_id = 1
+        self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(course_id, student_id)
+        with self.assertRaises(ValueError):
+            self.course_service.get_student_grade_avg(course_id, student_id)
        
     # Test for get_top_five_students()         
     def test_get_top_five_students(self):
@@ -433,6 +978,35 @@ class CourseServiceTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.course_service.get_top_five_students(course_id)
                 
+    def test_get_top_five_students_ties_and_no_submissions(self):
+        """
+        Test that students with equal averages are ordered by ID and students without submissions rank last.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        for student_id in [9, 3, 7, 5]:
+            self.course_service.enroll_student(course_id, student_id)
+        self.course_service.submit_assignment(course_id, 9, 0, 80)
+        self.course_service.submit_assignment(course_id, 7, 0, 80)
+        self.course_service.submit_assignment(course_id, 5, 0, 95)
+
+        self.assertEqual(self.course_service.get_top_five_students(course_id), [5, 7, 9, 3])
+
+    def test_get_top_five_students_excludes_dropped_students(self):
+        """
+        Test that a dropped student no longer appears among the top students.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        for student_id, grade in [(1, 100), (2, 50)]:
+            self.course_service.enroll_student(course_id, student_id)
+            self.course_service.submit_assignment(course_id, student_id, 0, grade)
+        self.course_service.dropout_student(course_id, 1)
+
+        self.assertEqual(self.course_service.get_top_five_students(course_id), [2])
+
     def test_get_top_five_students_non_existing_course(self):
         """
         Test attempting to identify top five students in a non-existing course throws KeyError.
@@ -440,5 +1014,185 @@ class CourseServiceTests(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.course_service.get_top_five_students(99)
 
+    # Tests for get_student_grades()
+    def test_get_student_grades(self):
+        """
+        Test that a student's grades are returned by assignment ID and stay in sync with new submissions.
+        """
+        course_id = 0
+        student_id = 1
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.create_assignment(course_id, "Assignment1")
+        self.course_service.enroll_student(course_id, student_id)
+        student_grades = self.course_service.get_student_grades(course_id, student_id)
+        self.assertEqual(dict(student_grades), {})
+        self.course_service.submit_assignment(course_id, student_id, 0, 70)
+        self.course_service.submit_assignment(course_id, student_id, 1, 80)
+        self.assertEqual(dict(student_grades), {0: 70, 1: 80})
+        with self.assertRaises(TypeError):
+            student_grades[2] = 90
+
+    def test_get_student_grades_non_existing_student(self):
+        """
+        Test retrieving grades of a non-enrolled student throws KeyError.
+        """
+        self.course_service.create_course("Test Course")
+        with self.assertRaises(KeyError):
+            self.course_service.get_student_grades(0, 99)
+
+    # Tests for get_assignment_grades()
+    def test_get_assignment_grades(self):
+        """
+        Test that an assignment's grades are returned by student ID.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        for student_id, grade in [(1, 40), (2, 60)]:
+            self.course_service.enroll_student(course_id, student_id)
+            self.course_service.submit_assignment(course_id, student_id, 0, grade)
+        self.assertEqual(dict(self.course_service.get_assignment_grades(course_id, 0)), {1: 40, 2: 60})
+
+    def test_get_assignment_grades_non_existing_assignment(self):
+        """
+        Test retrieving grades of a non-existing assignment throws KeyError.
+        """
+        self.course_service.create_course("Test Course")
+        with self.assertRaises(KeyError):
+            self.course_service.get_assignment_grades(0, 99)
+
+    # Tests for get_top_k_students()
+    def test_get_top_k_students(self):
+        """
+        Test that the top k students are returned best first.
+        """
+        course_id = 0
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        for student_id in range(10):
+            self.course_service.enroll_student(course_id, student_id)
+            self.course_service.submit_assignment(course_id, student_id, 0, student_id * 10)
+
+        self.assertEqual(self.course_service.get_top_k_students(course_id, 3), [9, 8, 7])
+        self.assertEqual(self.course_service.get_top_k_students(course_id, 0), [])
+        self.assertEqual(len(self.course_service.get_top_k_students(course_id, 50)), 10)
+
+    def test_get_top_k_students_negative_k(self):
+        """
+        Test that asking for a negative number of students throws ValueError.
+        """
+        self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(0, 1)
+        with self.assertRaises(ValueError):
+            self.course_service.get_top_k_students(0, -1)
+
+    # Tests for get_student_rank()
+    def test_get_student_rank(self):
+        """
+        Test that ranks follow the order of get_top_five_students(), ties going to the lower ID and ungraded students last.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_students_bulk(course_id, [1, 2, 3, 4, 5, 6])
+        self.course_service.submit_assignments_bulk(course_id, [(1, 0, 60), (2, 0, 90), (3, 0, 60), (5, 0, 75)])
+
+        top_five = self.course_service.get_top_five_students(course_id)
+        self.assertEqual(top_five, [2, 5, 1, 3, 4])
+        for position, student_id in enumerate(top_five, start=1):
+            self.assertEqual(self.course_service.get_student_rank(course_id, student_id), position)
+        self.assertEqual(self.course_service.get_student_rank(course_id, 6), 6)
+
+    def test_get_student_rank_not_enrolled(self):
+        """
+        Test that ranking a student who dropped out of the course throws KeyError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(course_id, 1)
+        self.course_service.dropout_student(course_id, 1)
+        with self.assertRaises(KeyError):
+            self.course_service.get_student_rank(course_id, 1)
+
+    # Tests for get_student_percentile()
+    def test_get_student_percentile(self):
+        """
+        Test that the standing is the percentage of students ranked at or below the student.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        for student_id in range(4):
+            self.course_service.enroll_student(course_id, student_id)
+            self.course_service.submit_assignment(course_id, student_id, 0, student_id * 10)
+        self.assertEqual(self.course_service.get_student_percentile(course_id, 3), 100)
+        self.assertEqual(self.course_service.get_student_percentile(course_id, 1), 50)
+        self.assertEqual(self.course_service.get_student_percentile(course_id, 0), 25)
+
+    def test_get_student_percentile_not_enrolled(self):
+        """
+        Test that the standing of a student who is not enrolled throws KeyError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        with self.assertRaises(KeyError):
+            self.course_service.get_student_percentile(course_id, 1)
+
+    # Tests for get_student_courses()
+    def test_get_student_courses(self):
+        """
+        Test that the courses of a student follow enrollments, dropouts and course deletions.
+        """
+        for course_id in range(3):
+            self.course_service.create_course(f"Course{course_id}")
+            self.course_service.enroll_student(course_id, 1)
+        self.course_service.enroll_students_bulk(1, [2, 3])
+        self.assertEqual(self.course_service.get_student_courses(1), [0, 1, 2])
+        self.assertEqual(self.course_service.get_student_courses(2), [1])
+
+        self.course_service.dropout_student(0, 1)
+        self.course_service.delete_course(2)
+        self.assertEqual(self.course_service.get_student_courses(1), [1])
+
+    def test_get_student_courses_unknown_student(self):
+        """
+        Test that a student enrolled nowhere has no courses.
+        """
+        self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(0, 1)
+        self.course_service.dropout_student(0, 1)
+        self.assertEqual(self.course_service.get_student_courses(1), [])
+        self.assertEqual(self.course_service.get_student_courses(99), [])
+        self.assertEqual(self.course_service.student_courses, {})
+
+    def test_get_student_courses_failed_bulk_enrollment(self):
+        """
+        Test that a rejected bulk enrollment leaves the student index untouched.
+        """
+        self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(0, 1)
+        result = self.course_service.enroll_students_bulk(0, [2, 1])
+        self.assertFalse(result.ok)
+        self.assertEqual(self.course_service.get_student_courses(2), [])
+
+    # Tests for get_student_transcript()
+    def test_get_student_transcript(self):
+        """
+        Test that the transcript holds the student's average per course, None where they have no submissions.
+        """
+        for course_id in range(3):
+            self.course_service.create_course(f"Course{course_id}")
+            self.course_service.create_assignment(course_id, "Assignment0")
+            self.course_service.create_assignment(course_id, "Assignment1")
+            self.course_service.enroll_student(course_id, 1)
+        self.course_service.submit_assignment(0, 1, 0, 80)
+        self.course_service.submit_assignment(0, 1, 1, 95)
+        self.course_service.submit_assignment(1, 1, 0, 60)
+
+        self.assertEqual(self.course_service.get_student_transcript(1), {0: 87, 1: 60, 2: None})
+
+    def test_get_student_transcript_unknown_student(self):
+        """
+        Test that a student enrolled nowhere has an empty transcript.
+        """
+        self.assertEqual(self.course_service.get_student_transcript(1), {})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
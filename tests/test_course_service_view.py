@@ -0,0 +1,219 @@
+import unittest
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import CourseServiceImpl
+from app.course_service_view import CourseServiceView
+from app.thread_safe_course_service import ThreadSafeCourseServiceImpl
+
+
+class CourseServiceViewTests(unittest.TestCase):
+    """
+    Unit tests for CourseServiceImpl.snapshot() and the CourseServiceView class.
+    """
+    service_class = CourseServiceImpl
+    compact_grades = False
+
+    def setUp(self):
+        """
+        Set up two graded courses for each test case.
+        """
+        self.course_service = self.service_class(self.compact_grades)
+        for name in ("CS101", "CS102"):
+            course_id = self.course_service.create_course(name)
+            self.course_service.create_assignments_bulk(course_id, ["Homework 1", "Homework 2"])
+            self.course_service.enroll_students_bulk(course_id, [1, 2, 3])
+            self.course_service.submit_assignments_bulk(course_id, [(1, 0, 90), (2, 0, 70), (3, 0, 50), (1, 1, 80)])
+
+    def test_view_is_unchanged_by_writes(self):
+        """
+        Test that the view keeps answering as of its creation while the service is mutated in every way.
+        """
+        view = self.course_service.snapshot()
+        self.course_service.submit_assignment(0, 2, 1, 100)
+        self.course_service.enroll_student(0, 4)
+        self.course_service.dropout_student(0, 3)
+        self.course_service.create_assignment(0, "Homework 3")
+        self.course_service.delete_assignment(0, 1)
+        self.course_service.rename_course(1, "Algorithms")
+        self.course_service.create_course("CS103")
+        self.course_service.delete_course(1)
+
+        self.assertEqual(view.get_assignment_grade_avg(0, 0), 70)
+        self.assertEqual(view.get_assignment_grade_avg(0, 1), 80)
+        self.assertEqual(dict(view.get_student_grades(0, 3)), {0: 50})
+        self.assertEqual(dict(view.get_student_grades(0, 2)), {0: 70})
+        self.assertEqual(dict(view.get_student_grades(0, 1)), {0: 90, 1: 80})
+        self.assertEqual(sorted(view.get_course_by_id(0).students_enrolled), [1, 2, 3])
+        self.assertEqual(sorted(view.get_course_by_id(0).assignments), [0, 1])
+        self.assertEqual([summary.name for summary in view.list_courses()], ["CS101", "CS102"])
+        self.assertEqual([course.id for course in view.find_courses("CS10")], [0, 1])
+        self.assertEqual(view.find_courses("Algo"), [])
+        self.assertEqual(view.get_student_courses(3), [0, 1])
+        self.assertEqual(view.get_student_courses(4), [])
+
+        self.assertEqual(self.course_service.get_assignment_grade_avg(0, 0), 80)
+        self.assertEqual(dict(self.course_service.get_student_grades(0, 2)), {0: 70})
+        self.assertEqual([summary.name for summary in self.course_service.list_courses()], ["CS101", "CS103"])
+        self.assertEqual(self.course_service.get_student_courses(3), [])
+
+    def test_view_answers_queries(self):
+        """
+        Test that aggregates, rankings and transcripts are served by the view.
+        """
+        statistics = self.course_service.get_course_statistics(0)
+        view = self.course_service.snapshot()
+        self.course_service.submit_assignment(0, 3, 1, 100)
+        self.assertEqual(view.get_student_grade_avg(0, 1), 85)
+        self.assertEqual(view.get_top_five_students(0), [1, 2, 3])
+        self.assertEqual(view.get_assignment_median(0, 0), 70)
+        self.assertEqual(view.get_course_statistics(0), statistics)
+        self.assertEqual(view.get_student_transcript(3), {0: 50, 1: 50})
+        self.assertEqual(self.course_service.get_top_five_students(0), [1, 3, 2])
+
+    def test_mutations_are_refused(self):
+        """
+        Test that mutating a view throws TypeError and leaves both the view and the service untouched.
+        """
+        view = self.course_service.snapshot()
+        with self.assertRaises(TypeError):
+            view.submit_assignment(0, 2, 1, 100)
+        with self.assertRaises(TypeError):
+            view.create_course("CS103")
+        with self.assertRaises(TypeError):
+            view.enroll_students_bulk(0, [4])
+        with self.assertRaises(TypeError):
+            view.delete_course(0)
+        self.assertEqual(len(view.get_courses()), 2)
+        self.assertEqual(len(self.course_service.get_courses()), 2)
+
+    def test_only_mutated_courses_are_copied(self):
+        """
+        Test that the view shares every course until the service mutates it, and only the mutated course is copied once.
+        """
+        view = self.course_service.snapshot()
+        self.assertIs(view.get_course_by_id(0), self.course_service.get_course_by_id(0))
+        self.course_service.submit_assignment(0, 2, 1, 100)
+        copy = self.course_service.get_course_by_id(0)
+        self.assertIsNot(view.get_course_by_id(0), copy)
+        self.assertIs(view.get_course_by_id(1), self.course_service.get_course_by_id(1))
+        self.course_service.submit_assignment(0, 3, 1, 60)
+        self.assertIs(self.course_service.get_course_by_id(0), copy)
+
+    def test_copies_share_untouched_students(self):
+        """
+        Test that a copied course and the student index share the entries of every student the service has not written to.
+        """
+        view = self.course_service.snapshot()
+        self.course_service.submit_assignment(0, 2, 1, 100)
+        self.course_service.enroll_student(1, 4)
+        self.course_service.dropout_student(1, 3)
+        old, new = view.get_course_by_id(0), self.course_service.get_course_by_id(0)
+        self.assertIs(new.student_aggregates[1], old.student_aggregates[1])
+        self.assertIsNot(new.student_aggregates[2], old.student_aggregates[2])
+        self.assertEqual(old.student_aggregates[2].count, 1)
+        if not self.compact_grades:
+            self.assertIs(new.grades.by_student[1], old.grades.by_student[1])
+            self.assertIsNot(new.grades.by_student[2], old.grades.by_student[2])
+            self.assertIs(new.grades.by_assignment[0], old.grades.by_assignment[0])
+        self.assertIs(self.course_service.student_courses[1], view.student_courses[1])
+        self.assertEqual(view.student_courses[3], {0: None, 1: None})
+        self.assertEqual(self.course_service.student_courses[3], {0: None})
+        self.assertEqual(view.get_student_courses(4), [])
+
+    def test_grade_views_follow_copied_courses(self):
+        """
+        Test that grade views handed out before a view keep following the service once their course is copied.
+        """
+        student_grades = self.course_service.get_student_grades(0, 2)
+        assignment_grades = self.course_service.get_assignment_grades(0, 1)
+        view = self.course_service.snapshot()
+        self.course_service.submit_assignment(0, 2, 1, 100)
+        self.assertEqual(dict(student_grades), {0: 70, 1: 100})
+        self.assertEqual(dict(assignment_grades), {1: 80, 2: 100})
+        self.assertEqual(dict(view.get_student_grades(0, 2)), {0: 70})
+        self.course_service.delete_assignment(0, 1)
+        self.assertEqual(dict(assignment_grades), {})
+
+    def test_no_copies_once_views_are_gone(self):
+        """
+        Test that the service stops copying courses and indexes once every view has been garbage collected.
+        """
+        view = self.course_service.snapshot()
+        del view
+        course = self.course_service.get_course_by_id(0)
+        courses, student_courses = self.course_service.courses, self.course_service.student_courses
+        self.course_service.submit_assignment(0, 2, 1, 100)
+        self.course_service.enroll_student(0, 4)
+        self.assertIs(self.course_service.get_course_by_id(0), course)
+        self.assertIs(self.course_service.courses, courses)
+        self.assertIs(self.course_service.student_courses, student_courses)
+
+    def test_successive_views(self):
+        """
+        Test that each view sees the writes made before it, and a view of a view is itself.
+        """
+        first = self.course_service.snapshot()
+        self.course_service.submit_assignment(0, 2, 1, 100)
+        second = self.course_service.snapshot()
+        self.course_service.submit_assignment(0, 3, 1, 60)
+        self.assertEqual(first.get_assignment_grade_avg(0, 1), 80)
+        self.assertEqual(second.get_assignment_grade_avg(0, 1), 90)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(0, 1), 80)
+        self.assertIs(second.snapshot(), second)
+        self.assertIsInstance(second, CourseServiceView)
+
+
+class CompactCourseServiceViewTests(CourseServiceViewTests):
+    """
+    Runs the view tests against courses keeping their grades in a CompactGradeStore.
+    """
+    compact_grades = True
+
+
+class ThreadSafeCourseServiceViewTests(CourseServiceViewTests):
+    """
+    Runs the view tests against ThreadSafeCourseServiceImpl, and takes views while other threads write.
+    """
+    service_class = ThreadSafeCourseServiceImpl
+
+    def test_views_are_consistent_under_concurrent_writes(self):
+        """
+        Test that views taken while writers submit and rename never see half of a mutation.
+        """
+        course_id = self.course_service.create_course("CS103")
+        self.course_service.create_assignment(course_id, "Homework 1")
+        students = range(100, 400)
+        self.course_service.enroll_students_bulk(course_id, students)
+
+        def submit():
+            for student_id in students:
+                self.course_service.submit_assignment(course_id, student_id, 0, 100)
+
+        def rename():
+            for index in range(200):
+                self.course_service.rename_course(0, f"CS101 v{index}")
+
+        writers = [threading.Thread(target=submit), threading.Thread(target=rename)]
+        for writer in writers:
+            writer.start()
+        counts = []
+        while any(writer.is_alive() for writer in writers):
+            view = self.course_service.snapshot()
+            course = view.get_course_by_id(course_id)
+            submitted = [student_id for student_id in students if course.grades.student_grades(student_id, live=False)]
+            self.assertEqual(submitted, list(students[:len(submitted)]))
+            if submitted:
+                self.assertEqual(view.get_assignment_grade_avg(course_id, 0), 100)
+            self.assertEqual(len(view.find_courses("CS101")), 1)
+            counts.append(len(submitted))
+        for writer in writers:
+            writer.join()
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(self.course_service.snapshot().get_assignment_grade_avg(course_id, 0), 100)
+        self.assertEqual(self.course_service.get_course_by_id(0).name, "CS101 v199")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+from dataclasses import replace
+from statistics import pstdev
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import course_statistics
+from app.course_service_impl import CourseServiceImpl
+
+
+class CourseStatisticsTests(unittest.TestCase):
+    """
+    Unit tests for CourseServiceImpl.get_course_statistics().
+    """
+    compact_grades = False
+
+    def setUp(self):
+        """
+        Set up a course with three assignments, four students and one dropped student whose grades are archived.
+        """
+        self.course_service = CourseServiceImpl(compact_grades=self.compact_grades, archive=True)
+        self.course_service.create_course("Test Course")
+        for assignment_id in range(3):
+            self.course_service.create_assignment(0, f"Assignment{assignment_id}")
+        # student_id : [grades over the first assignments]
+        student_grades = {
+            1 : [100, 90, 80],
+            2 : [0, 25],
+            3 : [55],
+            4 : [],
+            5 : [70, 70, 70],
+        }
+        for student_id, grades in student_grades.items():
+            self.course_service.enroll_student(0, student_id)
+            for assignment_id, grade in enumerate(grades):
+                self.course_service.submit_assignment(0, student_id, assignment_id, grade)
+        self.course_service.dropout_student(0, 5)
+
+    def assert_matches_single_queries(self, statistics):
+        self.assertEqual(statistics.student_averages, {s_id: self.course_service.get_student_grade_avg(0, s_id) for s_id in [1, 2, 3]})
+        self.assertEqual(statistics.assignment_averages, {a_id: self.course_service.get_assignment_grade_avg(0, a_id) for a_id in range(3)})
+
+    def test_get_course_statistics(self):
+        """
+        Test that the batch statistics agree with the single-item queries and describe every grade.
+        """
+        statistics = self.course_service.get_course_statistics(0)
+        self.assert_matches_single_queries(statistics)
+        self.assertEqual(statistics.submission_count, 9)
+        self.assertEqual((statistics.minimum, statistics.maximum, statistics.median), (0, 100, 70.0))
+        self.assertAlmostEqual(statistics.stddev, pstdev([100, 90, 80, 0, 25, 55, 70, 70, 70]))
+        self.assertEqual(sum(statistics.histogram), 9)
+        self.assertEqual(statistics.histogram[70], 3)
+
+    def test_get_course_statistics_pure_python(self):
+        """
+        Test that the pure-Python fallback gives the same result.
+        """
+        numpy = course_statistics.np
+        course_statistics.np = None
+        try:
+            statistics = self.course_service.get_course_statistics(0)
+        finally:
+            course_statistics.np = numpy
+        expected = course_statistics.compute_course_statistics(self.course_service.get_course_by_id(0))
+        self.assertAlmostEqual(statistics.stddev, expected.stddev)
+        self.assertEqual(replace(statistics, stddev=None), replace(expected, stddev=None))
+
+    @unittest.skipIf(course_statistics.np is None, "NumPy is not installed")
+    def test_get_course_statistics_numpy_matches_pure_python(self):
+        """
+        Test that the NumPy computation gives the same result as the pure-Python fallback, fractional grades included.
+        """
+        if not self.compact_grades:
+            self.course_service.enroll_student(0, 6)
+            self.course_service.submit_assignments_bulk(0, [(6, 0, 85.5), (6, 1, 40.25), (6, 2, 99.75)])
+        course = self.course_service.get_course_by_id(0)
+        numpy_statistics = course_statistics._compute_with_numpy(course)
+        python_statistics = course_statistics._compute_with_python(course)
+        self.assertAlmostEqual(numpy_statistics.stddev, python_statistics.stddev)
+        self.assertEqual(replace(numpy_statistics, stddev=None), replace(python_statistics, stddev=None))
+        self.assertEqual(numpy_statistics.histogram, python_statistics.histogram)
+
+    def test_get_course_statistics_no_submissions(self):
+        """
+        Test that a course without submissions has empty statistics.
+        """
+        self.course_service.create_course("Empty Course")
+        statistics = self.course_service.get_course_statistics(1)
+        self.assertEqual(statistics.submission_count, 0)
+        self.assertEqual(statistics.student_averages, {})
+        self.assertIsNone(statistics.median)
+
+    def test_get_course_statistics_non_existing_course(self):
+        """
+        Test computing statistics for a non-existing course throws KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.course_service.get_course_statistics(99)
+
+
+class CompactCourseStatisticsTests(CourseStatisticsTests):
+    """
+    Runs the statistics tests with compact grade storage enabled.
+    """
+    compact_grades = True
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import random
+import statistics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import GradeDistribution
+
+
+class GradeDistributionTests(unittest.TestCase):
+    """
+    Unit tests for the GradeDistribution class.
+    """
+    def setUp(self):
+        """
+        Set up a distribution of random integer grades for each test case.
+        """
+        rng = random.Random(0)
+        self.grades = [rng.randint(0, 100) for _ in range(5001)]
+        self.distribution = GradeDistribution()
+        for grade in self.grades:
+            self.distribution.add(grade)
+
+    def test_median_matches_statistics(self):
+        """
+        Test that the median matches statistics.median() for odd and even counts.
+        """
+        self.assertEqual(self.distribution.median(), statistics.median(self.grades))
+        self.distribution.remove(self.grades.pop())
+        self.assertEqual(self.distribution.median(), statistics.median(self.grades))
+
+    def test_percentile_matches_nearest_rank(self):
+        """
+        Test that every percentile matches the nearest rank of the sorted grades.
+        """
+        ordered = sorted(self.grades)
+        for p in range(1, 101):
+            rank = -(-p * len(ordered) // 100)
+            self.assertEqual(self.distribution.percentile(p), ordered[rank - 1])
+        self.assertEqual(self.distribution.percentile(0), ordered[0])
+
+    def test_fractional_grades_use_their_floor(self):
+        """
+        Test that fractional grades are counted in the bucket of their floor, and still summed exactly.
+        """
+        distribution = GradeDistribution()
+        distribution.add(40.5)
+        distribution.add(99.9)
+        self.assertEqual((distribution.histogram[40], distribution.histogram[99]), (1, 1))
+        self.assertEqual(distribution.median(), 69.5)
+        self.assertEqual(distribution.average(), 70)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import CourseServiceImpl
+from app.grade_store import CompactGradeStore, DictGradeStore
+from tests import test_course_service_impl
+
+
+class DictGradeStoreTests(unittest.TestCase):
+    """
+    Unit tests for the DictGradeStore class.
+    """
+    def setUp(self):
+        """
+        Set up a store with two students and two assignments for each test case.
+        """
+        self.store = self.create_store()
+        for student_id in [10, 20]:
+            self.store.add_student(student_id)
+        for assignment_id in [0, 1]:
+            self.store.add_assignment(assignment_id)
+
+    def create_store(self):
+        return DictGradeStore()
+
+    def test_set_and_get(self):
+        """
+        Test that stored grades are readable by (student_id, assignment_id) and through both indexes.
+        """
+        self.store.set(10, 1, 75)
+        self.store.set(20, 1, 0)
+        self.assertEqual(self.store[(10, 1)], 75)
+        self.assertIsNone(self.store.get((10, 0)))
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(sorted(self.store.items()), [((10, 1), 75), ((20, 1), 0)])
+        self.assertEqual(dict(self.store.student_grades(10)), {1: 75})
+        self.assertEqual(dict(self.store.assignment_grades(1)), {10: 75, 20: 0})
+        self.assertEqual(len(self.store.assignment_grades(0)), 0)
+
+    def test_add_assignment_after_grades(self):
+        """
+        Test that adding assignments later keeps the grades already stored.
+        """
+        self.store.set(20, 1, 99)
+        for assignment_id in range(2, 40):
+            self.store.add_assignment(assignment_id)
+        self.store.set(20, 39, 1)
+        self.assertEqual(dict(self.store.student_grades(20)), {1: 99, 39: 1})
+
+    def test_student_grades_live_before_first_submission(self):
+        """
+        Test that the view of a student without submissions sees their later grades.
+        """
+        grades = self.store.student_grades(10)
+        self.assertEqual(len(grades), 0)
+        self.store.set(10, 0, 64)
+        self.assertEqual(dict(grades), {0: 64})
+    def test_remove_assignment(self):
+        """
+        Test that removing an assignment returns and drops only its grades, and makes it unknown to the store.
+        """
+        self.store.set(10, 0, 1)
+        self.store.set(20, 0, 2)
+        self.store.set(20, 1, 3)
+        self.assertEqual(self.store.remove_assignment(0), {10: 1, 20: 2})
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(sorted(self.store.items()), [((20, 1), 3)])
+        self.assertEqual(dict(self.store.student_grades(20)), {1: 3})
+        with self.assertRaises(KeyError):
+            self.store.assignment_grades(0)
+        self.assertEqual(self.store.remove_assignment(0), {})
+
+    def test_remove_student(self):
+        """
+        Test that removing a student returns and drops only their grades, and removing them again removes nothing.
+        """
+        self.store.add_student(30)
+        for student_id, grade in [(10, 11), (20, 21), (30, 31)]:
+            self.store.set(student_id, 0, grade)
+        self.store.set(10, 1, 12)
+        self.assertEqual(self.store.remove_student(10), {0: 11, 1: 12})
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(sorted(self.store.items()), [((20, 0), 21), ((30, 0), 31)])
+        self.assertEqual(dict(self.store.assignment_grades(0)), {20: 21, 30: 31})
+        self.assertEqual(self.store.remove_student(10), {})
+
+class CompactGradeStoreTests(DictGradeStoreTests):
+    """
+    Runs the grade store unit tests against CompactGradeStore.
+    """
+    def create_store(self):
+        return CompactGradeStore()
+
+    def test_remove_student_releases_row(self):
+        """
+        Test that removing a student shrinks the matrix by one row and keeps the moved row's grades.
+        """
+        self.store.set(10, 0, 1)
+        self.store.set(20, 1, 2)
+        self.store.remove_student(10)
+        self.assertEqual(len(self.store.matrix), self.store.stride)
+        self.assertEqual(self.store.rows, {20: 0})
+        self.assertEqual(dict(self.store.student_grades(20)), {1: 2})
+
+    def test_set_non_integer_grade(self):
+        """
+        Test that the compact store rejects grades it cannot hold in a byte.
+        """
+        with self.assertRaises(ValueError):
+            self.store.set(10, 0, 50.5)
+
+
+class CompactCourseServiceTests(test_course_service_impl.CourseServiceTests):
+    """
+    Runs the CourseServiceImpl unit tests with compact grade storage enabled.
+    """
+    def setUp(self):
+        """
+        Set up a fresh instance of CourseServiceImpl with compact grades for each test case.
+        """
+        self.course_service = CourseServiceImpl(compact_grades=True)
+
+    def test_get_assignment_grade_avg_float_grades(self):
+        """
+        Test that float grades are rejected with ValueError in compact mode.
+        """
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(0, "Test Assignment")
+        self.course_service.enroll_student(0, 1)
+        with self.assertRaises(ValueError):
+            self.course_service.submit_assignment(0, 1, 0, 10.2)
+
+    test_get_student_grade_avg_float_grades = test_get_assignment_grade_avg_float_grades
+
+if __name__ == '__main__':
+    unittest.main()
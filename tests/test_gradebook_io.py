@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import io
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import CourseServiceImpl
+from app.gradebook_io import NDJSON, WIDE_CSV, export_grades, import_grades
+
+
+class GradebookIOTests(unittest.TestCase):
+    """
+    Unit tests for import_grades() and export_grades().
+    """
+    def setUp(self):
+        """
+        Set up a course with three assignments and three enrolled students for each test case.
+        """
+        self.course_service = CourseServiceImpl()
+        self.course_id = self.course_service.create_course("CS101")
+        self.course_service.create_assignments_bulk(self.course_id, ["Homework 1", "Homework 2", "Homework 3"])
+        self.course_service.enroll_students_bulk(self.course_id, [1, 2, 3])
+
+    def test_import_long_csv(self):
+        """
+        Test that valid rows are applied across chunks while invalid ones are reported by their position.
+        """
+        lines = [
+            "student_id,assignment_id,grade\n",
+            "1,0,90\n",
+            "1,1,85.5\n",
+            "2,0,abc\n",
+            "9,0,70\n",
+            "2,1,60\n",
+            "1,0,50\n",
+        ]
+        result = import_grades(self.course_service, self.course_id, lines, chunk_size=2)
+        self.assertEqual((result.applied, result.rejected), (3, 3))
+        self.assertEqual([error.index for error in result.errors], [2, 3, 5])
+        self.assertFalse(result.ok)
+        self.assertEqual(dict(self.course_service.get_student_grades(self.course_id, 1)), {0: 90, 1: 85.5})
+
+    def test_import_ndjson(self):
+        """
+        Test that NDJSON objects are imported and malformed lines or non-numeric grades are rejected.
+        """
+        lines = [
+            '{"student_id": 1, "assignment_id": 0, "grade": 90}\n',
+            '{"student_id": 2, "assignment_id": 0, "grade": "90"}\n',
+            'not json\n',
+            '{"student_id": 3, "assignment_id": 2, "grade": 40}\n',
+        ]
+        result = import_grades(self.course_service, self.course_id, lines, NDJSON)
+        self.assertEqual((result.applied, result.rejected), (2, 2))
+        self.assertEqual(self.course_service.get_assignment_grade_avg(self.course_id, 0), 90)
+
+    def test_import_wide_csv(self):
+        """
+        Test that a wide table submits its non-empty cells, and a malformed row is rejected once.
+        """
+        lines = ["student_id,0,1,2\n", "1,90,,80\n", "2,x,70,\n", "3,,,100\n"]
+        result = import_grades(self.course_service, self.course_id, lines, WIDE_CSV)
+        self.assertEqual((result.applied, result.rejected), (3, 1))
+        self.assertEqual(result.errors[0].index, 1)
+        self.assertEqual(dict(self.course_service.get_student_grades(self.course_id, 1)), {0: 90, 2: 80})
+
+    def test_import_max_errors(self):
+        """
+        Test that only the first max_errors rejected rows are kept, while all of them are counted.
+        """
+        lines = ["student_id,assignment_id,grade\n"] + [f"9,0,{grade}\n" for grade in range(5)]
+        result = import_grades(self.course_service, self.course_id, lines, max_errors=2)
+        self.assertEqual((result.rejected, len(result.errors)), (5, 2))
+
+    def test_import_invalid_arguments(self):
+        """
+        Test that an unknown format, a bad header or a non-positive chunk size throw ValueError, and an unknown course KeyError.
+        """
+        with self.assertRaises(ValueError):
+            import_grades(self.course_service, self.course_id, [], "xlsx")
+        with self.assertRaises(ValueError):
+            import_grades(self.course_service, self.course_id, ["a,b,c\n"])
+        with self.assertRaises(ValueError):
+            import_grades(self.course_service, self.course_id, [], chunk_size=0)
+        with self.assertRaises(KeyError):
+            import_grades(self.course_service, 42, [])
+
+    def test_export_round_trips(self):
+        """
+        Test that every format exports the enrolled students' grades in a form import_grades() reads back.
+        """
+        self.course_service.submit_assignments_bulk(self.course_id, [(1, 0, 90), (1, 2, 80), (2, 1, 70.5)])
+        for file_format in ("csv", NDJSON, WIDE_CSV):
+            output = io.StringIO(newline="")
+            export_grades(self.course_service, self.course_id, output, file_format)
+            copy = CourseServiceImpl()
+            course_id = copy.create_course("CS101")
+            copy.create_assignments_bulk(course_id, ["Homework 1", "Homework 2", "Homework 3"])
+            copy.enroll_students_bulk(course_id, [1, 2, 3])
+            output.seek(0)
+            result = import_grades(copy, course_id, output, file_format)
+            self.assertTrue(result.ok, file_format)
+            self.assertEqual(result.applied, 3, file_format)
+            self.assertEqual(dict(copy.get_student_grades(course_id, 2)), {1: 70.5}, file_format)
+
+    def test_export_wide_csv(self):
+        """
+        Test that the wide table has one column per assignment and one line per enrolled student.
+        """
+        self.course_service.submit_assignments_bulk(self.course_id, [(1, 0, 90), (3, 2, 80)])
+        output = io.StringIO(newline="")
+        self.assertEqual(export_grades(self.course_service, self.course_id, output, WIDE_CSV), 3)
+        self.assertEqual(output.getvalue().splitlines(), ["student_id,0,1,2", "1,90,,", "2,,,", "3,,,80"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import CourseServiceImpl
+from app.instrumentation import Instrumentation
+from app.thread_safe_course_service import ThreadSafeCourseServiceImpl
+
+
+class InstrumentationTests(unittest.TestCase):
+    """
+    Unit tests for the Instrumentation class.
+    """
+    def setUp(self):
+        """
+        Set up an enabled instrumentation over a course with one assignment and one enrolled student for each test case.
+        """
+        self.course_service = CourseServiceImpl()
+        self.course_id = self.course_service.create_course("CS101")
+        self.assignment_id = self.course_service.create_assignment(self.course_id, "Homework 1")
+        self.course_service.enroll_student(self.course_id, 1)
+        self.instrumentation = Instrumentation(self.course_service, slowest_calls=3)
+        self.instrumentation.enable()
+
+    def test_counts_calls_and_errors(self):
+        """
+        Test that calls are counted per method and raised exceptions per method and exception type.
+        """
+        self.course_service.submit_assignment(self.course_id, 1, self.assignment_id, 90)
+        with self.assertRaises(ValueError):
+            self.course_service.submit_assignment(self.course_id, 1, self.assignment_id, 90)
+        with self.assertRaises(KeyError):
+            self.course_service.get_assignment_grade_avg(42, self.assignment_id)
+
+        methods = self.instrumentation.to_dict()["methods"]
+        self.assertEqual(methods["submit_assignment"]["calls"], 2)
+        self.assertEqual(methods["submit_assignment"]["errors"], {"ValueError": 1})
+        self.assertEqual(methods["get_assignment_grade_avg"]["errors"], {"KeyError": 1})
+        self.assertEqual(methods["get_course_by_id"]["errors"], {"KeyError": 1})
+        self.assertEqual(sum(methods["submit_assignment"]["buckets"].values()), 2)
+
+    def test_disable_restores_methods(self):
+        """
+        Test that disabling removes the wrappers and calls made afterwards are not counted.
+        """
+        self.instrumentation.disable()
+        self.assertNotIn("submit_assignment", vars(self.course_service))
+        self.course_service.submit_assignment(self.course_id, 1, self.assignment_id, 90)
+        self.assertEqual(self.instrumentation.to_dict()["methods"], {})
+        self.instrumentation.enable()
+        self.course_service.get_top_five_students(self.course_id)
+        self.assertEqual(self.instrumentation.to_dict()["methods"]["get_top_five_students"]["calls"], 1)
+
+    def test_slowest_calls_are_bounded_and_ordered(self):
+        """
+        Test that only the slowest calls are kept, slowest first.
+        """
+        self.course_service.submit_assignment(self.course_id, 1, self.assignment_id, 90)
+        for _ in range(10):
+            self.course_service.get_student_grade_avg(self.course_id, 1)
+        slowest = self.instrumentation.slowest_calls_recorded()
+        self.assertEqual(len(slowest), 3)
+        self.assertEqual(slowest, sorted(slowest, key=lambda slow_call: slow_call.seconds, reverse=True))
+        self.assertIsNone(slowest[0].profile)
+
+    def test_profiled_calls(self):
+        """
+        Test that calls sampled for profiling carry a cProfile report, nested calls included.
+        """
+        instrumentation = Instrumentation(CourseServiceImpl(), slowest_calls=1, profile_rate=1.0)
+        instrumentation.enable()
+        course_id = instrumentation.course_service.create_course("CS101")
+        self.assertIn("create_course", instrumentation.slowest_calls_recorded()[0].profile)
+        with self.assertRaises(KeyError):
+            instrumentation.course_service.get_course_by_id(course_id + 1)
+        self.assertEqual(instrumentation.to_dict()["methods"]["get_course_by_id"]["errors"], {"KeyError": 1})
+
+    def test_invalid_parameters(self):
+        """
+        Test that a negative number of slowest calls or a profile rate outside [0, 1] throws ValueError.
+        """
+        with self.assertRaises(ValueError):
+            Instrumentation(self.course_service, slowest_calls=-1)
+        with self.assertRaises(ValueError):
+            Instrumentation(self.course_service, profile_rate=1.5)
+
+    def test_prometheus_export(self):
+        """
+        Test that the Prometheus export holds cumulative histograms, error counters and course sizes.
+        """
+        self.course_service.submit_assignment(self.course_id, 1, self.assignment_id, 90)
+        with self.assertRaises(KeyError):
+            self.course_service.get_course_by_id(42)
+        lines = self.instrumentation.to_prometheus().splitlines()
+        self.assertIn('course_service_calls_total{method="submit_assignment"} 1', lines)
+        self.assertIn('course_service_call_seconds_bucket{method="submit_assignment",le="+Inf"} 1', lines)
+        self.assertIn('course_service_call_seconds_count{method="submit_assignment"} 1', lines)
+        self.assertIn('course_service_errors_total{method="get_course_by_id",exception="KeyError"} 1', lines)
+        self.assertIn(f'course_service_course_submissions{{course_id="{self.course_id}"}} 1', lines)
+        self.assertIn(f'course_service_course_students{{course_id="{self.course_id}"}} 1', lines)
+
+    def test_json_export(self):
+        """
+        Test that the JSON export round-trips and reports course sizes.
+        """
+        exported = json.loads(self.instrumentation.to_json())
+        self.assertTrue(exported["enabled"])
+        self.assertEqual(exported["courses"][str(self.course_id)], {"students": 1, "assignments": 1, "submissions": 0})
+
+    def test_thread_safe_service(self):
+        """
+        Test that the locked methods of ThreadSafeCourseServiceImpl are instrumented too.
+        """
+        instrumentation = Instrumentation(ThreadSafeCourseServiceImpl())
+        instrumentation.enable()
+        course_id = instrumentation.course_service.create_course("CS101")
+        instrumentation.course_service.enroll_student(course_id, 1)
+        self.assertEqual(instrumentation.to_dict()["methods"]["enroll_student"]["calls"], 1)
+
+    def test_helpers_are_not_instrumented(self):
+        """
+        Test that the copy-on-write and locking helpers behind snapshot() and rename_course() are not reported as calls.
+        """
+        instrumentation = Instrumentation(ThreadSafeCourseServiceImpl())
+        instrumentation.enable()
+        course_service = instrumentation.course_service
+        course_id = course_service.create_course("CS101")
+        view = course_service.snapshot()
+        course_service.rename_course(course_id, "Algorithms")
+        course_service.enroll_student(course_id, 1)
+        methods = instrumentation.to_dict()["methods"]
+        self.assertEqual(methods["snapshot"]["calls"], 1)
+        self.assertEqual(methods["rename_course"]["calls"], 1)
+        for helper in ("unshare", "writable_course", "replace_course", "writable_enrollments", "all_courses_read_locked"):
+            self.assertNotIn(helper, methods)
+        self.assertEqual(view.get_course_by_id(course_id).name, "CS101")
+
+
+if __name__ == '__main__':
+    unittest.main()
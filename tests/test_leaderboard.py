@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.leaderboard import Leaderboard
+
+
+class LeaderboardTests(unittest.TestCase):
+    """
+    Unit tests for the Leaderboard class.
+    """
+    def setUp(self):
+        """
+        Set up an empty Leaderboard for each test case.
+        """
+        self.leaderboard = Leaderboard()
+
+    def test_top_orders_by_average_then_id(self):
+        """
+        Test that students are ranked by average, with ties going to the lower ID.
+        """
+        for student_id, average in [(4, 70), (2, 90), (3, 70), (1, None)]:
+            self.leaderboard.update(student_id, average)
+        self.assertEqual(self.leaderboard.top(10), [2, 3, 4, 1])
+        self.assertEqual(self.leaderboard.top(2), [2, 3])
+
+    def test_update_moves_student(self):
+        """
+        Test that updating a student's average moves them to their new rank.
+        """
+        self.leaderboard.update(1, 50)
+        self.leaderboard.update(2, 60)
+        self.leaderboard.update(1, 99)
+        self.assertEqual(self.leaderboard.top(2), [1, 2])
+        self.assertEqual(len(self.leaderboard), 2)
+
+    def test_remove(self):
+        """
+        Test that removed students are no longer ranked and unknown students throw KeyError.
+        """
+        self.leaderboard.update(1, 50)
+        self.leaderboard.remove(1)
+        self.assertEqual(self.leaderboard.top(5), [])
+        with self.assertRaises(KeyError):
+            self.leaderboard.remove(1)
+
+    def test_rank_matches_top(self):
+        """
+        Test that every student's rank is their position in top(), ungraded students included.
+        """
+        rng = random.Random(0)
+        for student_id in rng.sample(range(10000), 2000):
+            self.leaderboard.update(student_id, rng.choice([None] + list(range(101))))
+        ordered = self.leaderboard.top(len(self.leaderboard))
+        for position, student_id in enumerate(ordered, start=1):
+            self.assertEqual(self.leaderboard.rank(student_id), position)
+
+    def test_rank_unknown_student(self):
+        """
+        Test that ranking a student who is not on the leaderboard throws KeyError.
+        """
+        with self.assertRaises(KeyError):
+            self.leaderboard.rank(1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.name_index import NameIndex
+
+
+class NameIndexTests(unittest.TestCase):
+    """
+    Unit tests for the NameIndex class.
+    """
+    def setUp(self):
+        """
+        Set up an index of a few course names, one of them duplicated, for each test case.
+        """
+        self.index = NameIndex()
+        for item_id, name in enumerate(["CS101", "MATH200", "CS102", "CS101", "CS1", "BIO100"]):
+            self.index.add(name, item_id)
+
+    def test_find_orders_by_name_then_id(self):
+        """
+        Test that the IDs matching a prefix are ordered by name, with duplicate names ordered by ID.
+        """
+        self.assertEqual(self.index.find("CS1"), [4, 0, 3, 2])
+        self.assertEqual(self.index.find("CS101"), [0, 3])
+        self.assertEqual(self.index.find(""), [5, 4, 0, 3, 2, 1])
+
+    def test_find_no_match(self):
+        """
+        Test that a prefix matching no name returns no ID, whether it sorts before, between or after the names.
+        """
+        self.assertEqual(self.index.find("A"), [])
+        self.assertEqual(self.index.find("CS2"), [])
+        self.assertEqual(self.index.find("Z"), [])
+
+    def test_remove(self):
+        """
+        Test that removing an ID keeps its duplicates and removing an unknown pair throws KeyError.
+        """
+        self.index.remove("CS101", 0)
+        self.assertEqual(self.index.find("CS101"), [3])
+        self.assertEqual(len(self.index), 5)
+        with self.assertRaises(KeyError):
+            self.index.remove("CS101", 0)
+        with self.assertRaises(KeyError):
+            self.index.remove("MATH200", 2)
+
+if __name__ == '__main__':
+    unittest.main()
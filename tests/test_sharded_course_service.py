@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.sharded_course_service import ShardedCourseService
+from tests import test_course_service_impl
+
+SHARDS = 3
+
+# Tests of the CourseServiceImpl suite that inspect the service's in-process state or rely on live grade views,
+# which a shard only hands out as copies
+IN_PROCESS_TESTS = (
+    "test_create_course",
+    "test_delete_course_existing",
+    "test_delete_course_without_archive",
+    "test_get_course_by_id_existing",
+    "test_get_courses_existing",
+    "test_get_student_courses_unknown_student",
+    "test_get_student_grades",
+)
+
+
+class ShardedCourseServiceTests(test_course_service_impl.CourseServiceTests):
+    """
+    Runs the CourseServiceImpl unit tests against ShardedCourseService.
+    """
+    def setUp(self):
+        """
+        Set up a fresh instance of ShardedCourseService for each test case.
+        """
+        self.course_service = ShardedCourseService(SHARDS)
+
+    def tearDown(self):
+        """
+        Stop the shard processes after each test case.
+        """
+        self.course_service.close()
+
+
+for _test_name in IN_PROCESS_TESTS:
+    setattr(ShardedCourseServiceTests, _test_name, unittest.skip("inspects in-process state")(lambda self: None))
+
+
+class ShardingTests(unittest.TestCase):
+    """
+    Unit tests for the routing and merging of ShardedCourseService.
+    """
+    def setUp(self):
+        """
+        Set up six courses spread over the shards, with student 1 enrolled and graded in every other one.
+        """
+        self.course_service = ShardedCourseService(SHARDS)
+        for course_id in range(6):
+            self.course_service.create_course(f"CS10{5 - course_id}")
+            self.course_service.create_assignment(course_id, "Homework 1")
+        for course_id in (0, 2, 4):
+            self.course_service.enroll_student(course_id, 1)
+            self.course_service.submit_assignment(course_id, 1, 0, 60 + course_id)
+        self.course_service.enroll_student(1, 1)
+
+    def tearDown(self):
+        """
+        Stop the shard processes after each test case.
+        """
+        self.course_service.close()
+
+    def test_courses_are_partitioned(self):
+        """
+        Test that every shard owns the courses whose ID maps to it.
+        """
+        owned = self.course_service.fan_out("all_courses")
+        self.assertEqual([[course.id for course in courses] for courses in owned], [[0, 3], [1, 4], [2, 5]])
+
+    def test_get_courses_merges_in_id_order(self):
+        """
+        Test that the courses of every shard are merged in ascending ID order.
+        """
+        self.assertEqual([course.id for course in self.course_service.get_courses()], list(range(6)))
+
+    def test_get_courses_empty(self):
+        """
+        Test that get_courses() throws LookupError when no shard owns a course.
+        """
+        with ShardedCourseService(2) as course_service:
+            with self.assertRaises(LookupError):
+                course_service.get_courses()
+
+    def test_list_courses_pages_across_shards(self):
+        """
+        Test that pages of summaries are merged across shards and resume from the cursor.
+        """
+        self.assertEqual([summary.course_id for summary in self.course_service.list_courses(limit=4)], [0, 1, 2, 3])
+        self.assertEqual([summary.course_id for summary in self.course_service.list_courses(3, 4)], [4, 5])
+        self.assertEqual([course.id for course in self.course_service.iter_courses(2)], [3, 4, 5])
+
+    def test_find_courses_merges_by_name(self):
+        """
+        Test that prefix matches of every shard are merged by name.
+        """
+        self.assertEqual([course.id for course in self.course_service.find_courses("CS10")], [5, 4, 3, 2, 1, 0])
+
+    def test_student_queries_merge_shards(self):
+        """
+        Test that a student's courses and transcript are merged from every shard.
+        """
+        self.assertEqual(self.course_service.get_student_courses(1), [0, 1, 2, 4])
+        self.assertEqual(self.course_service.get_student_transcript(1), {0: 60, 1: None, 2: 62, 4: 64})
+
+    def test_errors_are_raised_in_the_caller(self):
+        """
+        Test that an exception raised in a shard is raised by the front-end, and the shard keeps serving.
+        """
+        with self.assertRaises(KeyError):
+            self.course_service.get_course_by_id(42)
+        with self.assertRaises(ValueError):
+            self.course_service.submit_assignment(0, 1, 0, 90)
+        self.assertEqual(self.course_service.get_assignment_grade_avg(0, 0), 60)
+
+    def test_bulk_generators(self):
+        """
+        Test that bulk calls accept generators, which are materialized before being sent to the shard.
+        """
+        result = self.course_service.enroll_students_bulk(3, (student_id for student_id in range(10)))
+        self.assertEqual(result.applied, 10)
+
+    def test_concurrent_create_course_unique_ids(self):
+        """
+        Test that courses created from several threads get distinct IDs, each found on its shard.
+        """
+        with ThreadPoolExecutor(8) as pool:
+            course_ids = list(pool.map(lambda i: self.course_service.create_course(f"Course{i}"), range(200)))
+        self.assertEqual(sorted(course_ids), list(range(6, 206)))
+        self.assertEqual(self.course_service.get_course_by_id(205).name, f"Course{course_ids.index(205)}")
+        self.assertEqual(len(self.course_service.get_courses()), 206)
+
+    def test_invalid_shard_count(self):
+        """
+        Test that a service without shards throws ValueError.
+        """
+        with self.assertRaises(ValueError):
+            ShardedCourseService(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
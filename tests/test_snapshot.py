@@ -0,0 +1,212 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import CourseServiceImpl
+from app.thread_safe_course_service import ThreadSafeCourseServiceImpl
+
+
+class SnapshotTests(unittest.TestCase):
+    """
+    Unit tests for CourseServiceImpl.save_snapshot() and CourseServiceImpl.load_snapshot().
+    """
+    compact_grades = False
+
+    def setUp(self):
+        """
+        Set up a service with two courses, one of them deleted, and a temporary directory for the snapshot files.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "courses.snapshot")
+        self.course_service = CourseServiceImpl(compact_grades=self.compact_grades)
+        self.course_service.create_course("Deleted Course")
+        self.course_service.create_course("Algèbre")
+        self.course_service.create_course("Empty Course")
+        self.course_service.delete_course(0)
+        for assignment_id in range(3):
+            self.course_service.create_assignment(1, f"Assignment{assignment_id}")
+        for student_id in [5, 3, 8, 1]:
+            self.course_service.enroll_student(1, student_id)
+        self.course_service.submit_assignments_bulk(1, [(5, 0, 100), (5, 2, 41), (3, 0, 0), (8, 1, 77), (8, 2, 78)])
+        self.course_service.dropout_student(1, 8)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def restore(self, course_service=None):
+        self.course_service.save_snapshot(self.path)
+        restored = course_service if course_service is not None else CourseServiceImpl()
+        restored.load_snapshot(self.path)
+        return restored
+
+    def test_round_trip(self):
+        """
+        Test that a restored service answers every query like the original one.
+        """
+        restored = self.restore()
+        self.assertEqual(restored.course_id, 3)
+        self.assertEqual(sorted(restored.courses), [1, 2])
+        course, restored_course = self.course_service.get_course_by_id(1), restored.get_course_by_id(1)
+        self.assertEqual(restored_course.name, "Algèbre")
+        self.assertEqual(restored_course.assignment_id, 3)
+        self.assertEqual({a_id: a.name for a_id, a in restored_course.assignments.items()}, {a_id: a.name for a_id, a in course.assignments.items()})
+        self.assertEqual(list(restored_course.students_enrolled), [5, 3, 1])
+        self.assertEqual(dict(restored_course.grades.items()), dict(course.grades.items()))
+        for student_id in [5, 3]:
+            self.assertEqual(restored.get_student_grade_avg(1, student_id), self.course_service.get_student_grade_avg(1, student_id))
+            self.assertEqual(dict(restored.get_student_grades(1, student_id)), dict(self.course_service.get_student_grades(1, student_id)))
+        for assignment_id in [0, 2]:  # Assignment 1 was only submitted by the dropped student
+            self.assertEqual(restored.get_assignment_grade_avg(1, assignment_id), self.course_service.get_assignment_grade_avg(1, assignment_id))
+        for assignment_id in range(3):
+            self.assertEqual(restored.get_assignment_distribution(1, assignment_id), self.course_service.get_assignment_distribution(1, assignment_id))
+        self.assertEqual(restored.get_top_k_students(1, 10), [5, 3, 1])
+        self.assertEqual(restored.get_course_statistics(1), self.course_service.get_course_statistics(1))
+
+    def test_round_trip_rebuilds_student_index(self):
+        """
+        Test that a restored service knows which courses every student is enrolled in.
+        """
+        self.course_service.enroll_student(2, 5)
+        restored = self.restore()
+        self.assertEqual(restored.student_courses, self.course_service.student_courses)
+        self.assertEqual(restored.get_student_courses(5), [1, 2])
+        self.assertEqual(restored.get_student_courses(8), [])
+
+    def test_round_trip_rebuilds_name_indexes(self):
+        """
+        Test that a restored service finds courses and assignments by name.
+        """
+        self.course_service.rename_assignment(1, 2, "Assignment0")
+        restored = self.restore()
+        self.assertEqual([course.id for course in restored.find_courses("")], [1, 2])
+        self.assertEqual([assignment.id for assignment in restored.find_assignments(1, "Assignment0")], [0, 2])
+
+    def test_round_trip_after_assignment_deletion(self):
+        """
+        Test that a restored service has no trace of a deleted assignment and keeps the other grades.
+        """
+        self.course_service.delete_assignment(1, 0)
+        restored = self.restore()
+        restored_course = restored.get_course_by_id(1)
+        self.assertEqual(sorted(restored_course.assignments), [1, 2])
+        self.assertEqual(dict(restored_course.grades.items()), {(5, 2): 41})
+        self.assertEqual(restored.get_student_grade_avg(1, 5), 41)
+        self.assertEqual(restored.create_assignment(1, "Assignment3"), 3)
+
+    def test_round_trip_keeps_course_listing(self):
+        """
+        Test that a restored service pages through its courses like the original one.
+        """
+        restored = self.restore()
+        self.assertEqual(restored.list_courses(), self.course_service.list_courses())
+        self.assertEqual([summary.course_id for summary in restored.list_courses(after_id=1)], [2])
+
+    def test_round_trip_keeps_id_generators(self):
+        """
+        Test that new courses and assignments continue the restored ID sequences and dropped students start over.
+        """
+        restored = self.restore()
+        self.assertEqual(restored.create_course("New Course"), 3)
+        self.assertEqual(restored.create_assignment(1, "Assignment3"), 3)
+        restored.enroll_student(1, 8)
+        with self.assertRaises(ValueError):
+            restored.get_student_grade_avg(1, 8)
+        restored.submit_assignment(1, 8, 1, 50)
+        self.assertEqual(restored.get_assignment_grade_avg(1, 1), 50)
+
+    def test_round_trip_keeps_archived_dropped_grades(self):
+        """
+        Test that in archive mode the grades of dropped students survive a snapshot and count again on re-enrollment.
+        """
+        self.course_service = CourseServiceImpl(compact_grades=self.compact_grades, archive=True)
+        self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(0, "Assignment0")
+        self.course_service.enroll_student(0, 8)
+        self.course_service.submit_assignment(0, 8, 0, 77)
+        self.course_service.dropout_student(0, 8)
+        restored = self.restore(CourseServiceImpl(archive=True))
+        self.assertEqual(restored.get_assignment_grade_avg(0, 0), 77)
+        restored.enroll_student(0, 8)
+        self.assertEqual(restored.get_student_grade_avg(0, 8), 77)
+        with self.assertRaises(ValueError):
+            restored.submit_assignment(0, 8, 0, 50)
+
+    def test_save_snapshot_replaces_file_atomically(self):
+        """
+        Test that saving over an existing snapshot leaves only the new snapshot behind.
+        """
+        self.course_service.save_snapshot(self.path)
+        self.course_service.create_course("Another Course")
+        self.course_service.save_snapshot(self.path)
+        self.assertEqual(os.listdir(self.directory.name), ["courses.snapshot"])
+        restored = CourseServiceImpl()
+        restored.load_snapshot(self.path)
+        self.assertEqual(sorted(restored.courses), [1, 2, 3])
+
+    def test_load_snapshot_drops_archived_courses(self):
+        """
+        Test that courses archived before a load are dropped, so they cannot collide with the restored course IDs.
+        """
+        self.course_service.save_snapshot(self.path)
+        archiving = CourseServiceImpl(archive=True)
+        archiving.create_course("Archived Course")
+        archiving.delete_course(0)
+        view = archiving.snapshot()
+        archiving.load_snapshot(self.path)
+        self.assertEqual(archiving.archived_courses, {})
+        with self.assertRaises(KeyError):
+            archiving.get_archived_course(0)
+        self.assertEqual(view.get_archived_course(0).name, "Archived Course")
+
+    def test_load_snapshot_not_a_snapshot(self):
+        """
+        Test that loading a file that is not a snapshot throws ValueError.
+        """
+        with open(self.path, "wb") as not_a_snapshot:
+            not_a_snapshot.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            CourseServiceImpl().load_snapshot(self.path)
+
+    def test_load_snapshot_thread_safe(self):
+        """
+        Test that a thread-safe service gets a lock for every restored course.
+        """
+        restored = self.restore(ThreadSafeCourseServiceImpl())
+        self.assertEqual(sorted(restored.course_locks), [1, 2])
+        restored.submit_assignment(1, 1, 0, 60)
+        restored.save_snapshot(self.path)
+
+
+class CompactSnapshotTests(SnapshotTests):
+    """
+    Runs the snapshot tests with compact grade storage enabled.
+    """
+    compact_grades = True
+
+
+class FloatGradesSnapshotTests(unittest.TestCase):
+    """
+    Snapshot tests for courses holding fractional grades.
+    """
+    def test_round_trip_float_grades(self):
+        """
+        Test that fractional grades and the averages built from them survive a round trip.
+        """
+        course_service = CourseServiceImpl()
+        course_service.create_course("Test Course")
+        course_service.create_assignment(0, "Assignment0")
+        for student_id, grade in enumerate([10.2, 20.5, 30.3, 40.9, 50.1]):
+            course_service.enroll_student(0, student_id)
+            course_service.submit_assignment(0, student_id, 0, grade)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "courses.snapshot")
+            course_service.save_snapshot(path)
+            restored = CourseServiceImpl()
+            restored.load_snapshot(path)
+        self.assertEqual(restored.get_course_by_id(0).grades[(3, 0)], 40.9)
+        self.assertEqual(restored.get_course_by_id(0).assignment_aggregates[0].total, course_service.get_course_by_id(0).assignment_aggregates[0].total)
+        self.assertEqual(restored.get_assignment_grade_avg(0, 0), 30)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.thread_safe_course_service import ThreadSafeCourseServiceImpl
+from tests import test_course_service_impl
+
+WORKERS = 16
+
+
+class ThreadSafeCourseServiceTests(test_course_service_impl.CourseServiceTests):
+    """
+    Runs the CourseServiceImpl unit tests against ThreadSafeCourseServiceImpl.
+    """
+    def setUp(self):
+        """
+        Set up a fresh instance of ThreadSafeCourseServiceImpl for each test case.
+        """
+        self.course_service = ThreadSafeCourseServiceImpl()
+
+
+class ThreadSafeCourseServiceStressTests(unittest.TestCase):
+    """
+    Hammers ThreadSafeCourseServiceImpl from a thread pool and checks its invariants.
+    """
+    def setUp(self):
+        """
+        Set up a fresh instance of ThreadSafeCourseServiceImpl for each test case.
+        """
+        self.course_service = ThreadSafeCourseServiceImpl()
+
+    def test_concurrent_create_course_unique_ids(self):
+        """
+        Test that concurrently created courses all get distinct IDs.
+        """
+        with ThreadPoolExecutor(WORKERS) as pool:
+            course_ids = list(pool.map(lambda i: self.course_service.create_course(f"Course{i}"), range(2000)))
+        self.assertEqual(len(set(course_ids)), 2000)
+        self.assertEqual(self.course_service.course_id, 2000)
+        self.assertEqual(len(self.course_service.courses), 2000)
+
+    def test_concurrent_create_assignment_unique_ids(self):
+        """
+        Test that concurrently created assignments of a course all get distinct IDs.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        with ThreadPoolExecutor(WORKERS) as pool:
+            assignment_ids = list(pool.map(lambda i: self.course_service.create_assignment(course_id, f"Assignment{i}"), range(2000)))
+        self.assertEqual(sorted(assignment_ids), list(range(2000)))
+
+    def test_concurrent_resubmission_accepted_once(self):
+        """
+        Test that of many concurrent submissions of the same assignment only one is accepted.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_student(course_id, 1)
+
+        def submit(grade):
+            try:
+                self.course_service.submit_assignment(course_id, 1, 0, grade)
+                return True
+            except ValueError:
+                return False
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            accepted = list(pool.map(submit, range(101)))
+        self.assertEqual(accepted.count(True), 1)
+        self.assertEqual(self.course_service.get_course_by_id(course_id).assignment_aggregates[0].count, 1)
+
+    def test_concurrent_mixed_workload_invariants(self):
+        """
+        Test that concurrent enrollments, submissions, dropouts and reads leave every course consistent.
+        """
+        courses, students, assignments = 4, 50, 10
+        for course_id in range(courses):
+            self.course_service.create_course(f"Course{course_id}")
+            for assignment_id in range(assignments):
+                self.course_service.create_assignment(course_id, f"Assignment{assignment_id}")
+
+        def work(student_id):
+            for course_id in range(courses):
+                self.course_service.enroll_student(course_id, student_id)
+                for assignment_id in range(assignments):
+                    self.course_service.submit_assignment(course_id, student_id, assignment_id, (student_id + assignment_id) % 101)
+                    self.course_service.get_top_five_students(course_id)
+                    self.course_service.get_assignment_grade_avg(course_id, assignment_id)
+                if student_id % 5 == 0:
+                    self.course_service.dropout_student(course_id, student_id)
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            list(pool.map(work, range(students)))
+
+        for course_id in range(courses):
+            course = self.course_service.get_course_by_id(course_id)
+            remaining = (students - students // 5) * assignments  # Dropouts take their grades with them
+            self.assertEqual(len(course.grades), remaining)
+            self.assertEqual(sum(aggregate.count for aggregate in course.assignment_aggregates.values()), remaining)
+            self.assertEqual(sum(aggregate.total for aggregate in course.student_aggregates.values()), sum(course.grades.values()))
+            self.assertEqual(len(course.students_enrolled), students - students // 5)
+            self.assertEqual(len(course.leaderboard), len(course.students_enrolled))
+            statistics = self.course_service.get_course_statistics(course_id)
+            for student_id, average in statistics.student_averages.items():
+                self.assertEqual(self.course_service.get_student_grade_avg(course_id, student_id), average)
+
+    def test_delete_course_concurrently_with_reads(self):
+        """
+        Test that deleting a course while it is being read either completes the read or raises KeyError.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.enroll_student(course_id, 1)
+
+        def read(_):
+            try:
+                return self.course_service.get_top_five_students(course_id)
+            except KeyError:
+                return None
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            reads = pool.map(read, range(500))
+            self.course_service.delete_course(course_id)
+            results = list(reads)
+        self.assertTrue(all(result in ([1], None) for result in results))
+        self.assertNotIn(course_id, self.course_service.courses)
+
+    def test_concurrent_enrollments_keep_student_index(self):
+        """
+        Test that the student index stays exact while one student joins and leaves many courses concurrently.
+        """
+        course_ids = [self.course_service.create_course(f"Course{i}") for i in range(200)]
+
+        def work(course_id):
+            self.course_service.enroll_student(course_id, 1)
+            self.course_service.get_student_transcript(1)
+            if course_id % 2:
+                self.course_service.dropout_student(course_id, 1)
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            list(pool.map(work, course_ids))
+        self.assertEqual(self.course_service.get_student_courses(1), course_ids[::2])
+
+    def test_list_courses_concurrently_with_deletes(self):
+        """
+        Test that paging through the courses while they are deleted never repeats or reorders a course.
+        """
+        for i in range(1000):
+            self.course_service.create_course(f"Course{i}")
+
+        def page(after_id):
+            return [summary.course_id for summary in self.course_service.list_courses(after_id, limit=100)]
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            deletes = pool.map(self.course_service.delete_course, range(0, 1000, 3))
+            pages = list(pool.map(page, range(-1, 1000, 100)))
+            list(deletes)
+        for course_ids in pages:
+            self.assertEqual(course_ids, sorted(set(course_ids)))
+        self.assertEqual(page(None), [course_id for course_id in range(1000) if course_id % 3][:100])
+
+    def test_student_grades_reads_concurrently_with_statistics(self):
+        """
+        Test that reading the grades of ungraded students never writes to the course, while other readers iterate it.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        self.course_service.create_assignment(course_id, "Assignment0")
+        self.course_service.enroll_students_bulk(course_id, range(20000))
+        self.course_service.submit_assignments_bulk(course_id, [(student_id, 0, student_id % 101) for student_id in range(0, 20000, 2)])
+        course = self.course_service.get_course_by_id(course_id)
+        graded = len(course.grades.by_student)
+
+        def read(worker):
+            if worker % 2:
+                return len(self.course_service.get_course_statistics(course_id).student_averages)
+            return sum(len(self.course_service.get_student_grades(course_id, student_id)) for student_id in range(worker + 1, 20000, WORKERS))  # Ungraded students
+
+        with ThreadPoolExecutor(WORKERS) as pool:
+            results = list(pool.map(read, range(WORKERS * 2)))
+        self.assertEqual(results[1], 10000)
+        self.assertEqual(len(course.grades.by_student), graded)
+
+if __name__ == '__main__':
+    unittest.main()
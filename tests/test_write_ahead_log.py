@@ -0,0 +1,235 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.course_service_impl import CourseServiceImpl
+from app.thread_safe_course_service import ThreadSafeCourseServiceImpl
+from app.write_ahead_log import WriteAheadLog, read_write_ahead_log
+
+
+class WriteAheadLogTests(unittest.TestCase):
+    """
+    Unit tests for the WriteAheadLog class and CourseServiceImpl.replay().
+    """
+    def setUp(self):
+        """
+        Set up a service recording its mutations in a log inside a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, "courses.log")
+        self.snapshot_path = os.path.join(self.directory.name, "courses.snapshot")
+        self.course_service = CourseServiceImpl()
+        self.course_service.attach_write_ahead_log(WriteAheadLog(self.log_path))
+
+    def tearDown(self):
+        self.course_service.write_ahead_log.close()
+        self.directory.cleanup()
+
+    def mutate(self, course_service):
+        course_service.create_course("Deleted Course")
+        course_id = course_service.create_course("Test Course")
+        course_service.delete_course(0)
+        course_service.create_assignment(course_id, "Assignment0")
+        course_service.create_assignment(course_id, "Assignment1")
+        course_service.enroll_student(course_id, 1)
+        course_service.enroll_students_bulk(course_id, [2, 3])
+        course_service.submit_assignment(course_id, 1, 0, 90)
+        course_service.submit_assignment(course_id, 2, 0, 40.5)
+        course_service.submit_assignments_bulk(course_id, [(1, 1, 70), (3, 1, 100)])
+        course_service.dropout_student(course_id, 3)
+
+    def assert_same_state(self, expected, actual):
+        self.assertEqual(actual.course_id, expected.course_id)
+        self.assertEqual(sorted(actual.courses), sorted(expected.courses))
+        for course_id, course in expected.courses.items():
+            restored = actual.get_course_by_id(course_id)
+            self.assertEqual(restored.name, course.name)
+            self.assertEqual(restored.assignment_id, course.assignment_id)
+            self.assertEqual(restored.assignment_names.entries, course.assignment_names.entries)
+            self.assertEqual(list(restored.students_enrolled), list(course.students_enrolled))
+            self.assertEqual(dict(restored.grades.items()), dict(course.grades.items()))
+            self.assertEqual(restored.leaderboard.top(10), course.leaderboard.top(10))
+
+    def test_replay(self):
+        """
+        Test that replaying the log into an empty service rebuilds the same state.
+        """
+        self.mutate(self.course_service)
+        self.course_service.write_ahead_log.sync()
+        self.assertEqual([operation for _, operation, _ in read_write_ahead_log(self.log_path)], [
+            "create_course", "create_course", "delete_course", "create_assignment", "create_assignment", "enroll_student",
+            "enroll_students_bulk", "submit_assignment", "submit_assignment", "submit_assignments_bulk", "dropout_student",
+        ])
+        recovered = CourseServiceImpl()
+        self.assertEqual(recovered.replay(self.log_path), 11)
+        self.assert_same_state(self.course_service, recovered)
+        self.assertEqual(recovered.get_course_by_id(1).grades[(2, 0)], 40.5)
+
+    def test_replay_renames(self):
+        """
+        Test that replayed renames leave the name indexes as they were.
+        """
+        self.mutate(self.course_service)
+        self.course_service.rename_course(1, "Renamed Course")
+        self.course_service.rename_assignment(1, 0, "Renamed Assignment")
+        self.course_service.write_ahead_log.sync()
+        recovered = CourseServiceImpl()
+        recovered.replay(self.log_path)
+        self.assert_same_state(self.course_service, recovered)
+        self.assertEqual([course.id for course in recovered.find_courses("Renamed")], [1])
+        self.assertEqual([assignment.id for assignment in recovered.find_assignments(1, "Renamed")], [0])
+
+    def test_replay_assignment_management(self):
+        """
+        Test that replayed bulk creations and deletions of assignments rebuild the same assignments and grades.
+        """
+        self.mutate(self.course_service)
+        self.course_service.create_assignments_bulk(1, ["Quiz0", "Quiz1", "Quizé"])
+        self.course_service.submit_assignment(1, 1, 4, 60)
+        self.course_service.delete_assignment(1, 0)
+        self.course_service.write_ahead_log.sync()
+        recovered = CourseServiceImpl()
+        recovered.replay(self.log_path)
+        self.assert_same_state(self.course_service, recovered)
+        self.assertEqual(sorted(recovered.get_course_by_id(1).assignments), [1, 2, 3, 4])
+        self.assertEqual(recovered.get_student_grade_avg(1, 1), 65)
+
+    def test_failed_mutations_are_not_logged(self):
+        """
+        Test that mutations rejected by the service leave no record behind.
+        """
+        self.course_service.create_course("Test Course")
+        with self.assertRaises(KeyError):
+            self.course_service.enroll_student(99, 1)
+        self.course_service.enroll_students_bulk(0, [1, 1])
+        self.course_service.write_ahead_log.sync()
+        self.assertEqual(len(list(read_write_ahead_log(self.log_path))), 1)
+
+    def test_torn_record_is_cut_off(self):
+        """
+        Test that a record cut short by a crash is ignored by replay and removed when the log is reopened.
+        """
+        self.mutate(self.course_service)
+        self.course_service.write_ahead_log.close()
+        with open(self.log_path, "ab") as log_file:
+            log_file.write(b"\x10\x00\x00\x00garbage")
+
+        recovered = CourseServiceImpl()
+        self.assertEqual(recovered.replay(self.log_path), 11)
+        self.course_service.write_ahead_log = WriteAheadLog(self.log_path)
+        self.assertEqual(self.course_service.write_ahead_log.sequence, 11)
+        self.course_service.create_course("After Crash")
+        self.course_service.write_ahead_log.sync()
+        self.assertEqual([sequence for sequence, _, _ in read_write_ahead_log(self.log_path)][-1], 12)
+
+    def test_group_commit(self):
+        """
+        Test that records are fsynced once `sync_every` of them are pending.
+        """
+        write_ahead_log = WriteAheadLog(os.path.join(self.directory.name, "grouped.log"), sync_every=3, sync_interval=0)
+        write_ahead_log.append("create_course", 0, "Course0")
+        write_ahead_log.append("create_course", 1, "Course1")
+        self.assertEqual(write_ahead_log.pending, 2)
+        write_ahead_log.append("create_course", 2, "Course2")
+        self.assertEqual(write_ahead_log.pending, 0)
+        write_ahead_log.close()
+
+    def test_compaction(self):
+        """
+        Test that a compacted log plus its snapshot recover the same state, and newer mutations keep being replayed.
+        """
+        self.mutate(self.course_service)
+        self.course_service.compact_write_ahead_log(self.snapshot_path)
+        self.assertEqual(os.path.getsize(self.log_path), 0)
+        self.course_service.enroll_student(1, 4)
+        self.course_service.submit_assignment(1, 4, 1, 55)
+        self.course_service.write_ahead_log.sync()
+
+        recovered = CourseServiceImpl()
+        recovered.load_snapshot(self.snapshot_path)
+        self.assertEqual(recovered.replay(self.log_path), 2)
+        self.assert_same_state(self.course_service, recovered)
+
+    def test_replay_skips_records_already_in_snapshot(self):
+        """
+        Test that records older than the loaded snapshot are skipped, as after a crash between snapshot and truncation.
+        """
+        self.mutate(self.course_service)
+        self.course_service.save_snapshot(self.snapshot_path)
+        self.course_service.enroll_student(1, 4)
+        self.course_service.write_ahead_log.sync()
+
+        recovered = CourseServiceImpl()
+        recovered.load_snapshot(self.snapshot_path)
+        self.assertEqual(recovered.replay(self.log_path), 1)
+        self.assert_same_state(self.course_service, recovered)
+
+    def test_reopened_log_continues_sequence_after_compaction(self):
+        """
+        Test that a log reopened empty after compaction continues the sequence of the snapshot it was attached to.
+        """
+        self.mutate(self.course_service)
+        self.course_service.compact_write_ahead_log(self.snapshot_path)
+        self.course_service.write_ahead_log.close()
+
+        recovered = CourseServiceImpl()
+        recovered.load_snapshot(self.snapshot_path)
+        recovered.replay(self.log_path)
+        recovered.attach_write_ahead_log(WriteAheadLog(self.log_path))
+        recovered.enroll_student(1, 4)
+        recovered.write_ahead_log.close()
+        self.course_service.write_ahead_log = WriteAheadLog(self.log_path)
+
+        again = CourseServiceImpl()
+        again.load_snapshot(self.snapshot_path)
+        self.assertEqual(again.replay(self.log_path), 1)
+        self.assert_same_state(recovered, again)
+
+    def test_unloggable_mutations_are_not_applied(self):
+        """
+        Test that a student ID beyond 64 bits or a name that is not valid UTF-8 is rejected before anything is applied.
+        """
+        course_id = self.course_service.create_course("Test Course")
+        with self.assertRaises(ValueError):
+            self.course_service.enroll_student(course_id, 2**70)
+        result = self.course_service.enroll_students_bulk(course_id, [1, -2**64])
+        self.assertEqual([error.index for error in result.errors], [1])
+        for mutate in (
+            lambda: self.course_service.create_course("\ud800"),
+            lambda: self.course_service.rename_course(course_id, "\ud800"),
+            lambda: self.course_service.create_assignment(course_id, "\ud800"),
+            lambda: self.course_service.create_assignments_bulk(course_id, ["Assignment0", "\ud800"]),
+        ):
+            with self.assertRaises(ValueError):
+                mutate()
+        course = self.course_service.get_course_by_id(course_id)
+        self.assertEqual((course.name, len(course.students_enrolled), len(course.assignments)), ("Test Course", 0, 0))
+        self.assertEqual(len(self.course_service.courses), 1)
+        self.course_service.write_ahead_log.sync()
+        self.assertEqual([operation for _, operation, _ in read_write_ahead_log(self.log_path)], ["create_course"])
+
+    def test_compaction_without_log(self):
+        """
+        Test that compacting without an attached log throws ValueError before saving any snapshot.
+        """
+        for course_service in (CourseServiceImpl(), ThreadSafeCourseServiceImpl()):
+            with self.assertRaises(ValueError):
+                course_service.compact_write_ahead_log(self.snapshot_path)
+        self.assertFalse(os.path.exists(self.snapshot_path))
+
+    def test_compaction_thread_safe(self):
+        """
+        Test compacting the log of a thread-safe service.
+        """
+        course_service = ThreadSafeCourseServiceImpl()
+        course_service.attach_write_ahead_log(WriteAheadLog(os.path.join(self.directory.name, "thread_safe.log")))
+        self.mutate(course_service)
+        course_service.compact_write_ahead_log(self.snapshot_path)
+        course_service.write_ahead_log.close()
+        recovered = CourseServiceImpl()
+        recovered.load_snapshot(self.snapshot_path)
+        self.assert_same_state(course_service, recovered)
+
+if __name__ == '__main__':
+    unittest.main()